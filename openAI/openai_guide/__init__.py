@@ -0,0 +1,70 @@
+# The examples from 01-core.py and 02-tools.py as an importable package.
+# Importing the package does no network I/O and does not import openai, pydantic or httpx: every
+# section lives in its own submodule which is only loaded on first attribute access, and the client
+# itself is built lazily by get_client().
+import importlib
+
+_SUBMODULES = {
+    "text",
+    "structured",
+    "functions",
+    "conversation",
+    "reasoning",
+    "streaming",
+    "files",
+    "background",
+    "web_search",
+    "mcp",
+    "file_search",
+    "images",
+    "async_runner",
+    "mock_server",
+    "transport",
+    "batch",
+    "prompt_cache",
+    "response_cache",
+    "tool_dispatch",
+    "tool_registry",
+    "tool_cache",
+    "stream_parse",
+    "history",
+    "session",
+    "stream_router",
+    "resumable_stream",
+    "poller",
+    "file_inputs",
+    "upload_cache",
+    "streaming_upload",
+    "ingest",
+    "local_search",
+    "image_pipeline",
+    "image_session",
+    "computer_use",
+    "mcp_cache",
+    "mcp_approval",
+}
+
+_EXPORTS = {
+    "get_client": "_client",
+    "set_client": "_client",
+    "get_async_client": "_client",
+    "set_async_client": "_client",
+    "get_weather": "functions",
+    "call_function": "functions",
+    "create_file": "file_search",
+}
+
+__all__ = sorted(_SUBMODULES | set(_EXPORTS))
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    if name in _EXPORTS:
+        module = importlib.import_module(f".{_EXPORTS[name]}", __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return __all__
@@ -0,0 +1,57 @@
+# Lazily constructed, process-wide OpenAI clients.
+# Importing this module does not import the SDK or open any connection; the client is only built the
+# first time an example actually needs it. Call set_client() to inject your own (e.g. pointed at a mock server).
+# Both clients send their requests through the shared connection pool in transport.py.
+import threading
+
+_lock = threading.Lock()
+_client = None
+_async_client = None
+
+
+def get_client():
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                from openai import OpenAI
+
+                from .transport import get_http_client
+                _client = OpenAI(http_client=get_http_client())
+    return _client
+
+
+def set_client(client):
+    global _client
+    with _lock:
+        _client = client
+
+
+def get_async_client():
+    global _async_client
+    if _async_client is None:
+        with _lock:
+            if _async_client is None:
+                from openai import AsyncOpenAI
+
+                from .transport import get_async_http_client
+                _async_client = AsyncOpenAI(http_client=get_async_http_client())
+    return _async_client
+
+
+def set_async_client(client):
+    global _async_client
+    with _lock:
+        _async_client = client
+
+
+def drop_clients_using(*http_clients):
+    # Forgets the cached clients that send through one of these HTTP clients (transport.configure replaces
+    # them), so the next get_client()/get_async_client() builds a new one on the new pool.
+    global _client, _async_client
+    pools = [pool for pool in http_clients if pool is not None]
+    with _lock:
+        if _client is not None and any(getattr(_client, "_client", None) is pool for pool in pools):
+            _client = None
+        if _async_client is not None and any(getattr(_async_client, "_client", None) is pool for pool in pools):
+            _async_client = None
@@ -0,0 +1,85 @@
+# Runs independent examples concurrently on an AsyncOpenAI client.
+# The simple examples in text/reasoning just `return client.<resource>.create(...)`, so handing them an
+# AsyncOpenAI client makes them return a coroutine; this module schedules those coroutines under a
+# semaphore so at most `concurrency` requests are in flight, gives each call its own timeout, and
+# returns the results in the order the examples were given. Wall time then approaches the slowest
+# single call instead of the sum of all of them.
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from . import reasoning, text
+from ._client import get_async_client
+
+# The prompting examples that don't depend on each other's output.
+INDEPENDENT_EXAMPLES = [
+    ("unicorn_story", text.unicorn_story),
+    ("unicorn_story_chat", text.unicorn_story_chat),
+    ("capital_population", text.capital_population),
+    ("pirate_semicolons", text.pirate_semicolons),
+    ("snake_case_assistant", text.snake_case_assistant),
+    ("classify_review", text.classify_review),
+    ("transpose_script", reasoning.transpose_script),
+    ("refactor_component", reasoning.refactor_component),
+    ("plan_app", reasoning.plan_app),
+    ("stem_research", reasoning.stem_research),
+]
+
+
+@dataclass
+class ExampleResult:
+    name: str
+    value: Any = None
+    error: Optional[BaseException] = None
+    seconds: float = 0.0
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+async def run_concurrently(examples=None, client=None, concurrency=4, timeout=120.0):
+    # examples is a list of (name, fn) where fn(client=...) returns an awaitable. A failing or timed-out
+    # example is reported in its ExampleResult.error and does not cancel the others.
+    examples = INDEPENDENT_EXAMPLES if examples is None else examples
+    client = client or get_async_client()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_one(name, fn):
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                value = await asyncio.wait_for(fn(client=client), timeout)
+                return ExampleResult(name, value=value, seconds=time.perf_counter() - start)
+            except Exception as e:  # includes asyncio.TimeoutError
+                return ExampleResult(name, error=e, seconds=time.perf_counter() - start)
+
+    return await asyncio.gather(*(run_one(name, fn) for name, fn in examples))
+
+
+def run(examples=None, client=None, concurrency=4, timeout=120.0):
+    # Synchronous entry point for scripts. asyncio.run() starts a fresh event loop every time and an
+    # AsyncOpenAI client can't outlive the loop it first ran on, so without an explicit client each call
+    # gets its own instead of the shared one from get_async_client().
+    async def main():
+        if client is not None:
+            return await run_concurrently(examples, client=client, concurrency=concurrency, timeout=timeout)
+        from openai import AsyncOpenAI
+
+        from .transport import build_async_http_client
+
+        async with AsyncOpenAI(http_client=build_async_http_client()) as own_client:
+            return await run_concurrently(examples, client=own_client, concurrency=concurrency, timeout=timeout)
+
+    return asyncio.run(main())
+
+
+def output_of(result):
+    # The printable text of a responses or chat completions result.
+    if not result.ok:
+        return f"[{result.name} failed: {result.error!r}]"
+    value = result.value
+    if hasattr(value, "output_text"):
+        return value.output_text
+    return value.choices[0].message.content
@@ -0,0 +1,65 @@
+import time
+
+from ._client import get_client
+
+
+# ===============================================
+# ==============  Background Mode ===============
+# ===============================================
+
+# Background mode is a feature that allows you to send a background file to the model and get responses based on those files.
+# This is useful for tasks like image classification, object detection, or generating captions for images.
+# To use background mode, you need to provide the file as part of the input.
+# Here's an example of how to use background mode with the OpenAI API:
+# Polling starts every poll_interval seconds and backs off to max_interval while the response is still
+# running; to wait on many background responses at once use poller.AsyncPoller.
+def run_in_background(prompt="Write a very long nodel about otters in space", poll_interval=2, client=None, on_status=None,
+                      max_interval=30):
+    from .poller import RESPONSE_PENDING, Backoff
+
+    client = client or get_client()
+    response = client.responses.create(
+        model="gpt-4.1",
+        input=prompt,
+        background=True,
+    )
+    backoff = Backoff(poll_interval, max_interval)
+    while response.status in RESPONSE_PENDING:
+        if on_status is not None:
+            on_status(response.status)
+        time.sleep(backoff.next())
+        response = client.responses.retrieve(response.id)
+    return response
+
+# ------- Cancel a response -------
+# response = client.responses.cancel(response.id)
+# print(f"Response cancelled: {response.status}")
+
+
+
+# -------- Background Mode with stream -------
+# Fire off an async response but also start streaming immediately
+def stream_in_background(prompt="Write a novel about otters in space.", client=None, on_event=None):
+    # Returns the sequence_number of the last event seen, i.e. the cursor to resume from.
+    from .resumable_stream import ResumableStream
+
+    client = client or get_client()
+    stream = client.responses.create(
+        model="o3",
+        input=prompt,
+        background=True,
+        stream=True,
+    )
+
+    # If your connection drops, the response continues running and you can reconnect:
+    #   client.responses.retrieve(response_id, stream=True, starting_after=cursor)
+    # ResumableStream does that for you (with jittered backoff), skipping events it already yielded.
+    resumable = ResumableStream(client, stream)
+    for event in resumable:
+        if on_event is not None:
+            on_event(event)
+    return resumable.cursor
+
+# Background sampling requires store=true; stateless requests are rejected.
+# To cancel a synchronous response, terminate the connection
+# You can only start a new stream from a background response if you created it with stream=true.
@@ -0,0 +1,292 @@
+# Batch API pipeline for the few-shot product-review classifier (text.SENTIMENT_LAYOUT).
+# Instead of one responses.create call per review, reviews are streamed from a JSONL or CSV file into
+# batch request files (each under the Batch API's request-count and byte limits), uploaded, submitted,
+# polled with backoff, and the results are streamed back joined to the original reviews by custom_id.
+#
+# Every step is recorded in <work_dir>/state.json, so a crashed run can simply be started again with
+# the same arguments: finished chunks are not rewritten, uploaded or resubmitted, and a file or batch that
+# was created right before the crash is found again (by its file name, or its batch metadata) instead of
+# being created twice. The state also records a hash of the input file, and resuming with a different
+# input is a ValueError rather than joining the old batches' results to the new reviews.
+#
+#   python -m openai_guide.batch reviews.jsonl --work-dir nightly-run --out labels.jsonl
+import csv
+import json
+import os
+import time
+import uuid
+
+from ._client import get_client
+from .text import SENTIMENT_LAYOUT
+
+# Batch API limits for a single input file.
+MAX_REQUESTS_PER_BATCH = 50_000
+MAX_BYTES_PER_BATCH = 200 * 1024 * 1024
+
+TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+def read_reviews(path):
+    # Yields (review_id, text). JSONL rows need a "review" (or "text") field, CSV files a "review" (or
+    # "text") column; an "id" field/column is used as the review id, otherwise the row number. A row
+    # without any review text is a ValueError.
+    if path.endswith(".csv"):
+        with open(path, newline="", encoding="utf-8") as f:
+            for number, row in enumerate(csv.DictReader(f), 1):
+                yield _review(path, number, row)
+        return
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            if line.strip():
+                yield _review(path, number, json.loads(line))
+
+
+def _review(path, number, row):
+    text = row.get("review", row.get("text"))
+    if text is None:
+        raise ValueError(f"{path}, row {number}: no \"review\" or \"text\"")
+    return str(row["id"] if row.get("id") is not None else number), text
+
+
+def request_line(review_id, review, model="gpt-4"):
+    # The same request classify_review() sends, as one line of a batch input file. Built from the same
+    # PromptLayout, so batched requests share the cacheable instructions prefix as well.
+    body = SENTIMENT_LAYOUT.request(review, model=model)
+    body.update(body.pop("extra_body", {}))
+    return json.dumps({
+        "custom_id": review_id,
+        "method": "POST",
+        "url": "/v1/responses",
+        "body": body,
+    }, ensure_ascii=False) + "\n"
+
+
+def output_text(body):
+    # output_text of a Response that arrives as a plain dict in a batch output file.
+    return "".join(
+        part["text"]
+        for item in body.get("output", [])
+        if item.get("type") == "message"
+        for part in item.get("content", [])
+        if part.get("type") == "output_text"
+    )
+
+
+def _result_path(chunk, kind):
+    # chunk-00000.jsonl -> chunk-00000.output.jsonl; only the file's own extension is replaced.
+    return os.path.splitext(chunk["path"])[0] + f".{kind}.jsonl"
+
+
+class SentimentBatchPipeline:
+    def __init__(
+        self,
+        input_path,
+        work_dir,
+        client=None,
+        model="gpt-4",
+        max_requests=MAX_REQUESTS_PER_BATCH,
+        max_bytes=MAX_BYTES_PER_BATCH,
+    ):
+        self.input_path = input_path
+        self.work_dir = work_dir
+        self.client = client or get_client()
+        self.model = model
+        self.max_requests = max_requests
+        self.max_bytes = max_bytes
+        self.state_path = os.path.join(work_dir, "state.json")
+        os.makedirs(work_dir, exist_ok=True)
+        self.state = self._load_state()
+
+    # ---- state ----
+    def _load_state(self):
+        from .upload_cache import sha256_of
+
+        input_sha256 = sha256_of(self.input_path)
+        if os.path.exists(self.state_path):
+            with open(self.state_path, encoding="utf-8") as f:
+                state = json.load(f)
+            if "input_sha256" in state:
+                same = state["input_sha256"] == input_sha256
+            else:
+                same = os.path.abspath(state["input_path"]) == os.path.abspath(self.input_path)
+            if not same:
+                raise ValueError(f"{self.work_dir} holds a run for another input ({state['input_path']}), "
+                                 f"not {self.input_path}; use a new work_dir")
+            return state
+        return {"run_id": uuid.uuid4().hex, "input_path": os.path.abspath(self.input_path),
+                "input_sha256": input_sha256, "chunks": None}
+
+    def _save_state(self):
+        tmp = self.state_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp, self.state_path)
+
+    # ---- steps ----
+    def prepare(self):
+        # Splits the reviews into batch input files. Skipped once the chunk list has been recorded.
+        # Review ids become custom_ids, which the results are joined on, so a repeated id is a ValueError
+        # here, before anything is uploaded.
+        if self.state["chunks"] is not None:
+            return self.state["chunks"]
+        chunks, out, count, size = [], None, 0, 0
+        seen = set()
+        try:
+            for review_id, review in read_reviews(self.input_path):
+                if review_id in seen:
+                    raise ValueError(f"{self.input_path}: review id {review_id!r} appears more than once")
+                seen.add(review_id)
+                line = request_line(review_id, review, self.model).encode("utf-8")
+                if out is None or count >= self.max_requests or size + len(line) > self.max_bytes:
+                    if out is not None:
+                        out.close()
+                    path = os.path.join(self.work_dir, f"chunk-{len(chunks):05d}.jsonl")
+                    chunks.append({"path": path})
+                    out, count, size = open(path, "wb"), 0, 0
+                out.write(line)
+                count += 1
+                size += len(line)
+        finally:
+            if out is not None:
+                out.close()
+        self.state["chunks"] = chunks
+        self._save_state()
+        return chunks
+
+    def submit(self):
+        existing = None
+        for index, chunk in enumerate(self.prepare()):
+            if chunk.get("batch_id"):
+                continue
+            tag = f"{self.state['run_id']}:{index}"
+            if chunk.get("input_file_id") and existing is None:
+                # Uploaded by an earlier attempt, so its batch may have been created right before a crash.
+                # Look up the batches created by this run, keyed by their chunk tag.
+                existing = {
+                    (batch.metadata or {}).get("sentiment_pipeline_chunk"): batch.id
+                    for batch in self.client.batches.list()
+                }
+            if not chunk.get("input_file_id"):
+                chunk["input_file_id"] = self._upload(chunk, index)
+                self._save_state()
+            chunk["batch_id"] = (existing or {}).get(tag) or self.client.batches.create(
+                input_file_id=chunk["input_file_id"],
+                endpoint="/v1/responses",
+                completion_window="24h",
+                metadata={"sentiment_pipeline_chunk": tag},
+            ).id
+            chunk["status"] = "validating"
+            self._save_state()
+
+    def _upload(self, chunk, index):
+        # The chunk is uploaded under a name unique to this run and chunk, and the upload is recorded in
+        # the state before it starts: if the process died before it could save the file id, the next
+        # attempt finds the file by its name instead of uploading it again.
+        filename = f"{self.state['run_id']}-{index:05d}.jsonl"
+        if chunk.get("uploading"):
+            for file in self.client.files.list(purpose="batch"):
+                if file.filename == filename and file.status != "error":
+                    del chunk["uploading"]
+                    return file.id
+        chunk["uploading"] = True
+        self._save_state()
+        with open(chunk["path"], "rb") as f:
+            file_id = self.client.files.create(file=(filename, f), purpose="batch").id
+        del chunk["uploading"]
+        return file_id
+
+    def wait(self, poll_interval=5.0, max_interval=60.0, on_status=None):
+        # Polls the unfinished batches until all of them reach a terminal status. The interval grows by
+        # half after every round in which nothing changed and drops back once something did.
+        interval = poll_interval
+        while True:
+            pending = [c for c in self.state["chunks"] if c.get("status") not in TERMINAL_STATUSES]
+            if not pending:
+                return
+            changed = False
+            for chunk in pending:
+                batch = self.client.batches.retrieve(chunk["batch_id"])
+                if batch.status != chunk["status"]:
+                    changed = True
+                    chunk.update(status=batch.status, output_file_id=batch.output_file_id, error_file_id=batch.error_file_id)
+                    if on_status is not None:
+                        on_status(chunk["batch_id"], batch.status, batch.request_counts)
+            if changed:
+                self._save_state()
+                interval = poll_interval
+            if all(c["status"] in TERMINAL_STATUSES for c in self.state["chunks"]):
+                return
+            time.sleep(interval)
+            interval = min(interval * 1.5, max_interval)
+
+    def download(self):
+        # Streams each finished chunk's output and error files to disk next to the chunk.
+        for chunk in self.state["chunks"]:
+            for key in ("output_file_id", "error_file_id"):
+                path = _result_path(chunk, key.split("_")[0])
+                if not chunk.get(key) or os.path.exists(path):
+                    continue
+                with self.client.files.with_streaming_response.content(chunk[key]) as response:
+                    with open(path + ".part", "wb") as f:
+                        for data in response.iter_bytes():
+                            f.write(data)
+                os.replace(path + ".part", path)
+
+    def results(self):
+        # Yields {"custom_id", "review", "label", "error"} in input order, one chunk in memory at a time.
+        for chunk in self.state["chunks"]:
+            answers = {}
+            for kind in ("output", "error"):
+                path = _result_path(chunk, kind)
+                if not os.path.exists(path):
+                    continue
+                with open(path, encoding="utf-8") as f:
+                    for line in f:
+                        if line.strip():
+                            item = json.loads(line)
+                            answers[item["custom_id"]] = item
+            with open(chunk["path"], encoding="utf-8") as f:
+                for line in f:
+                    request = json.loads(line)
+                    custom_id = request["custom_id"]
+                    item = answers.get(custom_id)
+                    row = {"custom_id": custom_id, "review": request["body"]["input"], "label": None, "error": None}
+                    if item is None:
+                        row["error"] = f"batch {chunk.get('status', 'not submitted')} without a result"
+                    elif item.get("error") or item["response"]["status_code"] != 200:
+                        row["error"] = item.get("error") or item["response"]["body"]
+                    else:
+                        row["label"] = output_text(item["response"]["body"]).strip()
+                    yield row
+
+    def run(self, poll_interval=5.0, max_interval=60.0, on_status=None):
+        self.prepare()
+        self.submit()
+        self.wait(poll_interval, max_interval, on_status)
+        self.download()
+        return self.results()
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Classify product reviews with the Batch API.")
+    parser.add_argument("input", help="reviews as .jsonl or .csv")
+    parser.add_argument("--work-dir", required=True, help="where chunks, results and state.json are kept")
+    parser.add_argument("--out", required=True, help="joined results as JSONL")
+    parser.add_argument("--model", default="gpt-4")
+    parser.add_argument("--poll-interval", type=float, default=5.0)
+    args = parser.parse_args(argv)
+
+    pipeline = SentimentBatchPipeline(args.input, args.work_dir, model=args.model)
+    rows = pipeline.run(
+        poll_interval=args.poll_interval,
+        on_status=lambda batch_id, status, counts: print(f"{batch_id}: {status}"),
+    )
+    with open(args.out, "w", encoding="utf-8") as f:
+        for row in rows:
+            f.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,2 @@
+# Stand-alone benchmarks for the openai_guide package. Run them from the openAI/ directory, e.g.
+#   python -m openai_guide.benchmarks.import_time
@@ -0,0 +1,53 @@
+# Sequential vs concurrent run of the independent prompting examples against the local mock server.
+# Every request gets the same injected latency, so the sequential run should take ~N * latency and the
+# concurrent run ~ceil(N / concurrency) * latency.
+import argparse
+import asyncio
+import sys
+import time
+
+from .. import async_runner
+from ..mock_server import MockOpenAIServer
+
+
+async def _timed_concurrent_run(examples, client, concurrency):
+    # The async client is bound to the event loop it first ran on, so warm it up inside the same loop.
+    await async_runner.run_concurrently(examples[:1], client=client)
+    start = time.perf_counter()
+    results = await async_runner.run_concurrently(examples, client=client, concurrency=concurrency)
+    return time.perf_counter() - start, results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=0.25, help="seconds added to every mock request")
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args(argv)
+
+    examples = async_runner.INDEPENDENT_EXAMPLES
+    with MockOpenAIServer(latency=args.latency) as server:
+        # One untimed call per client first, so SDK import and client setup are not part of either measurement.
+        client = server.client()
+        examples[0][1](client=client)
+
+        start = time.perf_counter()
+        for _, fn in examples:
+            fn(client=client)
+        sequential = time.perf_counter() - start
+
+        concurrent, results = asyncio.run(_timed_concurrent_run(examples, server.async_client(), args.concurrency))
+
+    failed = [r.name for r in results if not r.ok]
+    in_order = [r.name for r in results] == [name for name, _ in examples]
+    print(f"{len(examples)} examples, {args.latency * 1000:.0f} ms latency each")
+    print(f"sequential: {sequential:.2f} s")
+    print(f"concurrent: {concurrent:.2f} s (concurrency={args.concurrency}, slowest call {max(r.seconds for r in results):.2f} s)")
+    print(f"speedup:    {sequential / concurrent:.1f}x, results in original order: {in_order}")
+    if failed or not in_order:
+        print(f"FAIL: failed examples {failed}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+# Peak memory of sending a PDF inline as base64, for growing file sizes. Each send runs in a fresh child
+# process so its peak RSS measures just that one request: "inline" is the old example (read the file,
+# b64encode, decode to str, f-string it into a data URL, responses.create), "streamed" is
+# files.ask_about_base64_pdf on file_inputs. The mock server decodes every payload it receives and checks it
+# against the file, so both must deliver exactly the same bytes; the streamed peak must not grow with the
+# file size.
+import argparse
+import base64
+import hashlib
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+
+from ..mock_server import MockOpenAIServer, response_payload
+
+MB = 1024 * 1024
+
+
+def peak_rss_mb():
+    # VmHWM is this process's own peak; ru_maxrss can carry the (much larger) parent's peak across exec.
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KB on Linux
+
+
+def send_inline(client, path):
+    with open(path, "rb") as file:
+        data = file.read()
+    base64_string = base64.b64encode(data).decode("utf-8")
+    return client.responses.create(model="gpt-4.1", input=[{"role": "user", "content": [
+        {"type": "input_file", "filename": os.path.basename(path), "file_data": f"data:application/pdf;base64,{base64_string}"},
+        {"type": "input_text", "text": "What is in this file?"},
+    ]}])
+
+
+def child(mode, path, base_url):
+    from openai import OpenAI
+    from openai.types.responses import Response  # noqa: F401  (imported before measuring)
+
+    from ..files import ask_about_base64_pdf
+
+    client = OpenAI(base_url=base_url, api_key="mock", max_retries=0)
+    client.responses.create(model="gpt-4.1", input="warm up")
+    before = peak_rss_mb()
+    if mode == "inline":
+        send_inline(client, path)
+    else:
+        ask_about_base64_pdf(path, question="What is in this file?", client=client)
+    print(f"{before:.1f} {peak_rss_mb():.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[8, 32, 128], help="file sizes in MB")
+    parser.add_argument("--child", nargs=3, metavar=("MODE", "PATH", "BASE_URL"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.child:
+        child(*args.child)
+        return 0
+
+    received = []
+
+    def check_upload(request):
+        body = request.json
+        part = body["input"][0]["content"][0] if isinstance(body["input"], list) else {}
+        if "file_data" in part:
+            prefix, data = part["file_data"].split(",", 1)
+            received.append((prefix, hashlib.sha256(base64.b64decode(data, validate=True)).hexdigest()))
+        return 200, response_payload("resp_upload", body["model"], "ok")
+
+    failed = False
+    with tempfile.TemporaryDirectory() as work_dir, MockOpenAIServer() as server:
+        server.route("POST", r"/v1/responses", check_upload)
+        peaks = {}
+        for size in args.sizes:
+            path = os.path.join(work_dir, f"sample_{size}MB.pdf")
+            digest = hashlib.sha256()
+            with open(path, "wb") as f:
+                for _ in range(size):
+                    block = os.urandom(MB)
+                    digest.update(block)
+                    f.write(block)
+            for mode in ("inline", "streamed"):
+                received.clear()
+                run = subprocess.run([sys.executable, "-m", __spec__.name, "--child", mode, path, server.base_url],
+                                     capture_output=True, text=True)
+                if run.returncode:
+                    print(run.stderr)
+                    return 1
+                before, after = map(float, run.stdout.split())
+                peaks[mode, size] = after - before
+                intact = received == [("data:application/pdf;base64", digest.hexdigest())]
+                print(f"{size:4d} MB {mode + ':':9s} peak RSS +{after - before:7.1f} MB over {before:.0f} MB, "
+                      f"{'payload intact' if intact else 'PAYLOAD MISMATCH'}")
+                failed |= not intact
+            os.remove(path)
+
+    streamed = [peaks["streamed", size] for size in args.sizes]
+    print(f"streamed peak growth from {args.sizes[0]} MB to {args.sizes[-1]} MB: {max(streamed) - min(streamed):+.1f} MB")
+    if failed or max(streamed) > 32:
+        print("FAIL: the streamed upload should deliver the same bytes in bounded memory")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+# End-to-end run of the sentiment batch pipeline against the local mock server, including crashes in
+# the middle of submission: the first attempt dies right after an upload finished but before the pipeline
+# could record the file id, the second right after the API created a batch but before the pipeline could
+# record it, and the third must finish the job without uploading any file or creating any batch twice.
+# Inputs with a repeated review id or a row without text must be rejected before anything is uploaded, and
+# so must resuming the finished run with another input. The work dir's name contains ".jsonl" on purpose.
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+from ..batch import SentimentBatchPipeline
+from ..mock_server import MockOpenAIServer, _last_user_text
+
+REVIEWS = {
+    "Positive": ["Absolutely love it, works great!", "Best purchase this year, amazing sound."],
+    "Negative": ["Terrible quality, broke after a day.", "Awful support, never again."],
+    "Neutral": ["It's fine, does the job.", "Okay product, nothing special."],
+}
+
+
+def keyword_classifier(body):
+    text = _last_user_text(body).lower()
+    if any(word in text for word in ("love", "best", "great", "amazing")):
+        return "Positive"
+    if any(word in text for word in ("terrible", "awful", "broke", "never")):
+        return "Negative"
+    return "Neutral"
+
+
+class Crash(Exception):
+    pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--reviews", type=int, default=20_000)
+    parser.add_argument("--chunk-size", type=int, default=3_000, help="max requests per batch file")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    expected = {}
+    with tempfile.TemporaryDirectory() as work_dir, MockOpenAIServer(batch_delay=0.3) as server:
+        server.reply = keyword_classifier
+        input_path = os.path.join(work_dir, "reviews.jsonl")
+        with open(input_path, "w", encoding="utf-8") as f:
+            for i in range(args.reviews):
+                label = rng.choice(list(REVIEWS))
+                expected[f"review-{i}"] = label
+                f.write(json.dumps({"id": f"review-{i}", "review": rng.choice(REVIEWS[label])}) + "\n")
+
+        client = server.client()
+        batches_dir = os.path.join(work_dir, "run.jsonl.d")
+        start = time.perf_counter()
+
+        # First attempt: the second files.create succeeds on the server, then the process "dies". Second
+        # attempt: the same with the third batches.create.
+        for resource in (client.files, client.batches):
+            crashing = SentimentBatchPipeline(input_path, batches_dir, client=client, max_requests=args.chunk_size)
+            create, calls = resource.create, []
+
+            def create_then_crash(create=create, calls=calls, **kwargs):
+                created = create(**kwargs)
+                calls.append(created.id)
+                if len(calls) == (2 if resource is client.files else 3):
+                    raise Crash()
+                return created
+
+            resource.create = create_then_crash
+            try:
+                crashing.submit()
+            except Crash:
+                pass
+            resource.create = create
+
+        # Third attempt picks up from state.json.
+        pipeline = SentimentBatchPipeline(input_path, batches_dir, client=client, max_requests=args.chunk_size)
+        rows = list(pipeline.run(poll_interval=0.1, max_interval=0.5))
+        seconds = time.perf_counter() - start
+        uploads = sum(1 for meta, _ in server.files.values() if meta["purpose"] == "batch")
+
+        rejected = []
+        for name, lines in (("duplicate-ids", ['{"id": "a", "review": "Fine."}', '{"id": "a", "review": "Bad."}']),
+                            ("missing-text", ['{"id": "a", "review": "Fine."}', '{"id": "b", "title": "Bad."}'])):
+            path = os.path.join(work_dir, f"{name}.jsonl")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+            try:
+                SentimentBatchPipeline(path, os.path.join(work_dir, name), client=client).submit()
+            except ValueError as e:
+                rejected.append(str(e))
+        other_input = os.path.join(work_dir, "duplicate-ids.jsonl")
+        try:
+            SentimentBatchPipeline(other_input, batches_dir, client=client)
+        except ValueError as e:
+            rejected.append(str(e))
+        uploaded_after = sum(1 for meta, _ in server.files.values() if meta["purpose"] == "batch")
+
+    chunks = len(pipeline.state["chunks"])
+    wrong = sum(1 for row in rows if row["label"] != expected[row["custom_id"]])
+    in_order = [row["custom_id"] for row in rows] == list(expected)
+    print(f"{len(rows)} reviews in {chunks} batches, {uploads} files uploaded, {len(server.batches)} batches created, "
+          f"{seconds:.2f} s")
+    print(f"mislabelled: {wrong}, results in input order: {in_order}")
+    print(f"rejected inputs: {rejected}")
+    if len(server.batches) != chunks or uploads != chunks or wrong or not in_order or len(rows) != args.reviews:
+        print("FAIL")
+        return 1
+    if len(rejected) != 3 or uploaded_after != uploads:
+        print("FAIL")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
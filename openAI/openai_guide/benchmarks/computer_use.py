@@ -0,0 +1,114 @@
+# A scripted computer use session on the local mock server against a FakeEnvironment of --width x
+# --height, with --latency seconds of model time per request, --interval seconds between streamed events,
+# and --action/--capture seconds per action and screenshot:
+#   baseline   the plain loop: wait for the whole response, act, full-size PNG
+#   pipelined  streamed, acting as soon as the computer_call is done, PNG at half size
+#   webp       as pipelined, WebP at half size (needs Pillow)
+# The script clicks, types, drags and scrolls, with moves and waits in between that leave the screen
+# unchanged. Every screenshot the server received must be a valid image, the environment must have
+# executed the script's coordinates (within the downscaling error), and the optimised runs must send a
+# fraction of the bytes in less time per step.
+import argparse
+import statistics
+import sys
+import time
+
+from ..computer_use import ComputerUseAgent, FakeEnvironment, ScreenshotEncoder
+from ..mock_server import MockOpenAIServer
+
+SCRIPT = [
+    {"type": "click", "button": "left", "x": 120, "y": 200},
+    {"type": "type", "text": "dark mode"},
+    {"type": "keypress", "keys": ["ENTER"]},
+    {"type": "wait"},
+    {"type": "move", "x": 500, "y": 300},
+    {"type": "scroll", "x": 500, "y": 300, "scroll_x": 0, "scroll_y": 120},
+    {"type": "double_click", "x": 801, "y": 455},
+    {"type": "drag", "path": [{"x": 300, "y": 400}, {"x": 420, "y": 410}, {"x": 611, "y": 433}]},
+    {"type": "wait"},
+    {"type": "click", "button": "right", "x": 1001, "y": 767},
+]
+
+
+def run_mode(server, args, name, encoder, pipelined):
+    environment = FakeEnvironment(args.width, args.height, action_seconds=args.action, capture_seconds=args.capture)
+    del server.screenshots[:]
+    start = time.perf_counter()
+    with ComputerUseAgent(environment, client=server.client(), encoder=encoder, pipelined=pipelined) as agent:
+        run = agent.run("Open the settings page and turn on dark mode")
+    seconds = time.perf_counter() - start
+    sent = statistics.fmean(size for _, size in server.screenshots)
+    print(f"{name + ':':10s} {seconds:5.2f} s, {seconds / len(run.steps) * 1000:4.0f} ms per step, "
+          f"{sent / 1000:6.1f} kB per screenshot ({agent.tool['display_width']}x{agent.tool['display_height']})")
+    print(f"{'':10s} {run.summary()}")
+    return run, environment, seconds, sent
+
+
+def coordinates_ok(environment, slack):
+    # Whether every executed action landed where the script put it, give or take `slack` pixels.
+    if len(environment.actions) != len(SCRIPT):
+        return False
+    for done, scripted in zip(environment.actions, SCRIPT):
+        points = [(done, scripted)] + list(zip(done.get("path", []), scripted.get("path", [])))
+        for a, b in points:
+            if "x" in b and (abs(a["x"] - b["x"]) > slack or abs(a["y"] - b["y"]) > slack):
+                return False
+            if "scroll_y" in b and abs(a["scroll_y"] - b["scroll_y"]) > slack:
+                return False
+    return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--width", type=int, default=1024)
+    parser.add_argument("--height", type=int, default=768)
+    parser.add_argument("--latency", type=float, default=0.15, help="seconds of model time per request")
+    parser.add_argument("--interval", type=float, default=0.02, help="seconds between streamed events")
+    parser.add_argument("--action", type=float, default=0.05, help="seconds per action")
+    parser.add_argument("--capture", type=float, default=0.03, help="seconds per screenshot")
+    args = parser.parse_args(argv)
+
+    try:
+        import PIL  # noqa: F401
+        modes = ["baseline", "pipelined", "webp"]
+    except ImportError:
+        modes = ["baseline", "pipelined"]
+    failed = False
+    results = {}
+    with MockOpenAIServer(latency=args.latency) as server:
+        server.token_interval = args.interval
+        server.computer_script = SCRIPT
+        server.script_display = (args.width, args.height)
+        for mode in modes:
+            encoder = ScreenshotEncoder() if mode == "baseline" else \
+                ScreenshotEncoder(format="png" if mode == "pipelined" else "webp", max_width=args.width // 2)
+            run, environment, seconds, sent = run_mode(server, args, mode, encoder, pipelined=mode != "baseline")
+            results[mode] = (seconds, sent)
+            kinds = {kind for kind, _ in server.screenshots}
+            failed |= run.stopped is not None or len(run.steps) != len(SCRIPT) or kinds != {encoder.format}
+            failed |= not coordinates_ok(environment, 1 if mode == "baseline" else 2)
+            failed |= sum(step.duplicate for step in run.steps) < 2
+            if mode != "baseline":
+                failed |= sum(step.hidden for step in run.steps) <= 0
+
+        for pipelined in (False, True):
+            environment = FakeEnvironment(args.width, args.height)
+            with ComputerUseAgent(environment, client=server.client(), max_steps=3, pipelined=pipelined) as agent:
+                run = agent.run("Stop after three steps")
+            print(f"max_steps=3, {'pipelined' if pipelined else 'plain'}: {len(environment.actions)} actions, stopped: {run.stopped}")
+            failed |= len(environment.actions) != 3 or run.stopped != "max_steps"
+
+    base_seconds, base_sent = results["baseline"]
+    for mode in modes[1:]:
+        seconds, sent = results[mode]
+        print(f"{mode}: {base_sent / sent:.1f}x fewer screenshot bytes, {(1 - seconds / base_seconds) * 100:.0f}% less time")
+        failed |= sent * 2 > base_sent or seconds >= base_seconds
+
+    if failed:
+        print("FAIL: the pipelined agent should follow the script with smaller screenshots in less time")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
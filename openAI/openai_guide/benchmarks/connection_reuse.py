@@ -0,0 +1,56 @@
+# Connection reuse under load: several threads interleave SDK calls and helper downloads against the
+# local mock server, all through the shared pool in transport.py, and the opened/reused counters are
+# compared with one-connection-per-call downloads (what bare requests.get() did).
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .. import transport
+from ..mock_server import MockOpenAIServer
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--calls", type=int, default=25, help="SDK calls + downloads per thread")
+    parser.add_argument("--latency", type=float, default=0.005)
+    args = parser.parse_args(argv)
+
+    import httpx
+
+    with MockOpenAIServer(latency=args.latency) as server:
+        server.route("GET", r"/download/(\d+)", lambda request: (200, b"x" * int(request.match.group(1))))
+        download_url = server.base_url.rsplit("/v1", 1)[0] + "/download/65536"
+        transport.configure(max_connections=args.threads, max_keepalive_connections=args.threads, http2=False)
+        client = server.client(http_client=transport.get_http_client())
+
+        def worker(_):
+            for _ in range(args.calls):
+                client.responses.create(model="gpt-4.1", input="ping")
+                transport.http_get(download_url)
+
+        transport.stats.reset()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(args.threads) as pool:
+            list(pool.map(worker, range(args.threads)))
+        pooled_seconds = time.perf_counter() - start
+        pooled = transport.stats.snapshot()
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(args.threads) as pool:
+            list(pool.map(lambda _: [httpx.get(download_url) for _ in range(args.calls)], range(args.threads)))
+        unpooled_seconds = time.perf_counter() - start
+
+    total = args.threads * args.calls
+    print(f"shared pool:  {pooled['requests']} requests, {pooled['opened']} connections opened, "
+          f"{pooled['reused']} reused ({pooled['reused'] / pooled['requests']:.0%}) in {pooled_seconds:.2f} s")
+    print(f"no pooling:   {total} downloads, {total} connections opened in {unpooled_seconds:.2f} s")
+    if pooled["opened"] > args.threads:
+        print(f"FAIL: opened more connections than the pool allows ({args.threads})")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
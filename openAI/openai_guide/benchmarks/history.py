@@ -0,0 +1,72 @@
+# A 50-turn chat against the local mock server, whose latency grows with the request size
+# (--bytes-per-ms), three ways:
+#   full history  every turn resends the whole list (tell_jokes)
+#   truncate      ConversationStore dropping the oldest turns beyond the token budget
+#   summarize     ConversationStore folding them into a summary (one extra model call per compaction)
+import argparse
+import sys
+import time
+
+from ..history import SUMMARIZE, TRUNCATE, ConversationStore, model_summarizer
+from ..mock_server import MockOpenAIServer
+
+
+def full_history(client, questions):
+    history, sizes = [], []
+    for question in questions:
+        history.append({"role": "user", "content": question})
+        request = client.chat.completions.with_raw_response.create(model="gpt-4", messages=history)
+        sizes.append(len(request.http_request.content))
+        history.append(request.parse().choices[0].message)
+    return sizes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=50)
+    parser.add_argument("--budget", type=int, default=1500)
+    parser.add_argument("--bytes-per-ms", type=float, default=1000, help="simulated upload speed of the mock")
+    args = parser.parse_args(argv)
+
+    questions = [f"Question {i}: tell me a joke about the number {i}, and explain it. " * 3 for i in range(args.turns)]
+    failed = False
+    with MockOpenAIServer(latency=lambda request: len(request.raw) / args.bytes_per_ms / 1000) as server:
+        server.reply = lambda body: "Here's one. " + "Why did the number cross the road? " * 8
+        client = server.client()
+
+        start = time.perf_counter()
+        sizes = full_history(client, questions)
+        elapsed = time.perf_counter() - start
+        print(f"full history  {elapsed:.2f} s, last turn {sizes[-1] / 1024:.1f} KiB, {sum(sizes) / 1024:.0f} KiB in total")
+
+        for policy in (TRUNCATE, SUMMARIZE):
+            served = len(server.requests)
+            store = ConversationStore(budget=args.budget, keep_last=6, policy=policy,
+                                      summarizer=model_summarizer(client) if policy == SUMMARIZE else None)
+            start = time.perf_counter()
+            for question in questions:
+                store.ask(question, client=client)
+            elapsed = time.perf_counter() - start
+            turns = store.turn_stats()
+            print(f"{policy:13s} {elapsed:.2f} s, last turn {turns[-1].bytes_sent / 1024:.1f} KiB "
+                  f"({turns[-1].tokens} tokens), {sum(t.bytes_sent for t in turns) / 1024:.0f} KiB in total, "
+                  f"{len(server.requests) - served} requests")
+            if max(t.tokens for t in turns) > args.budget or turns[-1].bytes_sent >= sizes[-1]:
+                failed = True
+
+        # keep_last=0 may drop every message, the newest included.
+        store = ConversationStore(budget=50, keep_last=0)
+        for question in questions[:5]:
+            store.append({"role": "user", "content": question})
+        removed = store.compact()
+        print(f"keep_last=0   {removed} of 5 messages removed, {len(store.messages())} left")
+        failed |= removed == 0
+
+    if failed:
+        print("FAIL: the store should keep every request within the token budget")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
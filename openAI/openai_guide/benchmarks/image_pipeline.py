@@ -0,0 +1,118 @@
+# Generating --images images of --size MB each on the local mock server, which takes --seconds per image
+# and allows --rate images per second (bursts of --burst), answering 429 beyond that. Each mode runs in a
+# fresh child process so its peak RSS (VmHWM) covers just that job: "naive" is generate_image's approach
+# run --concurrency at a time with asyncio.gather (parse the whole response, b64decode the whole string,
+# write), relying on the SDK's own retries (up to 10) for 429s; "pipeline" is ImagePipeline with the same starting
+# concurrency; "streamed" is the pipeline with stream=True and two partial images per prompt. Every file
+# written is compared with the image the server generated; the pipeline's peak must stay well below the
+# naive one, and it must get every image through the rate limit.
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from ..mock_server import MockOpenAIServer, mock_image
+from .base64_inputs import peak_rss_mb
+
+MB = 1024 * 1024
+
+
+async def naive(client, prompts, out_dir, concurrency):
+    import base64
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(number, prompt):
+        async with semaphore:
+            response = await client.responses.create(model="gpt-4.1", input=prompt, tools=[{"type": "image_generation"}])
+            image_data = [output.result for output in response.output if output.type == "image_generation_call"]
+            with open(os.path.join(out_dir, f"image_{number:05d}.png"), "wb") as f:
+                f.write(base64.b64decode(image_data[0]))
+
+    results = await asyncio.gather(*(one(number, prompt) for number, prompt in enumerate(prompts)), return_exceptions=True)
+    return sum(isinstance(result, Exception) for result in results)
+
+
+def child(mode, base_url, out_dir, images, concurrency):
+    from openai import AsyncOpenAI
+    from openai.types.responses import Response  # noqa: F401  (imported before measuring)
+
+    from ..image_pipeline import ImagePipeline
+
+    prompts = [f"image number {number}" for number in range(int(images))]
+
+    async def main():
+        async with AsyncOpenAI(base_url=base_url, api_key="mock", max_retries=10) as client:
+            before = peak_rss_mb()
+            start = time.perf_counter()
+            if mode == "naive":
+                failed = await naive(client, prompts, out_dir, int(concurrency))
+                rate_limited = "?"
+            else:
+                pipeline = ImagePipeline(client, out_dir=out_dir, concurrency=int(concurrency), stream=mode == "streamed",
+                                         partial_images=2 if mode == "streamed" else 0, max_attempts=20)
+                await pipeline.generate(prompts)
+                failed, rate_limited = pipeline.stats.failed, pipeline.stats.rate_limited
+            print(f"{before:.1f} {peak_rss_mb():.1f} {time.perf_counter() - start:.3f} {failed} {rate_limited}")
+
+    asyncio.run(main())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--images", type=int, default=48)
+    parser.add_argument("--size", type=float, default=4.0, help="MB per image")
+    parser.add_argument("--seconds", type=float, default=0.25, help="time to generate one image")
+    parser.add_argument("--rate", type=float, default=4.0, help="images per second the server allows")
+    parser.add_argument("--burst", type=float, default=4.0)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--child", nargs=5, metavar=("MODE", "BASE_URL", "OUT_DIR", "IMAGES", "CONCURRENCY"),
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.child:
+        child(*args.child)
+        return 0
+
+    failed = False
+    peaks = {}
+    with tempfile.TemporaryDirectory() as work_dir, MockOpenAIServer() as server:
+        server.image_size = int(args.size * MB)
+        server.image_time = args.seconds
+        for mode in ("naive", "pipeline", "streamed"):
+            server.image_rate = (args.rate, args.burst)
+            server._image_bucket = None
+            out_dir = os.path.join(work_dir, mode)
+            os.makedirs(out_dir)
+            run = subprocess.run([sys.executable, "-m", __spec__.name, "--child", mode, server.base_url, out_dir,
+                                  str(args.images), str(args.concurrency)], capture_output=True, text=True)
+            if run.returncode:
+                print(run.stderr)
+                return 1
+            before, after, seconds, errors, rate_limited = run.stdout.split()
+            peaks[mode] = float(after) - float(before)
+            intact = 0
+            for number in range(args.images):
+                path = os.path.join(out_dir, f"image_{number:05d}.png")
+                if os.path.exists(path):
+                    with open(path, "rb") as f:
+                        intact += f.read() == mock_image(f"image number {number}", server.image_size)
+            partials = sum(name.count(".partial") for name in os.listdir(out_dir))
+            print(f"{mode + ':':10s} {intact}/{args.images} images intact ({errors} failed, {rate_limited} rate-limited "
+                  f"requests{f', {partials} partial images' if partials else ''}) in {float(seconds):.2f} s = "
+                  f"{intact * 60 / float(seconds):.0f} images/min, peak RSS +{peaks[mode]:.1f} MB")
+            if mode != "naive":
+                failed |= intact != args.images or (mode == "streamed" and partials != 2 * args.images)
+            for name in os.listdir(out_dir):
+                os.remove(os.path.join(out_dir, name))
+
+    if failed or peaks["pipeline"] > peaks["naive"] / 2 or peaks["streamed"] > peaks["naive"] / 2:
+        print("FAIL: the pipeline should deliver every image intact in a fraction of the naive memory")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+# Per-turn request size and time of an image edit session on the local mock server, with --size MB images
+# and request bodies read at --upload-rate MB/s. Each mode generates one image and edits it --edits
+# times, the last edit branching from the first image: "inline" sends the image back as a base64
+# input_image every turn (the baseline), "reference" refers to the image_generation_call id, "chain" to
+# the previous response. The mock derives every edited image from the image it was asked to edit, so all
+# three modes must end with identical files. Finally the server forgets every stored response and image
+# mid-session: the reference session must fall back to sending the saved image inline and carry on.
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from ..image_session import CHAIN, INLINE, REFERENCE, ImageEditSession
+from ..mock_server import MockOpenAIServer
+
+MB = 1024 * 1024
+PROMPTS = ["Draw a gray tabby cat hugging an otter with an orange scarf", "Now make it look realistic",
+           "Add a snowy forest behind them", "Make it golden hour", "Give the cat a tiny hat"]
+
+
+def run_session(server, mode, out_dir, edits):
+    session = ImageEditSession(client=server.client(), mode=mode, out_dir=out_dir)
+    session.generate(PROMPTS[0])
+    seconds = []
+    for number in range(edits):
+        start = time.perf_counter()
+        session.edit(PROMPTS[1 + number % (len(PROMPTS) - 1)], turn=0 if number == edits - 1 else None)
+        seconds.append(time.perf_counter() - start)
+    return session, seconds
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=float, default=1.5, help="MB per image")
+    parser.add_argument("--edits", type=int, default=4)
+    parser.add_argument("--upload-rate", type=float, default=20.0, help="MB/s")
+    args = parser.parse_args(argv)
+
+    failed = False
+    finals = {}
+    with tempfile.TemporaryDirectory() as work_dir, MockOpenAIServer() as server:
+        server.image_size = int(args.size * MB)
+        server.upload_rate = args.upload_rate * MB
+        sessions = {}
+        for mode in (INLINE, REFERENCE, CHAIN):
+            session, seconds = run_session(server, mode, os.path.join(work_dir, mode), args.edits)
+            sessions[mode] = session
+            edits = session.turns[1:]
+            sent = statistics.fmean(turn.bytes_sent for turn in edits)
+            inline = statistics.fmean(turn.inline_bytes for turn in edits)
+            print(f"{mode + ':':10s} {sent / 1024:9.1f} KB sent per edit (inline: {inline / 1024:.1f} KB, "
+                  f"{inline / sent:,.0f}x), {statistics.fmean(seconds) * 1000:6.1f} ms per edit, "
+                  f"turn modes {[turn.mode for turn in edits]}")
+            finals[mode] = []
+            for turn in session.turns:
+                with open(turn.path, "rb") as f:
+                    finals[mode].append(f.read())
+        for mode in (REFERENCE, CHAIN):
+            failed |= finals[mode] != finals[INLINE]
+            failed |= max(turn.bytes_sent for turn in sessions[mode].turns[1:]) * 100 > sessions[INLINE].turns[1].bytes_sent
+        estimate = sessions[REFERENCE].turns[1].inline_bytes
+        actual = sessions[INLINE].turns[1].bytes_sent
+        print(f"inline estimate {estimate} bytes vs actually sent {actual}")
+        failed |= abs(estimate - actual) > 0.001 * actual
+
+        session = sessions[REFERENCE]
+        server.expire_responses()
+        turn = session.edit("Make it black and white")
+        again = session.edit("Add a frame")
+        print(f"after the server forgot everything: {turn.mode} ({turn.bytes_sent / 1024:.1f} KB), "
+              f"then {again.mode} ({again.bytes_sent / 1024:.1f} KB); stats {session.stats}")
+        failed |= turn.mode != INLINE or again.mode != REFERENCE or session.stats["fallbacks"] != 1
+
+    if failed:
+        print("FAIL: referencing images should produce the same images while sending a fraction of the bytes")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
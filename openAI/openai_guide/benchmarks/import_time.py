@@ -0,0 +1,64 @@
+# Cold-import benchmark: imports openai_guide in a fresh interpreter several times and fails (exit code 1)
+# if the median or the slowest import takes longer than the budget, or if any heavy dependency got imported
+# along the way.
+# The same goes for importing the function-calling helpers, whose module registers its tools at import.
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+HEAVY_MODULES = ["openai", "pydantic", "httpx", "requests"]
+
+IMPORTS = ["import openai_guide", "from openai_guide import call_function, get_weather"]
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+%s
+elapsed = time.perf_counter() - start
+print(json.dumps({"seconds": elapsed, "loaded": [m for m in %r if m in sys.modules]}))
+"""
+
+
+def measure(runs=10, statement=IMPORTS[0]):
+    package_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    samples, loaded = [], set()
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", _PROBE % (statement, HEAVY_MODULES)], cwd=package_root, env=env,
+            capture_output=True, text=True, check=True,
+        ).stdout
+        result = json.loads(out)
+        samples.append(result["seconds"])
+        loaded.update(result["loaded"])
+    return samples, sorted(loaded)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, default=20.0, help="maximum cold-import time, median and max")
+    args = parser.parse_args(argv)
+
+    failed = False
+    for statement in IMPORTS:
+        samples, loaded = measure(args.runs, statement)
+        median_ms, max_ms = statistics.median(samples) * 1000, max(samples) * 1000
+        print(f"{statement}: median {median_ms:.2f} ms, max {max_ms:.2f} ms over {args.runs} runs")
+        if loaded:
+            print(f"FAIL: heavy modules imported: {', '.join(loaded)}")
+            failed = True
+        elif median_ms > args.budget_ms or max_ms > args.budget_ms:
+            print(f"FAIL: over the {args.budget_ms:.0f} ms budget")
+            failed = True
+    if failed:
+        return 1
+    print(f"OK: within the {args.budget_ms:.0f} ms budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
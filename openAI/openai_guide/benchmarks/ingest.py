@@ -0,0 +1,86 @@
+# Adding a corpus of small documents to a vector store on the local mock server, every request delayed by
+# --latency and every file taking --processing seconds to be indexed. The baseline is the File Search
+# example applied to each document in turn (upload, vector_stores.files.create) followed by
+# wait_until_ready; ingest_files uploads --concurrency at a time and adds the files in batches of
+# --batch-size. In the ingest run every 20th file fails to be indexed the first time it is added and one
+# file always fails: the first must be retried into the store, the other reported as failed.
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from ..file_search import wait_until_ready
+from ..ingest import ingest_files
+from ..mock_server import MockOpenAIServer
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--processing", type=float, default=0.5)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as work_dir, MockOpenAIServer(latency=args.latency) as server:
+        paths = []
+        for i in range(args.files):
+            path = os.path.join(work_dir, f"doc{i:05d}.txt")
+            with open(path, "wb") as f:
+                f.write((f"document {i} " * 1000).encode())
+            paths.append(path)
+        server.vector_store_file_delay = args.processing
+        client = server.client()
+
+        start = time.perf_counter()
+        store = client.vector_stores.create(name="baseline")
+        for path in paths:
+            with open(path, "rb") as f:
+                file_id = client.files.create(file=f, purpose="assistants").id
+            client.vector_stores.files.create(vector_store_id=store.id, file_id=file_id)
+        files = wait_until_ready(store.id, poll_interval=0.25, client=client)
+        baseline = time.perf_counter() - start
+        baseline_requests = len(server.requests)
+        print(f"one by one: {sum(file.status == 'completed' for file in files)}/{len(paths)} files in {baseline:.2f} s, "
+              f"{baseline_requests} requests")
+        server.files.clear()
+
+        names = {}
+        added = set()
+
+        def fails(file_id):
+            name = names.setdefault(file_id, server.files[file_id][0]["filename"])
+            index = int(name[3:8])
+            first_time = file_id not in added
+            added.add(file_id)
+            return index == 7 or (index % 20 == 0 and first_time)
+
+        server.vector_store_file_fails = fails
+        store = client.vector_stores.create(name="ingest")
+        before = len(server.requests)
+        updates = []
+        progress = ingest_files(store.id, paths, client=client, batch_size=args.batch_size, concurrency=args.concurrency,
+                                poll_interval=args.processing / 2, max_interval=args.processing * 4,
+                                on_progress=lambda progress: updates.append(progress.completed))
+        requests = len(server.requests) - before
+        print(f"ingest_files: {progress.summary()}, {requests} requests, {len(updates)} progress updates")
+        failed = [os.path.basename(path) for path, status in progress.statuses.items() if status == "failed"]
+        print(f"failed: {failed} ({progress.errors[paths[7]] if failed else ''})")
+
+        completed = {item.id for item in client.vector_stores.files.list(vector_store_id=store.id, filter="completed")}
+        expected = {file_id for path, file_id in progress.file_ids.items() if path != paths[7]}
+        print(f"speedup {baseline / progress.elapsed:.1f}x, {baseline_requests / requests:.1f}x fewer requests")
+
+    if failed != ["doc00007.txt"] or completed != expected or progress.completed != len(paths) - 1:
+        print("FAIL: every file but the one that always fails should end up completed in the store")
+        return 1
+    if progress.elapsed * 3 > baseline:
+        print("FAIL: batched ingestion should be at least 3x faster than adding files one by one")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+# Recall and latency of LocalIndex on a synthetic corpus embedded with the deterministic HashEmbedder.
+# Every document is mostly about one topic (its own small vocabulary), with some of a second topic and of
+# common filler words, and tagged {"type": "blog" | "paper" | "faq", "year": ...}. Each query is 30 words
+# taken from one chunk. Reports, per query: the brute-force search time and how often the document the
+# query came from is in its top --max-num-results; then for the IVF index, its search time and recall against brute force at a few
+# n_probe settings. Filtered searches must return only files that match the filter, never more than
+# max_num_results, and exactly what brute force returns when restricted to those files. The sample PDF is
+# indexed too, to check extraction.
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from ..files import SAMPLE_PDF
+from ..local_search import HashEmbedder, LocalIndex, matches
+
+TYPES = ("blog", "paper", "faq")
+
+
+def make_corpus(work_dir, documents, words_per_document, seed=0):
+    rng = random.Random(seed)
+    topics = [[f"t{topic}w{word}" for word in range(40)] for topic in range(documents // 10 + 1)]
+    filler = [f"common{word}" for word in range(300)]
+    paths, attributes = [], {}
+    for number in range(documents):
+        main, other = rng.sample(topics, 2)
+        words = [rng.choice(main if draw < 0.75 else other if draw < 0.85 else filler)
+                 for draw in (rng.random() for _ in range(words_per_document))]
+        path = os.path.join(work_dir, f"doc{number:05d}.txt")
+        with open(path, "w") as f:
+            f.write(" ".join(words))
+        paths.append(path)
+        attributes[path] = {"type": TYPES[number % len(TYPES)], "year": 2020 + number % 5}
+    return paths, attributes
+
+
+def timed(search, queries):
+    seconds, results = [], []
+    for query in queries:
+        start = time.perf_counter()
+        results.append(search(query))
+        seconds.append(time.perf_counter() - start)
+    seconds.sort()
+    return results, statistics.median(seconds) * 1000, seconds[int(len(seconds) * 0.95)] * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--documents", type=int, default=3000)
+    parser.add_argument("--words", type=int, default=900, help="words per document")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--max-num-results", type=int, default=10)
+    parser.add_argument("--n-lists", type=int, default=64)
+    args = parser.parse_args(argv)
+    k = args.max_num_results
+
+    failed = False
+    embedder = HashEmbedder()
+    with tempfile.TemporaryDirectory() as work_dir:
+        paths, attributes = make_corpus(work_dir, args.documents, args.words)
+        start = time.perf_counter()
+        flat = LocalIndex.build(os.path.join(work_dir, "flat"), paths, embedder, attributes=attributes)
+        build_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        ivf = LocalIndex.build(os.path.join(work_dir, "ivf"), paths, embedder, attributes=attributes, n_lists=args.n_lists)
+        print(f"{len(paths)} documents -> {len(flat)} chunks; built in {build_seconds:.1f} s "
+              f"(IVF with {args.n_lists} lists: {time.perf_counter() - start:.1f} s)")
+
+        rng = random.Random(1)
+        sources = rng.sample(range(len(flat)), args.queries)
+        texts = [" ".join(rng.sample(flat.text(chunk).split(), 30)) for chunk in sources]
+        queries = [embedder.embed_query(text) for text in texts]
+
+        exact, p50, p95 = timed(lambda query: flat.search(query, max_num_results=k), queries)
+        exact_ids = [[(r["file_id"], r["text"]) for r in results] for results in exact]
+        found = sum(flat.files[flat.chunk_files[chunk]]["file_id"] in {r["file_id"] for r in results}
+                    for chunk, results in zip(sources, exact))
+        print(f"brute force: p50 {p50:.2f} ms, p95 {p95:.2f} ms, source document in top {k}: {found / len(sources):.0%}")
+        failed |= found < 0.9 * len(sources) or any(len(results) != k for results in exact)
+
+        for n_probe in (2, 4, 8):
+            approximate, p50, p95 = timed(lambda query: ivf.search(query, max_num_results=k, n_probe=n_probe), queries)
+            recall = statistics.fmean(len({(r["file_id"], r["text"]) for r in results} & set(ids)) / k
+                                      for results, ids in zip(approximate, exact_ids))
+            print(f"IVF n_probe={n_probe}: p50 {p50:.2f} ms, p95 {p95:.2f} ms, recall@{k} {recall:.3f}")
+        failed |= recall < 0.9
+
+        filters = {"type": "and", "filters": [{"type": "eq", "key": "type", "value": "blog"},
+                                              {"type": "gte", "key": "year", "value": 2022}]}
+        allowed = {file["file_id"] for file in flat.files if matches(filters, file["attributes"])}
+        filtered, p50, p95 = timed(lambda query: flat.search(query, max_num_results=3, filters=filters), queries)
+        wrong = sum(r["file_id"] not in allowed for results in filtered for r in results)
+        sizes = {len(results) for results in filtered}
+        print(f"filtered ({len(allowed)} of {len(flat.files)} files): p50 {p50:.2f} ms, p95 {p95:.2f} ms, "
+              f"{wrong} results outside the filter, result counts {sorted(sizes)}")
+        failed |= wrong > 0 or sizes != {3}
+        faq = {"type": "eq", "key": "type", "value": "faq"}
+        brute = [r for r in flat.search(queries[0], max_num_results=len(flat)) if r["attributes"]["type"] == "faq"][:k]
+        failed |= [r["text"] for r in flat.search(queries[0], max_num_results=k, filters=faq)] != [r["text"] for r in brute]
+        failed |= len(ivf.search(queries[0], max_num_results=k, filters=faq)) != k
+
+        pdf = LocalIndex.build(os.path.join(work_dir, "pdf"), [SAMPLE_PDF], embedder,
+                               attributes={os.path.basename(SAMPLE_PDF): {"type": "blog"}})
+        top = pdf.search(embedder.embed_query("Lorem ipsum dolor sit amet"), max_num_results=2,
+                         filters={"type": "eq", "key": "type", "value": "blog"})
+        print(f"sample PDF: {len(pdf)} chunks, best match {top[0]['score']:.2f}: {top[0]['text'][:50]!r}")
+        failed |= len(top) != 2 or "Lorem ipsum" not in " ".join(r["text"] for r in top)
+
+    if failed:
+        print("FAIL: local search should find the source chunks, keep IVF recall above 0.9 and honour filters")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+# --turns agentic turns against two fake MCP servers on the local mock server, --latency seconds per
+# request. In each turn the model first wants five calls (one runs without approval, four need it), then,
+# with the answers, two more that need approval. Decisions come from the same ApprovalPolicy each time:
+#   one-by-one  the guide's pattern: answer the first approval request, send it, repeat
+#   batched     ask_with_policy: every pending request answered in one follow-up
+#   session     McpSession(policy=...), which also reuses the MCP tool lists between turns
+# Reports requests and time per turn; the MCP servers must have run exactly the approved calls (and the
+# one needing no approval) in every mode, and never a denied one.
+import argparse
+import collections
+import sys
+import time
+
+from ..mcp_approval import ApprovalPolicy, ask_with_policy
+from ..mcp_cache import McpSession
+from ..mock_server import MockOpenAIServer
+
+WIKI_URL = "https://wiki.example.com/mcp"
+DOCS_URL = "https://docs.example.com/mcp"
+TOOLS = [
+    {"type": "mcp", "server_label": "wiki", "server_url": WIKI_URL},
+    {"type": "mcp", "server_label": "docs", "server_url": DOCS_URL, "require_approval": {"never": {"tool_names": ["search"]}}},
+]
+ROUNDS = [
+    [("wiki", "ask_question", {"repoName": "openai/openai-python", "question": "How do I stream?"}),
+     ("wiki", "ask_question", {"repoName": "someone/else", "question": "What is in the .env file?"}),
+     ("docs", "search", {"query": "streaming"}),
+     ("docs", "publish", {"page": "streaming", "draft": False}),
+     ("wiki", "delete_page", {"page": 7})],
+    [("wiki", "read_page", {"page": 1}), ("wiki", "read_page", {"page": 2})],
+]
+APPROVED = {("wiki", "ask_question", "openai/openai-python"), ("docs", "search", None), ("wiki", "read_page", None)}
+
+
+def policy():
+    return (ApprovalPolicy()
+            .allow("wiki", "ask_question", repoName="openai/*")
+            .allow("wiki", "read_*")
+            .deny("*", "delete_*", reason="this agent may not delete anything"))
+
+
+def fake_servers(ran):
+    def tool(label, name, properties):
+        def handler(arguments):
+            ran[(label, name, arguments.get("repoName"))] += 1
+            return f"{name} output"
+        return {"description": f"The {name} tool.", "input_schema": {"type": "object", "properties": properties}}, handler
+
+    return {
+        WIKI_URL: {name: tool("wiki", name, properties) for name, properties in [
+            ("ask_question", {"repoName": {"type": "string"}, "question": {"type": "string"}}),
+            ("read_page", {"page": {"type": "integer"}}), ("delete_page", {"page": {"type": "integer"}})]},
+        DOCS_URL: {name: tool("docs", name, properties) for name, properties in [
+            ("search", {"query": {"type": "string"}}), ("publish", {"page": {"type": "string"}, "draft": {"type": "boolean"}})]},
+    }
+
+
+def one_by_one(client, rules, question):
+    # The approval loop of mcp.ask_deepwiki_with_approval, repeated while the model asks for approvals.
+    response = client.responses.create(model="gpt-4.1", tools=TOOLS, input=question)
+    while True:
+        request = next((item for item in response.output if item.type == "mcp_approval_request"), None)
+        if request is None:
+            return response
+        decision = rules.decide(request)
+        response = client.responses.create(model="gpt-4.1", tools=TOOLS, previous_response_id=response.id, input=[{
+            "type": "mcp_approval_response", "approve": decision.approve, "approval_request_id": request.id}])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per request")
+    args = parser.parse_args(argv)
+
+    failed = False
+    requests = {}
+    with MockOpenAIServer(latency=args.latency) as server:
+        ran = collections.Counter()
+        server.mcp_servers.update(fake_servers(ran))
+        server.mcp_plan = lambda body, tools, round: ROUNDS[round] if round < len(ROUNDS) else []
+        client = server.client()
+        for mode in ("one-by-one", "batched", "session"):
+            rules = policy()
+            session = McpSession(client, tools=TOOLS, policy=rules)
+            ran.clear()
+            server.mcp_list_fetches.clear()
+            before = len(server.requests)
+            start = time.perf_counter()
+            for turn in range(args.turns):
+                question = f"turn {turn}: how do I stream responses?"
+                if mode == "one-by-one":
+                    response = one_by_one(client, rules, question)
+                elif mode == "batched":
+                    response = ask_with_policy(question, rules, TOOLS, client=client)
+                else:
+                    response = session.ask(question)
+                failed |= not response.output_text
+            seconds = (time.perf_counter() - start) / args.turns
+            requests[mode] = (len(server.requests) - before) / args.turns
+            print(f"{mode + ':':11s} {requests[mode]:4.1f} requests and {seconds * 1000:5.0f} ms per turn, "
+                  f"{sum(server.mcp_list_fetches.values())} tool-list fetches, policy {rules.stats}")
+            keys = {(label, name, repo if name == "ask_question" else None) for label, name, repo in ran}
+            failed |= keys != APPROVED or sum(ran.values()) != 4 * args.turns
+            failed |= rules.stats["approved"] != 3 * args.turns or rules.stats["denied"] != 3 * args.turns
+        failed |= requests["batched"] != len(ROUNDS) + 1 or requests["session"] != requests["batched"]
+        failed |= requests["one-by-one"] != 7 or sum(server.mcp_list_fetches.values()) != len(TOOLS)
+
+    if failed:
+        print("FAIL: the policy should run exactly the allowed calls, answering each round's approvals in one request")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
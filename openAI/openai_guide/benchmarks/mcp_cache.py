@@ -0,0 +1,97 @@
+# --questions separate requests with a remote MCP server in their tools, on the local mock server whose
+# fake MCP server takes --list-time seconds to list its tools (with --tools tool definitions):
+#   plain    responses.create with the MCP tool every time, so every request lists the tools
+#   session  McpSession, which lists them once and sends the mcp_list_tools item back with later requests
+# Reports tool-list fetches, time and input tokens per request. Then the server changes a tool's schema:
+# the next request must notice the failed call, refresh the list and succeed, and a session with a short
+# --ttl must fetch the list again once it has expired.
+import argparse
+import statistics
+import sys
+import time
+
+from ..mcp_cache import McpSession, McpToolListCache
+from ..mock_server import MockOpenAIServer
+
+URL = "https://mcp.example.com/mcp"
+TOOL = {"type": "mcp", "server_label": "wiki", "server_url": URL, "allowed_tools": ["ask_question"],
+        "require_approval": "never"}
+
+
+def wiki_tools(count, version=1):
+    tools = {"ask_question": ({"description": "Ask a question about a repository.", "input_schema": {
+        "type": "object", "properties": {"repoName": {"type": "string"}, "question": {"type": "string"}},
+        "required": ["repoName", "question"]} | ({"additionalProperties": False} if version > 1 else {})},
+        lambda arguments: f"answer to {arguments['question']!r}")}
+    for number in range(count - 1):
+        tools[f"read_page_{number}"] = ({"description": "Reads one page of the repository wiki. " * 8, "input_schema": {
+            "type": "object", "properties": {"repoName": {"type": "string"}, "page": {"type": "integer"}}}},
+            lambda arguments: "page text")
+    return tools
+
+
+def run_questions(server, ask, count):
+    seconds, tokens, failed = [], [], 0
+    for number in range(count):
+        start = time.perf_counter()
+        response = ask(f"question {number} about the MCP spec")
+        seconds.append(time.perf_counter() - start)
+        tokens.append(response.usage.input_tokens)
+        failed += any(item.type == "mcp_call" and item.error for item in response.output)
+    return seconds, tokens, failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--questions", type=int, default=12)
+    parser.add_argument("--list-time", type=float, default=0.2, help="seconds the MCP server takes to list its tools")
+    parser.add_argument("--tools", type=int, default=20)
+    parser.add_argument("--ttl", type=float, default=0.5)
+    args = parser.parse_args(argv)
+
+    failed = False
+    with MockOpenAIServer() as server:
+        server.mcp_servers[URL] = wiki_tools(args.tools)
+        server.mcp_list_time = args.list_time
+        client = server.client()
+        results = {}
+        for mode in ("plain", "session"):
+            server.mcp_list_fetches.clear()
+            if mode == "plain":
+                ask = lambda question: client.responses.create(model="gpt-4.1", tools=[TOOL], input=question)  # noqa: E731
+            else:
+                session = McpSession(client, tools=[TOOL])
+                ask = session.ask
+            seconds, tokens, errors = run_questions(server, ask, args.questions)
+            results[mode] = statistics.fmean(seconds)
+            fetches = server.mcp_list_fetches.get("wiki", 0)
+            print(f"{mode + ':':9s} {fetches:3d} tool-list fetches for {args.questions} requests, "
+                  f"{statistics.fmean(seconds) * 1000:6.1f} ms and {statistics.fmean(tokens):6.0f} input tokens per request"
+                  f"{f', {errors} failed calls' if errors else ''}")
+            failed |= errors > 0 or fetches != (args.questions if mode == "plain" else 1)
+        print(f"session stats {session.stats}, cache {session.cache.stats}")
+        failed |= session.stats["fetches_avoided"] != args.questions - 1 or results["session"] >= results["plain"]
+
+        server.mcp_servers[URL] = wiki_tools(args.tools, version=2)
+        server.mcp_list_fetches.clear()
+        _, _, errors = run_questions(server, session.ask, 3)
+        print(f"after a schema change: {server.mcp_list_fetches.get('wiki', 0)} fetch, {errors} failed calls, "
+              f"{session.stats['schema_refreshes']} refresh")
+        failed |= errors > 0 or server.mcp_list_fetches.get("wiki") != 1 or session.stats["schema_refreshes"] != 1
+
+        short = McpSession(client, tools=[TOOL], cache=McpToolListCache(ttl=args.ttl))
+        server.mcp_list_fetches.clear()
+        run_questions(server, short.ask, 2)
+        time.sleep(args.ttl)
+        run_questions(server, short.ask, 2)
+        print(f"ttl {args.ttl} s: {server.mcp_list_fetches.get('wiki', 0)} fetches for 4 requests, cache {short.cache.stats}")
+        failed |= server.mcp_list_fetches.get("wiki") != 2 or short.cache.stats["expired"] != 1
+
+    if failed:
+        print("FAIL: the session should list the MCP tools once, and again only after a schema change or the ttl")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+# Waiting on many background responses and vector store files against the local mock server, on a
+# scaled-down clock (--scale 0.02: one simulated second takes 20 ms). Each background response runs for
+# 1 to 10 min. The baseline polls every response every 2 s, as run_in_background used to; AsyncPoller
+# backs off from 1 s up to 30 s. Reports the status requests spent per job and how late each job was noticed
+# after it finished; on a real network each baseline poll also waits for its round trip, so it manages fewer
+# than one poll every 2 s. Expect about 7x fewer requests, paid for with a delay of 15-20 s instead of
+# about 2 s (see poller.py); the run fails below 5x, or if jobs are noticed more than max_interval late.
+# Then a vector store whose files finish at different times: AsyncPoller must resolve every file (not just
+# the first) from batched listings, and so must the synchronous wait_until_ready.
+import argparse
+import asyncio
+import math
+import random
+import statistics
+import sys
+import time
+
+from ..file_search import wait_until_ready
+from ..mock_server import MockOpenAIServer, _last_user_text
+from ..poller import AsyncPoller
+
+
+async def start_jobs(server, client, prompts):
+    # (response id, when the server started it): the mock runs in this process, on the same clock.
+    responses = await asyncio.gather(*(client.responses.create(model="gpt-4.1", input=prompt, background=True)
+                                       for prompt in prompts))
+    return [(response.id, server.background[response.id][0]) for response in responses]
+
+
+async def fixed_interval(client, jobs, durations, interval):
+    async def wait(response_id, started, duration):
+        while True:
+            await asyncio.sleep(interval)
+            response = await client.responses.retrieve(response_id)
+            if response.status not in ("queued", "in_progress"):
+                return time.monotonic() - started - duration
+
+    return await asyncio.gather(*(wait(id, started, duration) for (id, started), duration in zip(jobs, durations)))
+
+
+async def adaptive(client, jobs, durations, scale):
+    async with AsyncPoller(client, initial_interval=1 * scale, max_interval=30 * scale, concurrency=64) as poller:
+        async def wait(response_id, started, duration):
+            await poller.watch_response(response_id)
+            return time.monotonic() - started - duration
+
+        return await asyncio.gather(*(wait(id, started, duration) for (id, started), duration in zip(jobs, durations)))
+
+
+async def run_responses(server, mode, prompts, durations, scale):
+    client = server.async_client()
+    async with client:
+        jobs = await start_jobs(server, client, prompts)
+        before = len(server.requests)
+        if mode == "fixed":
+            lags = await fixed_interval(client, jobs, durations, 2 * scale)
+        else:
+            lags = await adaptive(client, jobs, durations, scale)
+        return len(server.requests) - before, lags
+
+
+async def run_vector_store(server, vector_store_id, scale):
+    client = server.async_client()
+    async with client:
+        async with AsyncPoller(client, initial_interval=1 * scale, max_interval=30 * scale) as poller:
+            files = await poller.watch_vector_store(vector_store_id)
+            return files, poller.stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--responses", type=int, default=10)
+    parser.add_argument("--files", type=int, default=500)
+    parser.add_argument("--scale", type=float, default=0.02, help="wall seconds per simulated second")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    prompts = [f"background job {i}" for i in range(args.responses)]
+    durations = {prompt: rng.uniform(60, 600) * args.scale for prompt in prompts}
+    failed = False
+    with MockOpenAIServer() as server:
+        server.background_duration = lambda body: durations[_last_user_text(body)]
+        for mode in ("fixed", "adaptive"):
+            requests, lags = asyncio.run(run_responses(server, mode, prompts, list(durations.values()), args.scale))
+            label = "every 2 s" if mode == "fixed" else "AsyncPoller"
+            print(f"{label + ':':12s} {requests} status requests for {len(prompts)} responses "
+                  f"({requests / len(prompts):.1f} each), noticed {statistics.mean(lags) / args.scale:.1f} s late "
+                  f"on average (max {max(lags) / args.scale:.1f} s, simulated)")
+            if mode == "fixed":
+                baseline = requests
+            else:
+                failed |= max(lags) > 30 * args.scale * 1.25 + 2 * args.scale
+        print(f"request volume: {baseline / requests:.1f}x lower")
+        failed |= requests * 5 > baseline
+
+        delays = {}
+        server.vector_store_file_delay = lambda file_id: delays[file_id]
+        store = server.add_vector_store("bench")
+        for i in range(args.files):
+            file_id = server.add_file(f"doc{i}.txt", b"otters " * 100, "assistants")["id"]
+            # The first file added finishes first, so checking only data[0] would stop too early.
+            delays[file_id] = (5 if i == 0 else rng.uniform(10, 60)) * args.scale
+            server.add_vector_store_file(store["id"], file_id)
+        before = len(server.requests)
+        files, stats = asyncio.run(run_vector_store(server, store["id"], args.scale))
+        requests = len(server.requests) - before
+        done = sum(1 for file in files if file.status == "completed")
+        # Retrieving each file every second until it is done would have cost:
+        per_file = sum(math.ceil(delay / args.scale) for delay in delays.values())
+        print(f"vector store: {done}/{len(files)} files completed, {requests} list requests "
+              f"(vs ~{per_file} retrieving each file every 1 s), {stats}")
+        failed |= done != args.files or len(files) != args.files
+
+        store = server.add_vector_store("sync")
+        for file_id in list(delays)[:20]:
+            server.add_vector_store_file(store["id"], file_id)
+        files = wait_until_ready(store["id"], poll_interval=args.scale, client=server.client(),
+                                 max_interval=30 * args.scale)
+        done = sum(1 for file in files if file.status == "completed")
+        print(f"wait_until_ready: {done}/{len(files)} files completed")
+        failed |= done != 20
+
+    if failed:
+        print("FAIL")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+# Prompt-cache hit rates for three ways of sending the same long few-shot classifier prompt to the local
+# mock server (which simulates automatic prefix caching):
+#   variable-first  the review is interpolated at the top of the instructions
+#   unstable-tools  static instructions, but the tool definitions are rebuilt with a different key order
+#   layout          PromptLayout: canonical tools, static instructions, review last
+import argparse
+import random
+import sys
+
+from ..mock_server import MockOpenAIServer
+from ..prompt_cache import PromptCacheStats, PromptLayout
+from ..text import SENTIMENT_INSTRUCTIONS
+
+EXTRA_EXAMPLES = "".join(
+    f'\n<product_review id="extra-{i}">\nReview number {i}: the {item} was {quality}.\n</product_review>\n'
+    f'\n<assistant_response id="extra-{i}">\n{label}\n</assistant_response>\n'
+    for i, (item, quality, label) in enumerate(
+        [("case", "sturdy and well made", "Positive"), ("cable", "frayed after a week", "Negative"),
+         ("manual", "about what I expected", "Neutral")] * 30
+    )
+)
+LONG_INSTRUCTIONS = SENTIMENT_INSTRUCTIONS + EXTRA_EXAMPLES
+
+TOOLS = [{
+    "type": "function",
+    "name": "flag_review",
+    "description": "Flag a review for human moderation.",
+    "parameters": {
+        "type": "object",
+        "properties": {"reason": {"type": "string"}, "severity": {"type": "integer"}},
+        "required": ["reason", "severity"],
+        "additionalProperties": False,
+    },
+    "strict": True,
+}]
+
+
+def shuffled(value, rng):
+    if isinstance(value, dict):
+        items = list(value.items())
+        rng.shuffle(items)
+        return {key: shuffled(item, rng) for key, item in items}
+    if isinstance(value, list):
+        return [shuffled(item, rng) for item in value]
+    return value
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    reviews = [f"Review {i}: " + rng.choice(["Love it.", "Hate it.", "It's fine."]) for i in range(args.calls)]
+    layout = PromptLayout(LONG_INSTRUCTIONS, model="gpt-4", tools=TOOLS)
+    strategies = {
+        "variable-first": lambda review: dict(
+            model="gpt-4", instructions=f"Classify this review: {review}\n" + LONG_INSTRUCTIONS, tools=TOOLS, input=review),
+        "unstable-tools": lambda review: dict(
+            model="gpt-4", instructions=LONG_INSTRUCTIONS, tools=shuffled(TOOLS, rng), input=review),
+        "layout": lambda review: layout.request(review),
+    }
+
+    results = {}
+    for name, build in strategies.items():
+        with MockOpenAIServer() as server:
+            client = server.client()
+            stats = PromptCacheStats()
+            for review in reviews:
+                stats.record(client.responses.create(**build(review)))
+        results[name] = stats
+        billable = stats.input_tokens - stats.cached_tokens / 2  # cached input tokens are billed at a discount
+        print(f"{name:15s} {stats.summary()}, ~{billable:.0f} billable input tokens")
+
+    if results["layout"].hit_rate < 0.9:
+        print("FAIL: the layout should serve almost all of its input from the cache")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
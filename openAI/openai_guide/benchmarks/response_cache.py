@@ -0,0 +1,66 @@
+# Repeated deterministic calls with and without the response cache, against the local mock server.
+# A second CachedClient on the same SQLite file stands in for the next run of the script: it starts with
+# an empty memory tier and must answer everything from disk, with objects equal to the ones the first
+# run got from the API (the parsed completion included). Caching must not emit any warnings either.
+import argparse
+import os
+import sys
+import tempfile
+import time
+import warnings
+
+from .. import reasoning, structured, text
+from ..mock_server import MockOpenAIServer
+from ..response_cache import CachedClient, ResponseCache
+
+EXAMPLES = [text.capital_population, structured.extract_calendar_event, reasoning.transpose_script]
+
+
+def run(client, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        results = [example(client=client) for example in EXAMPLES]
+    return time.perf_counter() - start, results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp, MockOpenAIServer(latency=args.latency) as server:
+        path = os.path.join(tmp, "responses.sqlite3")
+        uncached, _ = run(server.client(), args.rounds)
+
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            first_run = ResponseCache(path=path)
+            cached, originals = run(CachedClient(server.client(), first_run), args.rounds)
+            first_run.close()
+
+            next_run = ResponseCache(path=path)
+            served_before = len(server.requests)
+            from_disk, (chat, parsed, response) = run(CachedClient(server.client(), next_run), 1)
+            api_calls = len(server.requests) - served_before
+
+    print(f"{args.rounds} rounds of {len(EXAMPLES)} calls, {args.latency * 1000:.0f} ms latency")
+    print(f"no cache:       {uncached:.2f} s")
+    print(f"memory cache:   {cached:.2f} s  {first_run.stats}")
+    print(f"next run, disk: {from_disk:.3f} s  {next_run.stats}, {api_calls} API calls")
+    print(f"restored objects: {type(chat).__name__} {chat.choices[0].message.content!r}, "
+          f"{type(parsed).__name__} {parsed.choices[0].message.parsed!r}, "
+          f"{type(response).__name__} {response.output_text!r}")
+    restored = [a.model_dump(warnings=False) == b.model_dump(warnings=False) for a, b in zip(originals, (chat, parsed, response))]
+    print(f"equal to the originals: {restored}, warnings: {[str(w.message).splitlines()[0] for w in caught]}")
+    if caught:
+        print("FAIL: caching should not warn")
+        return 1
+    if api_calls or next_run.stats["disk_hits"] != len(EXAMPLES) or not all(restored):
+        print("FAIL: the second run should be served entirely from disk")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+# A long background response streamed from the local mock server over a connection that drops every
+# --drop-after events. A plain loop over the stream loses everything after the first drop; ResumableStream
+# reconnects from its cursor and must deliver every event exactly once and in order - also when the
+# server replays a few events it had already sent before the cursor (checked with a route that resumes
+# three events early).
+import argparse
+import sys
+import time
+
+from ..mock_server import MockOpenAIServer
+from ..resumable_stream import ResumableStream
+
+
+def start(client):
+    return client.responses.create(model="o3", input="Write a novel about otters in space.", background=True, stream=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--characters", type=int, default=4000)
+    parser.add_argument("--drop-after", type=int, default=50)
+    parser.add_argument("--interval", type=float, default=0.0005)
+    args = parser.parse_args(argv)
+
+    story = "".join(f"otter{i} " for i in range(args.characters))[:args.characters]
+    failed = False
+    with MockOpenAIServer() as server:
+        server.reply = lambda body: story
+        server.token_interval = args.interval
+        server.drop_stream_after = args.drop_after
+        client = server.client()
+
+        received = []
+        try:
+            for event in start(client):
+                received.append(event)
+        except Exception as e:
+            print(f"plain loop:       {len(received)} events, then {type(e).__name__}: {e}")
+
+        for overlap in (False, True):
+            if overlap:
+                def replay_early(request):
+                    started, events, interval = server.background[request.match.group(1)]
+                    after = int(request.query.get("starting_after", ["-1"])[0])
+                    return 200, server._stream_events(events, started, after - 3, interval)
+                server.route("GET", r"/v1/responses/([^/]+)", replay_early)
+            begin = time.perf_counter()
+            stream = ResumableStream(client, start(client), base_delay=0.01, max_reconnects=3)
+            events = list(stream)
+            elapsed = time.perf_counter() - begin
+            text = "".join(event.delta for event in events if event.type == "response.output_text.delta")
+            in_order = [event.sequence_number for event in events] == list(range(len(events)))
+            label = "resumable, overlap" if overlap else "resumable"
+            print(f"{label + ':':19s} {len(events)} events in {elapsed:.2f} s, {stream.stats}, "
+                  f"{'complete' if text == story and in_order else 'INCOMPLETE'}")
+            failed |= text != story or not in_order or events[-1].type != "response.completed"
+            failed |= overlap and stream.stats["duplicates"] == 0
+
+    if failed:
+        print("FAIL: the resumed stream should deliver every event exactly once")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
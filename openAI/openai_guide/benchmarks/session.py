@@ -0,0 +1,84 @@
+# 50-turn Responses API conversations against the local mock server, whose latency grows with the
+# request size, comparing how the conversation state is carried:
+#   local            every turn replays the whole history
+#   server           previous_response_id chaining
+#   server, expired  chaining, with every stored response expiring halfway through (one fallback replay)
+#   auto, no store   store=False, so every turn has to replay
+#   auto, budget     chaining until the stored context passes the history's token budget, then one
+#                    compacted replay that the next turns chain from
+# Then a request that fails must leave the history as it was, without a user turn that has no reply.
+import argparse
+import sys
+import time
+
+from ..history import ConversationStore
+from ..mock_server import MockOpenAIServer
+from ..session import AUTO, LOCAL, SERVER, Session
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=50)
+    parser.add_argument("--budget", type=int, default=1500)
+    parser.add_argument("--bytes-per-ms", type=float, default=1000, help="simulated upload speed of the mock")
+    args = parser.parse_args(argv)
+
+    questions = [f"Turn {i}: tell me another joke, about the number {i}, and explain why it's funny." for i in range(args.turns)]
+    strategies = [
+        ("local", dict(mode=LOCAL), False),
+        ("server", dict(mode=SERVER), False),
+        ("server, expired", dict(mode=SERVER), True),
+        ("auto, no store", dict(mode=AUTO, store=False), False),
+        ("auto, budget", dict(mode=AUTO, history=None), False),
+    ]
+    results = {}
+    with MockOpenAIServer(latency=lambda request: 0.002 + len(request.raw) / args.bytes_per_ms / 1000) as server:
+        server.reply = lambda body: "Here's one. " + "Why did the number cross the road? " * 6
+        for name, options, expire in strategies:
+            if "history" in options:
+                options = dict(options, history=ConversationStore(budget=args.budget, keep_last=6))
+            session = Session(client=server.client(), **options)
+            start = time.perf_counter()
+            for turn, question in enumerate(questions):
+                if expire and turn == args.turns // 2:
+                    server.expire_responses()
+                session.ask(question)
+            elapsed = time.perf_counter() - start
+            results[name] = session.stats
+            stats = session.stats
+            print(f"{name:16s} {elapsed:.2f} s, {stats['bytes_sent'] / 1024:6.1f} KiB sent, "
+                  f"{stats['input_tokens']:6d} input tokens, {stats['server_turns']} chained / "
+                  f"{stats['local_turns']} replayed, {stats['fallbacks']} fallbacks")
+
+        session = Session(client=server.client(), mode=LOCAL)
+        session.ask(questions[0])
+        create = session._create
+
+        def fail(**params):
+            raise ConnectionError("simulated network failure")
+
+        session._create = fail
+        try:
+            session.ask(questions[1])
+        except ConnectionError:
+            pass
+        session._create = create
+        session.ask(questions[2])
+        roles = [message["role"] for message in session.history.messages()]
+        print(f"after a failed request: {roles}")
+
+    ok = (
+        results["server"]["bytes_sent"] < results["local"]["bytes_sent"]
+        and results["server, expired"]["fallbacks"] == 1
+        and results["auto, no store"]["local_turns"] == args.turns
+        and results["auto, budget"]["input_tokens"] < results["server"]["input_tokens"]
+        and roles == ["user", "assistant"] * 2
+    )
+    if not ok:
+        print("FAIL: unexpected choice of mode")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+# Parsing a long synthetic EntitiesModel stream, split into small deltas like a model streams it:
+#   reparse      what the SDK's stream helper does, a partial JSON parse of everything received so far on
+#                every delta (pydantic_core.from_json with allow_partial)
+#   incremental  StreamingModelParser, which looks at each character once and validates entries as they close
+# Both are run at two stream lengths; reparse time grows with the square of the length, incremental linearly.
+# Also checks the incremental parser against the mock server's chat stream.
+import argparse
+import json
+import random
+import sys
+import time
+
+from .. import structured
+from ..mock_server import MockOpenAIServer
+from ..stream_parse import StreamingModelParser
+from ..structured import EntitiesModel
+
+WORDS = ["quick", "brown", "lazy", "piercing", "blue", "green", "fox", "dog", "sky", "grass", "café", 'say "hi"']
+
+
+def synthetic_stream(items, delta_size, rng):
+    document = {field: [f"{rng.choice(WORDS)} {i}" for i in range(items)] for field in ("attributes", "colors", "animals")}
+    text = json.dumps(document, ensure_ascii=False)
+    return document, [text[i:i + delta_size] for i in range(0, len(text), delta_size)]
+
+
+def reparse(deltas):
+    from pydantic_core import from_json
+
+    buffer = ""
+    for delta in deltas:
+        buffer += delta
+        from_json(buffer, allow_partial=True)
+    return EntitiesModel.model_validate_json(buffer)
+
+
+def incremental(deltas):
+    parser = StreamingModelParser(EntitiesModel)
+    first_item_at = None
+    for position, delta in enumerate(deltas):
+        if parser.feed(delta) and first_item_at is None:
+            first_item_at = position
+    return parser.result(), first_item_at
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=400, help="entries per list in the shorter stream")
+    parser.add_argument("--delta-size", type=int, default=6)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    failed = False
+    timings = {}
+    for scale in (1, 4):
+        document, deltas = synthetic_stream(args.items * scale, args.delta_size, rng)
+        start = time.perf_counter()
+        reparsed = reparse(deltas)
+        reparse_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        parsed, first_item_at = incremental(deltas)
+        incremental_seconds = time.perf_counter() - start
+        timings[scale] = (reparse_seconds, incremental_seconds)
+        size = sum(map(len, deltas))
+        print(f"{size / 1024:7.0f} KiB, {len(deltas)} deltas: reparse {reparse_seconds:.2f} s, "
+              f"incremental {incremental_seconds:.3f} s, first entity after delta {first_item_at}")
+        if parsed != reparsed or parsed.model_dump() != document:
+            failed = True
+
+    (short_reparse, short_incremental), (long_reparse, long_incremental) = timings[1], timings[4]
+    print(f"4x longer stream: reparse {long_reparse / short_reparse:.1f}x slower, "
+          f"incremental {long_incremental / short_incremental:.1f}x slower")
+
+    with MockOpenAIServer() as server:
+        items = []
+        entities = structured.stream_entities_incrementally(client=server.client(), on_item=items.append)
+    print(f"mock chat stream: {len(items)} entities before the end, result {entities}")
+    if not items or entities != EntitiesModel(attributes=["mock"], colors=["mock"], animals=["mock"]):
+        failed = True
+
+    if failed or long_incremental > long_reparse:
+        print("FAIL: the incremental parser should match the full parse and beat re-parsing")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
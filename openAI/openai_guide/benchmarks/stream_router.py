@@ -0,0 +1,92 @@
+# A long streamed response from the local mock server (one small text delta every --interval seconds)
+# written to a slow sink that costs --sink-delay seconds per call, like a websocket send or a file write:
+#   per-delta loop  for event in stream: sink(event.delta)
+#   router          StreamRouter with flush_size=1 (merging only while the sink is busy) and 64
+# Reports wall time, sink calls, time to first token and inter-token latency, and checks the sink got
+# exactly the streamed text. Then an event handler and the sink both fail: consume() must raise the
+# handler's error, not the sink's.
+import argparse
+import sys
+import time
+
+from ..mock_server import MockOpenAIServer
+from ..stream_router import StreamRouter
+
+
+class SlowSink:
+    def __init__(self, delay):
+        self.delay = delay
+        self.calls = 0
+        self.chunks = []
+
+    def __call__(self, text):
+        self.calls += 1
+        self.chunks.append(text)
+        time.sleep(self.delay)
+
+
+def start_stream(client):
+    return client.responses.create(model="gpt-4.1", input="Tell me a long story.", stream=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--characters", type=int, default=4000)
+    parser.add_argument("--interval", type=float, default=0.0005)
+    parser.add_argument("--sink-delay", type=float, default=0.005)
+    args = parser.parse_args(argv)
+
+    story = "".join(f"word{i} " for i in range(args.characters))[:args.characters]
+    failed = False
+    with MockOpenAIServer() as server:
+        server.reply = lambda body: story
+        server.stream_chunk_size = 4
+        server.token_interval = args.interval
+        client = server.client()
+        for _ in start_stream(client):  # warm up the connection and the SDK's event models
+            pass
+
+        sink = SlowSink(args.sink_delay)
+        start = time.perf_counter()
+        for event in start_stream(client):
+            if event.type == "response.output_text.delta":
+                sink(event.delta)
+        elapsed = time.perf_counter() - start
+        print(f"per-delta loop         {elapsed:.2f} s, {sink.calls} sink calls")
+        failed |= "".join(sink.chunks) != story
+
+        for name, flush_size in [("router, flush_size=1", 1), ("router, flush_size=64", 64)]:
+            sink = SlowSink(args.sink_delay)
+            router = StreamRouter(flush_size=flush_size)
+            router.on_text(sink)
+            start = time.perf_counter()
+            metrics = router.consume(start_stream(client), started_at=start)
+            elapsed = time.perf_counter() - start
+            print(f"{name:22s} {elapsed:.2f} s, {sink.calls} sink calls; {metrics.summary()}")
+            failed |= "".join(sink.chunks) != story
+
+        def broken_sink(text):
+            raise OSError("sink failed")
+
+        def broken_handler(event):
+            raise KeyError("handler failed")
+
+        router = StreamRouter()
+        router.on_text(broken_sink)
+        router.on("response.completed", broken_handler)
+        try:
+            router.consume(start_stream(client))
+            raised = None
+        except Exception as e:
+            raised = e
+        print(f"handler and sink failing: consume() raised {raised!r}")
+        failed |= not isinstance(raised, KeyError)
+
+    if failed:
+        print("FAIL: the sink should receive exactly the streamed text")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
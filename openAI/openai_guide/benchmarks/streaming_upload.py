@@ -0,0 +1,82 @@
+# Uploading a remote file to the local mock server, which serves the download and reads the upload at --rate
+# MB/s each, for growing file sizes.
+# Each upload runs in a fresh child process so its peak RSS (VmHWM) measures just that one request:
+# "buffered" is the old create_file (download everything into a BytesIO, then upload it), "streamed" is
+# create_file on RangeDownload, and "flaky" streams again over a connection that drops every 8 MB. Every
+# uploaded file is compared with the original; the streamed peak must not grow with the file size, and
+# overlapping the upload with the download should save most of the upload time.
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+from ..mock_server import MockOpenAIServer
+from .base64_inputs import peak_rss_mb
+
+MB = 1024 * 1024
+
+
+def child(mode, url, base_url):
+    from io import BytesIO
+
+    from openai import OpenAI
+
+    from ..file_search import create_file
+    from ..transport import http_get
+
+    client = OpenAI(base_url=base_url, api_key="mock", max_retries=0)
+    client.files.list()
+    http_get(base_url + "/files")
+    before = peak_rss_mb()
+    start = time.perf_counter()
+    if mode == "buffered":
+        response = http_get(url)
+        file_id = client.files.create(file=(url.split("/")[-1], BytesIO(response.content)), purpose="assistants").id
+    else:
+        file_id = create_file(client, url)
+    print(f"{before:.1f} {peak_rss_mb():.1f} {time.perf_counter() - start:.3f} {file_id}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[16, 64], help="file sizes in MB")
+    parser.add_argument("--rate", type=float, default=64.0, help="download and upload speed in MB/s")
+    parser.add_argument("--child", nargs=3, metavar=("MODE", "URL", "BASE_URL"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.child:
+        child(*args.child)
+        return 0
+
+    failed = False
+    peaks = {}
+    with MockOpenAIServer() as server:
+        for size in args.sizes:
+            path = f"/downloads/corpus_{size}MB.pdf"
+            server.downloads[path] = data = os.urandom(size * MB)
+            for mode in ("buffered", "streamed", "flaky"):
+                server.download_rate = server.upload_rate = args.rate * MB
+                server.drop_download_after = 8 * MB if mode == "flaky" else None
+                run = subprocess.run([sys.executable, "-m", __spec__.name, "--child", mode, server.url(path), server.base_url],
+                                     capture_output=True, text=True)
+                if run.returncode:
+                    print(run.stderr)
+                    return 1
+                before, after, seconds, file_id = run.stdout.split()
+                peaks[mode, size] = float(after) - float(before)
+                intact = server.files.pop(file_id)[1] == data
+                print(f"{size:4d} MB {mode + ':':9s} {float(seconds):5.2f} s (transfer alone {size / args.rate:.2f} s each way), "
+                      f"peak RSS +{peaks[mode, size]:6.1f} MB, {'intact' if intact else 'CORRUPTED'}")
+                failed |= not intact
+            del server.downloads[path]
+
+    streamed = [peaks[mode, size] for mode in ("streamed", "flaky") for size in args.sizes]
+    print(f"streamed peak RSS: {min(streamed):.1f} to {max(streamed):.1f} MB over the baseline")
+    if failed or max(streamed) > 32:
+        print("FAIL: the streamed upload should deliver the same bytes in bounded memory")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
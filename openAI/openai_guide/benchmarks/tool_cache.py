@@ -0,0 +1,93 @@
+# Many concurrent conversations asking about the same few cities, each turn's get_weather calls run by
+# ToolDispatcher. The stubbed lookups sleep instead of calling open-meteo and count how often they run.
+# Without the cache every tool call is a lookup; with it, the first burst is coalesced into one lookup per
+# city (coordinates differ in the fifth decimal between conversations) and the second burst is all hits.
+import argparse
+import asyncio
+import json
+import random
+import sys
+import threading
+import time
+
+from ..tool_cache import ToolResultCache
+from ..tool_dispatch import ToolDispatcher
+
+CITIES = [(48.8566, 2.3522), (51.5072, -0.1276), (35.6762, 139.6503), (40.7128, -74.006), (-33.8688, 151.2093)]
+
+
+def conversation_calls(conversations, rng):
+    # One model turn per conversation, asking about two random cities with slightly different coordinates.
+    turns = []
+    for c in range(conversations):
+        calls = []
+        for i, (lat, lon) in enumerate(rng.sample(CITIES, 2)):
+            arguments = {"latitude": lat + rng.uniform(-2e-4, 2e-4), "longitude": lon + rng.uniform(-2e-4, 2e-4)}
+            calls.append({"id": f"call_{c}_{i}", "function": {"name": "get_weather", "arguments": json.dumps(arguments)}})
+        turns.append(calls)
+    return turns
+
+
+async def run_turns(dispatcher, turns):
+    return await asyncio.gather(*(dispatcher.aexecute(calls) for calls in turns))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--conversations", type=int, default=50)
+    parser.add_argument("--delay", type=float, default=0.2, help="seconds each stubbed lookup takes")
+    args = parser.parse_args(argv)
+
+    lookups = {"sync": 0, "async": 0}
+    lock = threading.Lock()
+
+    def get_weather(latitude: float, longitude: float) -> str:
+        with lock:
+            lookups["sync"] += 1
+        time.sleep(args.delay)
+        return f"{round(latitude)}C"
+
+    async def get_weather_async(latitude: float, longitude: float) -> str:
+        lookups["async"] += 1
+        await asyncio.sleep(args.delay)
+        return f"{round(latitude)}C"
+
+    turns = conversation_calls(args.conversations, random.Random(0))
+    tool_calls = sum(len(calls) for calls in turns)
+    print(f"{args.conversations} conversations, {tool_calls} get_weather calls over {len(CITIES)} cities, "
+          f"{args.delay * 1000:.0f} ms per lookup")
+
+    failed = False
+    for kind, function in [("sync", get_weather), ("async", get_weather_async)]:
+        plain = ToolDispatcher({"get_weather": function}, max_workers=tool_calls)
+        start = time.perf_counter()
+        expected = asyncio.run(run_turns(plain, turns))
+        uncached_seconds = time.perf_counter() - start
+        uncached_lookups, lookups[kind] = lookups[kind], 0
+
+        cache = ToolResultCache(ttl=300, precision=2)
+        cached = ToolDispatcher({"get_weather": cache(function)}, max_workers=tool_calls)
+        start = time.perf_counter()
+        first = asyncio.run(run_turns(cached, turns))
+        first_seconds = time.perf_counter() - start
+        first_stats = dict(cache.stats)
+        start = time.perf_counter()
+        second = asyncio.run(run_turns(cached, turns))
+        second_seconds = time.perf_counter() - start
+
+        print(f"{kind}: no cache {uncached_lookups} lookups in {uncached_seconds:.2f} s; "
+              f"cached {lookups[kind]} lookups, first burst {first_seconds:.2f} s {first_stats}, "
+              f"second burst {second_seconds * 1000:.1f} ms")
+        if first != expected or second != expected or lookups[kind] != len(CITIES) or cache.stats["hits"] != tool_calls:
+            failed = True
+        plain.close()
+        cached.close()
+
+    if failed:
+        print("FAIL: expected one lookup per city and identical tool results")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+# Five get_weather tool calls (one per city) executed the serial way and through ToolDispatcher, with a
+# stubbed get_weather that sleeps instead of calling open-meteo. Also checks a slow call is cut off by
+# its timeout without holding up the others, and that an async tool runs on the event loop.
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+from ..tool_dispatch import ToolDispatcher
+
+CITIES = {"Paris": (48.8566, 2.3522), "London": (51.5072, -0.1276), "Tokyo": (35.6762, 139.6503),
+          "New York": (40.7128, -74.006), "Sydney": (-33.8688, 151.2093)}
+
+
+def tool_calls():
+    return [
+        {"id": f"call_{i}", "type": "function",
+         "function": {"name": "get_weather", "arguments": json.dumps({"latitude": lat, "longitude": lon})}}
+        for i, (lat, lon) in enumerate(CITIES.values())
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--delay", type=float, default=0.3, help="seconds each stubbed lookup takes")
+    args = parser.parse_args(argv)
+
+    def get_weather(latitude, longitude):
+        time.sleep(args.delay)
+        return round(latitude / 3, 1)
+
+    async def get_weather_async(latitude, longitude):
+        await asyncio.sleep(args.delay)
+        return round(latitude / 3, 1)
+
+    calls = tool_calls()
+    start = time.perf_counter()
+    serial = []
+    for call in calls:
+        result = get_weather(**json.loads(call["function"]["arguments"]))
+        serial.append({"role": "tool", "tool_call_id": call["id"], "content": str(result)})
+    serial_seconds = time.perf_counter() - start
+
+    dispatcher = ToolDispatcher({"get_weather": get_weather})
+    start = time.perf_counter()
+    concurrent = dispatcher.execute(calls)
+    concurrent_seconds = time.perf_counter() - start
+
+    async_dispatcher = ToolDispatcher({"get_weather": get_weather_async})
+    start = time.perf_counter()
+    async_results = async_dispatcher.execute(calls)
+    async_seconds = time.perf_counter() - start
+
+    slow = ToolDispatcher({"get_weather": get_weather}, timeouts={"get_weather": args.delay / 2})
+    timed_out = slow.execute(calls[:1])
+
+    print(f"{len(calls)} tool calls, {args.delay * 1000:.0f} ms each")
+    print(f"serial:           {serial_seconds:.2f} s")
+    print(f"thread pool:      {concurrent_seconds:.2f} s")
+    print(f"asyncio:          {async_seconds:.2f} s")
+    print(f"timeout result:   {timed_out[0]['content']!r}")
+    if concurrent != serial or async_results != serial or not timed_out[0]["content"].startswith("Error"):
+        print("FAIL: dispatcher results differ from the serial loop")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
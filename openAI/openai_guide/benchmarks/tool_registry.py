@@ -0,0 +1,113 @@
+# Dispatch and schema cost with a few hundred tools: the old style (an if/elif chain in call_function,
+# json.loads of the arguments, the tools list written out as dicts for every request) against the
+# ToolRegistry (schemas built once at registration, dict lookup, pydantic validation of the arguments).
+import argparse
+import json
+import random
+import sys
+import time
+import timeit
+
+from ..tool_registry import ToolRegistry
+
+
+def make_function(i):
+    def tool(latitude: float, longitude: float, units: str = "metric"):
+        return i
+    tool.__name__ = f"tool_{i}"
+    return tool
+
+
+def if_chain(count, functions):
+    # The call_function switch, grown to `count` branches.
+    lines = ["def call_function(name, **kwargs):"]
+    for i in range(count):
+        keyword = "if" if i == 0 else "elif"
+        lines.append(f"    {keyword} name == 'tool_{i}':")
+        lines.append(f"        return tool_{i}(kwargs.get('latitude'), kwargs.get('longitude'), kwargs.get('units', 'metric'))")
+    lines.append("    else:")
+    lines.append("        raise ValueError(f'Unknown function: {name}')")
+    namespace = dict(functions)
+    exec("\n".join(lines), namespace)
+    return namespace["call_function"]
+
+
+def hand_written_tools(count):
+    # What each request paid when the tools list was a literal inside the request function.
+    return [
+        {
+            "type": "function",
+            "function": {
+                "name": f"tool_{i}",
+                "description": f"Tool number {i}.",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "latitude": {"type": "number"},
+                        "longitude": {"type": "number"},
+                        "units": {"type": ["string", "null"]},
+                    },
+                    "required": ["latitude", "longitude", "units"],
+                    "additionalProperties": False,
+                },
+            },
+            "strict": True,
+        }
+        for i in range(count)
+    ]
+
+
+def per_call(statement, number):
+    return min(timeit.repeat(statement, number=number, repeat=5)) / number * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tools", type=int, default=300)
+    parser.add_argument("--calls", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    import openai  # noqa: F401  (keep the SDK import out of the registration timing)
+
+    functions = {f"tool_{i}": make_function(i) for i in range(args.tools)}
+    start = time.perf_counter()
+    registry = ToolRegistry()
+    for i, function in enumerate(functions.values()):
+        registry.register(function, description=f"Tool number {i}.")
+    registration = time.perf_counter() - start
+    call_function = if_chain(args.tools, functions)
+
+    rng = random.Random(0)
+    calls = [
+        (f"tool_{rng.randrange(args.tools)}", json.dumps({"latitude": rng.uniform(-90, 90),
+                                                          "longitude": rng.uniform(-180, 180), "units": None}))
+        for _ in range(args.calls)
+    ]
+
+    def old_dispatch():
+        for name, arguments in calls:
+            call_function(name, **json.loads(arguments))
+
+    def registry_dispatch():
+        for name, arguments in calls:
+            registry.call(name, arguments)
+
+    old = per_call(old_dispatch, 1) / len(calls)
+    new = per_call(registry_dispatch, 1) / len(calls)
+    rebuilt = per_call(lambda: hand_written_tools(args.tools), 20)
+    cached = per_call(registry.tools, 20000)
+    wrong = sum(registry.call(name, arguments) != call_function(name, **json.loads(arguments)) for name, arguments in calls)
+
+    print(f"{args.tools} tools, {len(calls)} calls with random names")
+    print(f"registration:          {registration * 1000:.1f} ms once ({registration / args.tools * 1e6:.0f} us per tool)")
+    print(f"if-chain + json.loads: {old:.2f} us per call (no validation)")
+    print(f"registry dispatch:     {new:.2f} us per call (lookup + validation)")
+    print(f"tools list per request: rebuilt {rebuilt:.1f} us, cached {cached:.3f} us")
+    if wrong or cached > rebuilt:
+        print("FAIL: the registry should dispatch to the same tools and reuse its schemas")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+# Uploading a small corpus for file search to the local mock server, every request delayed by --latency.
+# The first run uploads every distinct file (a few are duplicates) --concurrency at a time and is compared
+# with uploading them one by one; a second run with a fresh UploadCache on the same SQLite index must upload
+# nothing. Then one uploaded file is deleted on the server and another expires, and a third run must upload
+# exactly those two again.
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from ..file_search import create_files
+from ..mock_server import MockOpenAIServer
+from ..upload_cache import UploadCache
+
+
+def count(server, method, path, since):
+    return sum(1 for r in server.requests[since:] if r.method == method and r.path == path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=60)
+    parser.add_argument("--duplicates", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args(argv)
+
+    failed = False
+    with tempfile.TemporaryDirectory() as work_dir, MockOpenAIServer(latency=args.latency) as server:
+        paths = []
+        for i in range(args.files):
+            path = os.path.join(work_dir, f"doc{i}.txt")
+            with open(path, "wb") as f:
+                f.write((f"document {i % (args.files - args.duplicates)} " * 2000).encode())
+            paths.append(path)
+        distinct = args.files - args.duplicates
+        client = server.client()
+
+        start = time.perf_counter()
+        for path in paths:
+            with open(path, "rb") as f:
+                client.files.create(file=f, purpose="assistants")
+        sequential = time.perf_counter() - start
+        server.files.clear()
+
+        index = os.path.join(work_dir, "uploads.sqlite3")
+        runs = []
+        for run in range(3):
+            if run == 2:
+                first_ids = runs[0][0]
+                server.files.pop(first_ids[0])
+                server.files[first_ids[1]][0]["expires_at"] = int(time.time()) - 60
+            cache = UploadCache(path=index, client=client)
+            before = len(server.requests)
+            start = time.perf_counter()
+            file_ids = create_files(client, paths, upload_cache=cache, concurrency=args.concurrency)
+            seconds = time.perf_counter() - start
+            uploads = count(server, "POST", "/v1/files", before)
+            lists = count(server, "GET", "/v1/files", before)
+            runs.append((file_ids, uploads))
+            print(f"run {run + 1}: {uploads} uploads, {lists} list requests, {seconds:.2f} s, {cache.stats}")
+            cache.close()
+
+        print(f"one by one without a cache: {len(paths)} uploads, {sequential:.2f} s")
+        (ids1, uploads1), (ids2, uploads2), (ids3, uploads3) = runs
+        same_content = all(ids1[i] == ids1[i % distinct] for i in range(len(paths)))
+        failed |= uploads1 != distinct or not same_content
+        failed |= uploads2 != 0 or ids2 != ids1
+        failed |= uploads3 != 2 or ids3[2:distinct] != ids1[2:distinct] or ids3[0] == ids1[0] or ids3[1] == ids1[1]
+
+    if failed:
+        print("FAIL: unchanged content should be uploaded exactly once")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,367 @@
+# The computer use (CUA) loop: request, computer_call, execute, screenshot, computer_call_output, repeat.
+# ComputerUseAgent drives an Environment - anything that can execute the tool's actions and take a
+# screenshot - until the model stops asking for actions:
+#
+#   agent = ComputerUseAgent(FakeEnvironment(), encoder=ScreenshotEncoder(max_width=1024, format="webp"))
+#   run = agent.run("Open the settings page and turn on dark mode")
+#   print(run.response.output_text, run.summary())
+#
+# Responses are streamed, and the moment a computer_call item is complete its actions are executed and the
+# screenshot captured, downscaled and encoded on the environment's worker thread, while the rest of the
+# response is still being received. All environment calls happen on that one thread (start() and close()
+# too), so thread-bound drivers such as Playwright's sync API can be created in start(). A frame whose
+# pixels hash the same as the previous one reuses the previous encoding instead of encoding it again.
+#
+# Screenshots can be sent smaller than the display: the tool then declares the scaled size, and the
+# coordinates in the model's actions are scaled back up before they are executed. Encoding uses Pillow
+# when it is installed (PNG with compress_level, or WebP with quality); without it, screenshots are PNG,
+# downscaled by whole factors. Every step's timings are kept in run.steps.
+import base64
+import hashlib
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from ._client import get_client
+
+
+@dataclass
+class Frame:
+    # A screenshot as raw 8-bit RGB pixels, row by row.
+    width: int
+    height: int
+    pixels: bytes
+
+
+class Environment:
+    # What ComputerUseAgent needs from a computer or browser. display_width/display_height is the size of
+    # its screenshots; environment is the tool's "browser", "mac", "windows" or "ubuntu".
+    environment = "browser"
+    display_width = 1024
+    display_height = 768
+
+    def start(self):
+        pass
+
+    def execute(self, action):
+        # action is the computer_call's action as a dict: {"type": "click", "x": ..., "y": ..., ...}
+        raise NotImplementedError
+
+    def screenshot(self):
+        # The screen as a Frame.
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class FakeEnvironment(Environment):
+    # A headless stand-in that paints every action onto a canvas: clicks as squares, typing as bars,
+    # scrolling by shifting rows; moves, waits and screenshots leave the screen as it is. action_seconds
+    # and capture_seconds add the time a real computer would take.
+    def __init__(self, width=1024, height=768, environment="browser", action_seconds=0.0, capture_seconds=0.0):
+        self.display_width = width
+        self.display_height = height
+        self.environment = environment
+        self.action_seconds = action_seconds
+        self.capture_seconds = capture_seconds
+        self.actions = []
+        self._canvas = bytearray(width * height * 3)
+        self._paint_background()
+
+    def _paint_background(self):
+        # A gradient with some texture, so that screenshots don't compress to almost nothing.
+        stride = self.display_width * 3
+        for y in range(self.display_height):
+            row = bytearray(stride)
+            row[0::3] = bytes((x * 255 // self.display_width) ^ (y % 31) for x in range(self.display_width))
+            row[1::3] = bytes([y * 255 // self.display_height]) * self.display_width
+            row[2::3] = bytes((x * y) % 251 for x in range(self.display_width))
+            self._canvas[y * stride:(y + 1) * stride] = row
+
+    def _fill(self, x, y, width, height, color):
+        x, y = max(0, min(x, self.display_width - 1)), max(0, min(y, self.display_height - 1))
+        width, height = min(width, self.display_width - x), min(height, self.display_height - y)
+        stride = self.display_width * 3
+        for row in range(y, y + height):
+            start = row * stride + x * 3
+            self._canvas[start:start + width * 3] = bytes(color) * width
+
+    def execute(self, action):
+        if self.action_seconds:
+            time.sleep(self.action_seconds)
+        self.actions.append(action)
+        kind = action["type"]
+        if kind in ("click", "double_click"):
+            color = {"left": (255, 0, 0), "right": (0, 0, 255)}.get(action.get("button", "left"), (0, 255, 0))
+            self._fill(action["x"] - 10, action["y"] - 10, 20, 20, color)
+        elif kind == "type":
+            self._fill(20, 20, 8 * len(action["text"]), 16, (0, 0, 0))
+        elif kind == "keypress":
+            self._fill(self.display_width - 40, 0, 40, 20, (255, 255, 0))
+        elif kind == "drag":
+            for point in action["path"]:
+                self._fill(point["x"] - 2, point["y"] - 2, 4, 4, (255, 0, 255))
+        elif kind == "scroll":
+            stride = self.display_width * 3
+            shift = max(-self.display_height, min(self.display_height, action.get("scroll_y", 0))) * stride
+            self._canvas[:] = self._canvas[shift:] + self._canvas[:shift]
+
+    def screenshot(self):
+        if self.capture_seconds:
+            time.sleep(self.capture_seconds)
+        return Frame(self.display_width, self.display_height, bytes(self._canvas))
+
+
+class ScreenshotEncoder:
+    # Downscales a Frame to at most max_width pixels wide (or by `scale`) and encodes it.
+    def __init__(self, format="png", quality=80, max_width=None, scale=None, compress_level=6):
+        if format not in ("png", "webp"):
+            raise ValueError(f"format must be 'png' or 'webp', not {format!r}")
+        self.format = format
+        self.quality = quality
+        self.max_width = max_width
+        self.scale = scale
+        self.compress_level = compress_level
+        try:
+            import PIL  # noqa: F401
+        except ImportError:
+            if format == "webp":
+                raise ImportError("WebP screenshots need Pillow (pip install pillow)") from None
+            self._pillow = False
+        else:
+            self._pillow = True
+
+    def size_for(self, width, height):
+        # The screenshot size for a display of width x height.
+        scale = self.scale or (min(1.0, self.max_width / width) if self.max_width else 1.0)
+        if not self._pillow:
+            step = max(1, round(1 / scale))
+            return -(-width // step), -(-height // step)
+        return max(1, round(width * scale)), max(1, round(height * scale))
+
+    def encode(self, frame):
+        width, height = self.size_for(frame.width, frame.height)
+        if self._pillow:
+            import io
+
+            from PIL import Image
+
+            image = Image.frombytes("RGB", (frame.width, frame.height), frame.pixels)
+            if (width, height) != (frame.width, frame.height):
+                image = image.resize((width, height), Image.BILINEAR)
+            out = io.BytesIO()
+            if self.format == "webp":
+                image.save(out, "WEBP", quality=self.quality)
+            else:
+                image.save(out, "PNG", compress_level=self.compress_level)
+            return out.getvalue()
+        step = max(1, round(frame.width / width))
+        return _png(width, height, _downscale(frame, step), self.compress_level)
+
+    @property
+    def mime_type(self):
+        return f"image/{self.format}"
+
+
+def _downscale(frame, step):
+    # Every step-th pixel of every step-th row, as one RGB row after another.
+    stride = frame.width * 3
+    rows = []
+    for y in range(0, frame.height, step):
+        row = frame.pixels[y * stride:(y + 1) * stride]
+        if step == 1:
+            rows.append(row)
+            continue
+        out = bytearray(-(-frame.width // step) * 3)
+        for channel in range(3):
+            out[channel::3] = row[channel::3 * step]
+        rows.append(bytes(out))
+    return rows
+
+
+def _png(width, height, rows, compress_level):
+    def chunk(kind, data):
+        return len(data).to_bytes(4, "big") + kind + data + zlib.crc32(kind + data).to_bytes(4, "big")
+
+    header = width.to_bytes(4, "big") + height.to_bytes(4, "big") + bytes([8, 2, 0, 0, 0])
+    data = zlib.compress(b"".join(b"\x00" + row for row in rows), compress_level)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", data) + chunk(b"IEND", b"")
+
+
+@dataclass
+class StepTiming:
+    step: int
+    model: float = 0.0  # from sending the request until the computer_call arrived
+    tail: float = 0.0  # the rest of the response, after the computer_call
+    action: float = 0.0
+    capture: float = 0.0
+    encode: float = 0.0
+    waited: float = 0.0  # for the worker, once the response was complete
+    bytes: int = 0  # of the encoded screenshot
+    duplicate: bool = False  # the screen hadn't changed, so the previous encoding was reused
+
+    @property
+    def hidden(self):
+        # Environment time that overlapped with receiving the response.
+        return max(0.0, self.action + self.capture + self.encode - self.waited)
+
+    @property
+    def total(self):
+        return self.model + self.tail + self.waited
+
+
+@dataclass
+class AgentRun:
+    response: Any = None
+    steps: list = field(default_factory=list)
+    stopped: Optional[str] = None  # why the loop ended early: "max_steps" or "safety_check"
+
+    def summary(self):
+        if not self.steps:
+            return "no actions"
+        n = len(self.steps)
+        mean = lambda name: sum(getattr(step, name) for step in self.steps) / n  # noqa: E731
+        ms = lambda name: mean(name) * 1000  # noqa: E731
+        return (f"{n} steps, per step: model {ms('model'):.0f} ms + tail {ms('tail'):.0f} ms, action "
+                f"{ms('action'):.0f} ms, capture {ms('capture'):.0f} ms, encode {ms('encode'):.0f} ms "
+                f"({ms('hidden'):.0f} ms of it hidden behind the response), {mean('bytes') / 1000:.0f} kB per "
+                f"screenshot, {sum(step.duplicate for step in self.steps)} unchanged frames reused")
+
+
+class ComputerUseAgent:
+    def __init__(self, environment, client=None, model="computer-use-preview", encoder=None, max_steps=50,
+                 acknowledge=None, pipelined=True):
+        # acknowledge(safety_checks) decides whether to go ahead despite the model's pending safety checks;
+        # without it the loop stops at the first one. pipelined=False waits for the whole response before
+        # executing anything (the plain five-step loop).
+        self.environment = environment
+        self.client = client or get_client()
+        self.model = model
+        self.encoder = encoder or ScreenshotEncoder()
+        self.max_steps = max_steps
+        self.acknowledge = acknowledge
+        self.pipelined = pipelined
+        self._worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="computer")
+        self._worker.submit(environment.start).result()
+        self._last = None  # (hash of the last frame, its data URL)
+        width, height = self.encoder.size_for(environment.display_width, environment.display_height)
+        self._scale = (environment.display_width / width, environment.display_height / height)
+        self.tool = {"type": "computer_use_preview", "display_width": width, "display_height": height,
+                     "environment": environment.environment}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._worker.submit(self.environment.close).result()
+        self._worker.shutdown()
+
+    def run(self, task, initial_screenshot=True):
+        run = AgentRun()
+        content = [{"type": "input_text", "text": task}]
+        if initial_screenshot:
+            content.append({"type": "input_image", "image_url": self._worker.submit(self._capture, StepTiming(0)).result()})
+        params = {"input": [{"role": "user", "content": content}]}
+        while True:
+            timing = StepTiming(len(run.steps) + 1)
+            response, call, job = self._respond(params, timing, may_act=len(run.steps) < self.max_steps)
+            run.response = response
+            if call is None:
+                return run
+            if len(run.steps) >= self.max_steps:
+                run.stopped = "max_steps"
+                return run
+            checks = [check.to_dict() for check in call.pending_safety_checks or []]
+            if checks and not (self.acknowledge and self.acknowledge(checks)):
+                run.stopped = "safety_check"
+                return run
+            start = time.perf_counter()
+            if job is None:
+                job = self._worker.submit(self._act, call, timing)
+            image_url = job.result()
+            timing.waited = time.perf_counter() - start
+            run.steps.append(timing)
+            output = {"type": "computer_call_output", "call_id": call.call_id,
+                      "output": {"type": "computer_screenshot", "image_url": image_url}}
+            if checks:
+                output["acknowledged_safety_checks"] = checks
+            params = {"input": [output], "previous_response_id": response.id}
+
+    def _respond(self, params, timing, may_act=True):
+        # (response, its computer_call or None, the worker job already started for it or None). Nothing is
+        # started without may_act, once the step budget is used up.
+        start = time.perf_counter()
+        request = dict(model=self.model, tools=[self.tool], truncation="auto", **params)
+        if not self.pipelined:
+            response = self.client.responses.create(**request)
+            timing.model = time.perf_counter() - start
+            call = next((item for item in response.output if item.type == "computer_call"), None)
+            return response, call, None
+        response = call = job = None
+        with self.client.responses.create(stream=True, **request) as stream:
+            for event in stream:
+                if event.type == "response.output_item.done" and event.item.type == "computer_call" and call is None:
+                    call = event.item
+                    timing.model = time.perf_counter() - start
+                    if may_act and not call.pending_safety_checks:  # those wait for acknowledge() first
+                        job = self._worker.submit(self._act, call, timing)
+                elif event.type in ("response.completed", "response.incomplete", "response.failed"):
+                    if event.type == "response.failed":
+                        raise RuntimeError(f"computer use response failed: {event.response.error}")
+                    response = event.response
+                elif event.type == "error":
+                    raise RuntimeError(f"computer use stream error: {event.message}")
+        if response is None:
+            raise RuntimeError("the computer use stream ended without a completed response")
+        if call is None:
+            timing.model = time.perf_counter() - start
+        else:
+            timing.tail = time.perf_counter() - start - timing.model
+        return response, call, job
+
+    def _act(self, call, timing):
+        # On the worker thread: the call's actions, then the screenshot that shows their result.
+        start = time.perf_counter()
+        actions = [call.action] if call.action is not None else list(call.actions or [])
+        for action in actions:
+            self.environment.execute(self._unscale(action.to_dict()))
+        timing.action = time.perf_counter() - start
+        return self._capture(timing)
+
+    def _capture(self, timing):
+        start = time.perf_counter()
+        frame = self.environment.screenshot()
+        timing.capture = time.perf_counter() - start
+        start = time.perf_counter()
+        digest = hashlib.blake2b(frame.pixels, digest_size=16).digest()
+        if self._last is not None and self._last[0] == digest:
+            timing.duplicate = True
+            image_url = self._last[1]
+        else:
+            data = self.encoder.encode(frame)
+            image_url = f"data:{self.encoder.mime_type};base64," + base64.b64encode(data).decode()
+            self._last = (digest, image_url)
+        timing.encode = time.perf_counter() - start
+        timing.bytes = len(image_url)
+        return image_url
+
+    def _unscale(self, action):
+        # Action coordinates are in screenshot pixels; the environment wants display pixels.
+        sx, sy = self._scale
+        if "x" in action:
+            action["x"] = round(action["x"] * sx)
+        if "y" in action:
+            action["y"] = round(action["y"] * sy)
+        if "scroll_x" in action:
+            action["scroll_x"] = round(action["scroll_x"] * sx)
+        if "scroll_y" in action:
+            action["scroll_y"] = round(action["scroll_y"] * sy)
+        if "path" in action:
+            action["path"] = [{"x": round(point["x"] * sx), "y": round(point["y"] * sy)} for point in action["path"]]
+        return action
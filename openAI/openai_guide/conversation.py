@@ -0,0 +1,95 @@
+from ._client import get_client
+
+
+# ==========================================================
+# ============== Conversation State ========================
+# ==========================================================
+
+
+# ------------------------------------------------------
+# ------ Manually managing conversation state ----------
+# ------------------------------------------------------
+# This is the simplest way to manage conversation state. You keep track of the messages yourself.
+def knock_knock(client=None):
+    client = client or get_client()
+    return client.chat.completions.create(
+        model="gpt-4",
+        messages=[
+            {"role": "user", "content": "knock knock"},
+            {"role": "assistant", "content": "Who's there?"},
+            {"role": "user", "content": "Orange"},
+        ]
+    )
+# This is a simple example of how to manage conversation state manually.
+# You keep track of the messages in a list and pass them to the API each time you want to get a response.
+# By using alternating user and assistant messages, you capture the previous state of a conversation in one request to the model.
+
+
+def tell_jokes(client=None):
+    # Returns the history list and both responses; the second request resends the whole history.
+    client = client or get_client()
+    history = [
+        {"role": "user", "content": "Tell me a joke."}
+    ]
+    response = client.chat.completions.create(
+        model="gpt-4",
+        messages=history
+    )
+    history.append(response.choices[0].message)
+    history.append({
+        "role": "user",
+        "content": "Tell me another"
+    })
+    response2 = client.chat.completions.create(
+        model="gpt-4",
+        messages=history
+    )
+    return history, response, response2
+
+
+
+
+# -------------------------------------------------------------------------------
+# ----------Managing Converstion State with Response API ------------------------
+# -------------------------------------------------------------------------------
+def chain_responses(client=None):
+    client = client or get_client()
+    response = client.responses.create(
+        model="gpt-4o-mini",
+        input="tell me a joke",
+        # store = False # setting this to False will not store response on openAI. By default it's True and saves responses for 30 days. 
+    )
+    response2 = client.responses.create(
+        model="gpt-4o-mini",
+        previous_response_id=response.id,
+        input="explain why is this funny"
+    )
+    return response, response2
+
+
+# -------------------------------------------------------------------------------
+# ---------- Long conversations under a token budget ----------------------------
+# -------------------------------------------------------------------------------
+# Resending the whole history (as tell_jokes does) makes every turn bigger than the last. A
+# ConversationStore keeps the newest turns verbatim and compacts the older ones to stay within a token
+# budget; with a path it lives in SQLite, so a long-running session can be picked up by a later process.
+def keep_telling_jokes(turns=10, client=None, store=None):
+    from .history import ConversationStore
+
+    store = store or ConversationStore(budget=1000, keep_last=6)
+    store.ask("Tell me a joke.", client=client)
+    for _ in range(turns - 1):
+        store.ask("Tell me another", client=client)
+    return store
+
+
+# Chaining with previous_response_id only works while the previous response is stored. A Session chains
+# when it can and replays its local copy of the conversation when it can't (store=False, or the stored
+# response has expired).
+def chat_session(store=True, client=None):
+    from .session import Session
+
+    session = Session(client=client or get_client(), model="gpt-4o-mini", store=store)
+    response = session.ask("tell me a joke")
+    response2 = session.ask("explain why is this funny")
+    return session, response, response2
@@ -0,0 +1,182 @@
+# Base64 file inputs (input_file, input_audio) streamed into the request body.
+# Sending a PDF or a WAV inline the obvious way reads the whole file, base64-encodes it to bytes, decodes
+# that to a str, pastes it into a data URL and lets the SDK serialize the body to JSON once more - four or
+# five full-size copies of the payload in memory at once. Here the body is sent with
+# client.post(content=...) instead: everything but the base64 values is serialized up front, and each
+# Base64Data is encoded in chunk_size pieces straight from its source while the request is being written,
+# so memory use stays at about one chunk whatever the file size.
+#
+#   body = {"model": "gpt-4.1", "input": [{"role": "user", "content": [
+#       input_file("report.pdf"),
+#       {"type": "input_text", "text": "Summarize this."},
+#   ]}]}
+#   response = create_response(body)
+#
+# A source is a path (read through one reusable buffer), a seekable binary file object, or anything
+# bytes-like - bytes, a memoryview, an mmap - which is sliced without copying. The body knows its exact
+# length up front, so it is sent with a Content-Length instead of chunked encoding, and it can be
+# iterated again when the SDK retries.
+import binascii
+import json
+import mimetypes
+import os
+import re
+import uuid
+
+from ._client import get_async_client, get_client
+
+CHUNK_SIZE = 3 * 256 * 1024  # a multiple of 3, so the encoded chunks concatenate without padding
+
+
+class Base64Data:
+    def __init__(self, source, prefix="", chunk_size=CHUNK_SIZE):
+        if chunk_size % 3:
+            raise ValueError("chunk_size must be a multiple of 3")
+        self.source = source
+        self.prefix = prefix.encode("ascii")
+        self.chunk_size = chunk_size
+        if isinstance(source, (str, os.PathLike)):
+            self.size = os.path.getsize(source)
+        elif hasattr(source, "read"):
+            self._start = source.tell()
+            self.size = source.seek(0, os.SEEK_END) - self._start
+            source.seek(self._start)
+        else:
+            self.size = memoryview(source).nbytes
+
+    def __len__(self):
+        # Length of the encoded value, prefix included.
+        return len(self.prefix) + (self.size + 2) // 3 * 4
+
+    def __iter__(self):
+        if self.prefix:
+            yield self.prefix
+        if isinstance(self.source, (str, os.PathLike)):
+            with open(self.source, "rb") as f:
+                yield from self._encode_file(f)
+        elif hasattr(self.source, "read"):
+            self.source.seek(self._start)
+            yield from self._encode_file(self.source)
+        else:
+            data = memoryview(self.source).cast("B")
+            for start in range(0, len(data), self.chunk_size):
+                yield binascii.b2a_base64(data[start:start + self.chunk_size], newline=False)
+
+    def _encode_file(self, f):
+        buffer = bytearray(self.chunk_size)
+        view = memoryview(buffer)
+        remaining = self.size
+        while remaining:
+            filled = 0
+            while filled < min(self.chunk_size, remaining):
+                read = f.readinto(view[filled:min(self.chunk_size, remaining)])
+                if not read:
+                    raise ValueError("the file got shorter while it was being sent")
+                filled += read
+            remaining -= filled
+            yield binascii.b2a_base64(view[:filled], newline=False)
+
+
+class StreamingJSONBody:
+    # A JSON request body whose Base64Data values are encoded while it is sent. Iterate it for the bytes;
+    # len() is the exact size.
+    def __init__(self, body):
+        token = f"base64-{uuid.uuid4().hex}-"
+        values = []
+
+        def placeholder(value):
+            if not isinstance(value, Base64Data):
+                raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+            values.append(value)
+            return f"{token}{len(values) - 1}"
+
+        text = json.dumps(body, default=placeholder, ensure_ascii=False)
+        # The placeholders are strings, so the quotes around each stay in the serialized text.
+        pieces = re.split(f"{token}(\\d+)", text)
+        self.parts = []
+        for i, piece in enumerate(pieces):
+            self.parts.append(piece.encode("utf-8") if i % 2 == 0 else values[int(piece)])
+
+    def __len__(self):
+        return sum(len(part) for part in self.parts)
+
+    def __iter__(self):
+        for part in self.parts:
+            if isinstance(part, bytes):
+                yield part
+            else:
+                yield from part
+
+    def aiter(self):
+        # The same bytes for an httpx.AsyncClient, which only streams async iterables.
+        return _AsyncBody(self)
+
+
+class _AsyncBody:
+    def __init__(self, body):
+        self.body = body
+
+    async def __aiter__(self):
+        for chunk in self.body:
+            yield chunk
+
+
+def input_file(source, filename=None, mime_type=None, chunk_size=CHUNK_SIZE):
+    # An input_file content part carrying the file inline as a base64 data URL.
+    if filename is None:
+        filename = os.path.basename(source) if isinstance(source, (str, os.PathLike)) else getattr(source, "name", "file")
+    mime_type = mime_type or mimetypes.guess_type(str(filename))[0] or "application/octet-stream"
+    return {
+        "type": "input_file",
+        "filename": os.path.basename(str(filename)),
+        "file_data": Base64Data(source, prefix=f"data:{mime_type};base64,", chunk_size=chunk_size),
+    }
+
+
+def input_audio(source, format="wav", chunk_size=CHUNK_SIZE):
+    # An input_audio content part for chat completions.
+    return {"type": "input_audio", "input_audio": {"data": Base64Data(source, chunk_size=chunk_size), "format": format}}
+
+
+def _post_options(body):
+    return {"headers": {"Content-Type": "application/json", "Content-Length": str(len(body))}}
+
+
+def post(path, body, cast_to, client=None):
+    # POSTs a JSON body that may contain Base64Data values through the SDK client, parsed as cast_to.
+    client = client or get_client()
+    body = StreamingJSONBody(body)
+    return client.post(path, cast_to=cast_to, content=body, options=_post_options(body))
+
+
+def post_streaming(path, body, cast_to, client=None):
+    # As post(), but like with_streaming_response: a context manager for the unread response.
+    #   with post_streaming("/responses", body, Response) as response:
+    #       for chunk in response.iter_bytes(): ...
+    from openai._response import ResponseContextManager
+
+    client = client or get_client()
+    body = StreamingJSONBody(body)
+    options = _post_options(body)
+    options["headers"]["X-Stainless-Raw-Response"] = "stream"
+    return ResponseContextManager(lambda: client.post(path, cast_to=cast_to, content=body, options=options))
+
+
+async def apost(path, body, cast_to, client=None):
+    client = client or get_async_client()
+    body = StreamingJSONBody(body)
+    return await client.post(path, cast_to=cast_to, content=body.aiter(), options=_post_options(body))
+
+
+def create_response(body, client=None):
+    # client.responses.create(**body), with the body streamed.
+    from openai.types.responses import Response
+
+    return post("/responses", body, Response, client)
+
+
+def create_chat_completion(body, client=None):
+    # client.chat.completions.create(**body), with the body streamed.
+    from openai.types.chat import ChatCompletion
+
+    return post("/chat/completions", body, ChatCompletion, client)
@@ -0,0 +1,116 @@
+import time
+
+from ._client import get_client
+
+
+# ========================================================
+# ================== File Search =========================
+# ========================================================
+# Allow models to search your files for relevant information before generating a response.
+# This is a hosted tool managed by OpenAI, meaning you don't have to implement code on your end to handle its execution. 
+# When the model decides to use it, it will automatically call the tool, retrieve information from your files, and return an output.
+
+SAMPLE_DOCUMENT_URL = "https://cdn.openai.com/API/docs/deep_research_blog.pdf"
+
+
+# 1. Upload file to API 
+#    With an upload_cache.UploadCache, content that was uploaded before is not sent again.
+#    A URL is streamed from the download straight into the upload, never held in memory as a whole
+#    (see streaming_upload.py); with a cache it is first streamed to a temporary file so its hash is
+#    known before deciding whether to upload.
+def create_file(client, file_path, upload_cache=None):
+    if file_path.startswith("http://") or file_path.startswith("https://"):
+        # Download the file content from the URL
+        from .streaming_upload import download_to, upload_from_url
+
+        file_name = file_path.split("/")[-1]
+        if upload_cache is None:
+            return upload_from_url(file_path, client=client, purpose="assistants", filename=file_name)
+        import tempfile
+
+        with tempfile.TemporaryFile() as file_content:
+            sha256 = download_to(file_path, file_content)
+            file_content.seek(0)
+            return upload_cache.upload(file_content, purpose="assistants", filename=file_name, sha256=sha256)
+    elif upload_cache is not None:
+        return upload_cache.upload(file_path, purpose="assistants")
+    else:
+        # Handle local file path
+        with open(file_path, "rb") as file_content:
+            result = client.files.create(
+                file=file_content,
+                purpose="assistants"
+            )
+    return result.id
+
+
+# Uploads a whole local corpus, `concurrency` files at a time; returns the file ids in order. Re-running
+# it on unchanged files with the same persistent UploadCache uploads nothing.
+def create_files(client, file_paths, upload_cache=None, concurrency=8):
+    from .upload_cache import UploadCache
+
+    upload_cache = upload_cache or UploadCache(client=client)
+    return upload_cache.upload_many(file_paths, purpose="assistants", concurrency=concurrency)
+
+
+# 2. Create Vector Store
+# 3. Add file to vector store
+#    To add a whole corpus, use ingest.ingest_files: it uploads concurrently and adds the files in batches.
+def create_knowledge_base(file_id, name="my_knowledge_base", client=None):
+    client = client or get_client()
+    vector_store = client.vector_stores.create(
+        name=name,
+    )
+    client.vector_stores.files.create(
+        vector_store_id=vector_store.id,
+        file_id=file_id,
+    )
+    return vector_store
+
+
+# 4. Run this code until the file is ready to be used (i.e., when the status is completed).
+#    Every file in the store is checked, not just the first, until none of them is in_progress any more,
+#    with the polling interval backing off up to max_interval. Returns the store's files; check their
+#    status for failed ones.
+#    To wait on many vector stores or background jobs at once use poller.AsyncPoller.
+def wait_until_ready(vector_store_id, poll_interval=1, client=None, max_interval=30):
+    from .poller import VECTOR_STORE_FILE_PENDING, Backoff
+
+    client = client or get_client()
+    backoff = Backoff(poll_interval, max_interval)
+    while True:
+        files = list(client.vector_stores.files.list(
+            vector_store_id=vector_store_id,
+            limit=100,
+        ))
+        if not any(file.status in VECTOR_STORE_FILE_PENDING for file in files):
+            return files
+        time.sleep(backoff.next())
+
+
+# 5. Once your knowledge base is set up, you can include the file_search tool in the list of tools available to the model, 
+#    along with the list of vector stores in which to search.
+#    Where the hosted round trip is too slow, local_search.LocalIndex searches the same files locally, with the
+#    same filters and max_num_results, and ask_with_local_context passes what it finds to the model.
+def search_files(vector_store_id, question="What is the main idea of the document?", client=None):
+    client = client or get_client()
+    return client.responses.create(
+        model="gpt-4.1",
+        tools=[
+            {
+                "type": "file_search",
+                "vector_store_ids": [vector_store_id],
+                "max_num_results": 2, # customize the number of results you wnat to retrieve from the vector stores. 
+                # You can filter the search results based on the metadata of the files. 
+                "filters": {
+                    "type": "eq",
+                    "key": "type",
+                    "value": "blog"
+                }
+            }
+        ],
+        # Once your knowledge base is set up, you can include the file_search tool in the list of tools 
+        # available to the model, along with the list of vector stores in which to search.
+        include=["file_search_call.results"], 
+        input=question,
+    )
@@ -0,0 +1,69 @@
+import os
+
+from ._client import get_client
+
+# The sample PDF that ships next to 01-core.py.
+SAMPLE_PDF = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "file-sample_150kB.pdf")
+
+
+# ======================================================================
+# ================ File Inputs =========================================
+# ======================================================================
+# OpenAI models with vision capabilities can also accept PDF files as input. 
+# Provide PDFs either as Base64-encoded data or as file IDs obtained after uploading files to 
+# the /v1/files endpoint through the API or dashboard.
+# Pass an upload_cache.UploadCache to upload the PDF only the first time.
+def ask_about_uploaded_pdf(path=SAMPLE_PDF, question="What is in this image?", client=None, upload_cache=None):
+    client = client or get_client()
+    if upload_cache is not None:
+        file_id = upload_cache.upload(path, purpose="user_data")
+    else:
+        with open(path, "rb") as f:
+            file_id = client.files.create(
+                file=f,
+                purpose="user_data"
+            ).id
+    return client.responses.create(
+        model="gpt-4.1",
+        input=[
+            {
+                "role": "user",
+                "content": [
+                    {
+                        "type": "input_file",
+                        "file_id": file_id
+                    },
+                    {
+                        "type": "input_text",
+                        "text": question
+                    }
+                ]
+            }
+        ]
+    )
+
+
+# ------- Sending PDF as Base64 string -------
+# input_file() base64-encodes the PDF while the request is being sent (see file_inputs.py), so even a
+# 100 MB document is never held in memory as one big string.
+def ask_about_base64_pdf(path=SAMPLE_PDF, question="What is in this image?", client=None):
+    from .file_inputs import create_response, input_file
+
+    return create_response(
+        {
+            "model": "gpt-4.1",
+            "input": [
+                {
+                    "role": "user",
+                    "content": [
+                        input_file(path, mime_type="application/pdf"),
+                        {
+                            "type": "input_text",
+                            "text": question
+                        }
+                    ]
+                }
+            ]
+        },
+        client=client,
+    )
@@ -0,0 +1,158 @@
+import threading
+
+from ._client import get_client
+from .tool_cache import ToolResultCache
+from .tool_registry import ToolRegistry
+
+
+# ========================================================
+# ============== Function Calling ========================
+# ========================================================
+# Function calling is a feature that allows you to define functions that the model can call to get information or perform actions.
+# This is useful for tasks like retrieving data from an API, performing calculations, or interacting with external systems.
+# To use function calling, you need to define the functions you want the model to call and provide them in the API request.
+# Function calling has two primary use cases:
+# Fetching Data:	Retrieve up-to-date information to incorporate into the model's response (RAG). Useful for searching knowledge bases and retrieving specific data from APIs (e.g. current weather data).
+# Taking Action:	Perform actions like submitting a form, calling APIs, modifying application state (UI/frontend or backend), or taking agentic workflow actions (like handing off the conversation).
+# Function calling is available in the gpt-4o-2024-08-06 and later models.
+# Here's an example of how to use function calling with the OpenAI API:
+
+# Step1: Call model with functions defined – along with your system and user messages.
+
+# Every function the model may call is registered here; the registry derives each tool's strict JSON
+# schema from the function signature and routes calls by name. The hand-written equivalent for
+# get_weather was:
+# {
+#     "type": "function",
+#     "function": {
+#         "name": "get_weather",
+#         "description": "Get current temprature for a given location.",
+#         "parameters": {
+#             "type": "object",
+#             "properties": {
+#                 "latitude": {"type": "number"},
+#                 "longitude": {"type": "number"}
+#             },
+#             "required": ["latitude", "longitude"],
+#             "additionalProperties": False
+#         }
+#     },
+#     "strict": True  # This ensures the model adheres to the function's schema
+# }
+registry = ToolRegistry()
+
+
+# Weather doesn't change much within five minutes or a kilometre (two decimals of a degree), so repeated
+# and concurrent lookups for the same city share one open-meteo request; see get_weather.cache.stats.
+@registry.tool(description="Get current temprature for a given location.")
+@ToolResultCache(ttl=300, precision=2)
+def get_weather(latitude: float, longitude: float) -> float:
+    from .transport import http_get
+
+    response = http_get(f'https://api.open-meteo.com/v1/forecast?latitude={latitude}&longitude={longitude}&current=temperature_2m,wind_speed_10m&hourly=temperature_2m,relative_humidity_2m,wind_speed_10m')
+    data = response.json()
+    return data['current']['temperature_2m']
+
+
+def __getattr__(name):
+    # functions.tools, the schema list, is only built (importing pydantic and openai) when first used.
+    if name == "tools":
+        return registry.tools()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+#Step 3: Call the function with the arguments provided by the model. - Execute function code – parse the model's response and handle function calls.
+def call_function(name, **kwargs): # Function to route each function call to the appropriate function. 
+    # A dict lookup in the registry; the arguments are validated against the tool's schema first.
+    return registry.call(name, kwargs)
+
+
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
+
+
+def default_dispatcher():
+    # The ToolDispatcher ask_weather uses unless given one: made on first use and shared by every call,
+    # so its thread pool is reused rather than started (and left running) per question.
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            from .tool_dispatch import ToolDispatcher
+
+            _dispatcher = ToolDispatcher(registry, timeouts={"get_weather": 10.0})
+        return _dispatcher
+
+
+def ask_weather(question="What's the weather like in Paris, France?", client=None, dispatcher=None):
+    client = client or get_client()
+    dispatcher = dispatcher or default_dispatcher()
+    messages = [
+        {
+            "role": "user",
+            "content": question
+        }
+    ]
+    response = client.chat.completions.create(
+        model="gpt-4.1",
+        messages=messages,
+        tools=registry.tools(),
+        tool_choice="auto",  # This allows the model to choose which tool to call
+        # stream = True  # Set to True if you want to stream the response
+    )
+
+    # Step 2: Check if the model called a function. Model decides to call function(s) – model returns the name and input arguments.
+    # Streaming option with tools 
+    # for chunk in response:
+    #     delta = chunk.choices[0].delta
+    #     print(delta.tool_calls)
+
+    # Sample Response: 
+    # [{
+    #     "id": "call_12345xyz",
+    #     "type": "function",
+    #     "function": {
+    #       "name": "get_weather",
+    #       "arguments": "{\"latitude\":48.8566,\"longitude\":2.3522}"
+    #     }
+    # }]
+    tool_calls = response.choices[0].message.tool_calls
+    if not tool_calls:
+        return response
+
+    # Step 3: run the requested calls. The serial version is
+    #   for tool_call in tool_calls:
+    #       args = json.loads(tool_call.function.arguments)
+    #       result = call_function(tool_call.function.name, **args)
+    #       messages.append({"role": "tool", "tool_call_id": tool_call.id, "content": str(result)})
+    # but the calls are independent, so the dispatcher runs them concurrently and returns the same
+    # tool messages in the same order.
+    messages.append(response.choices[0].message)  # Add the function call message
+    messages.extend(dispatcher.execute(tool_calls))
+    # Note: 
+    # The function call is executed with the arguments provided by the model.
+    # The result of the function call is then added to the conversation history as a tool message.
+    # This allows the model to incorporate the result into its final response.
+
+    #Step 4: Supply model with results – so it can incorporate them into its final response.
+    # Step 5: Model responds – incorporating the result in its output.
+    return client.chat.completions.create(
+        model="gpt-4.1",
+        messages=messages,
+        tools=registry.tools(),
+    )
+
+
+# Best practises for function calling:
+# 1. Define clear function schemas: Specify the function's name, description, and parameters. Explicitly describe the purpose of the function and each parameter (and its format), and what the output represents.
+# 2. Use the system prompt to describe when (and when not) to use each function. Generally, tell the model exactly what to do.
+# 3. Use strict mode: Set "strict": True to ensure the model adheres to the function's schema.
+# 4. Handle function calls gracefully: Check if the model called a function and execute it with the provided arguments.
+# 5. Incorporate results into the conversation: Add the function call message and the result to the conversation history before making the final API call.
+# 6. Test and iterate: Experiment with different function definitions and prompts to improve the model's performance.
+# 7. Use function calling for specific tasks: Function calling is best suited for tasks that require structured data retrieval or actions, such as fetching weather data, performing calculations, or interacting with APIs.
+# 8. Monitor and log function calls: Keep track of function calls and their results to analyze the model's performance and improve the function definitions over time.
+# 9. Use function calling for complex tasks: Function calling is particularly useful for tasks that require multiple steps or interactions with external systems, such as booking a flight, ordering food, or managing a calendar.
+# 10. Use function calling for data retrieval: Function calling is ideal for tasks that require retrieving up-to-date information, such as current weather, stock prices, or news articles.
+# 11. Use function calling for action-oriented tasks: Function calling is also useful for tasks that require taking action, such as submitting a form, making a reservation, or sending an email.
+# 12. Use function calling for agentic workflows: Function calling can be used to create agentic workflows, where the model can take actions based on user input and external data.
+# 13. Use function calling for RAG (Retrieval-Augmented Generation): Function calling can be used to retrieve relevant information from external sources and incorporate it into the model's response, enhancing the quality and relevance of the output.
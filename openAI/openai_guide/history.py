@@ -0,0 +1,239 @@
+# Conversation history kept under a token budget.
+# tell_jokes keeps a Python list and resends all of it every turn, so each request is bigger (and slower)
+# than the last. ConversationStore keeps the messages in SQLite (a file, or in memory when no path is
+# given) with the token count of each one, and before a request goes out it compacts the oldest turns so
+# the prompt stays within `budget` tokens. The newest `keep_last` messages are always sent verbatim; older
+# ones are either dropped ("truncate") or folded into a running summary sent as a system message
+# ("summarize"):
+#
+#   store = ConversationStore("jokes.sqlite3", budget=2000, policy="summarize", summarizer=model_summarizer())
+#   store.ask("Tell me a joke.")
+#   store.ask("Tell me another")
+#   for turn in store.turn_stats(): print(turn)   # tokens and bytes sent per request
+#
+# Token counts come from tiktoken when it is installed and are estimated at 4 characters per token
+# otherwise. The same file can hold many conversations, told apart by conversation_id.
+import functools
+import json
+import sqlite3
+import threading
+from dataclasses import dataclass
+
+from ._client import get_client
+
+TRUNCATE = "truncate"
+SUMMARIZE = "summarize"
+
+SUMMARY_PREFIX = "Summary of the earlier conversation:\n"
+
+
+@functools.lru_cache(maxsize=None)
+def _encoding(model):
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+
+def count_tokens(message, model="gpt-4"):
+    # Tokens of one chat message: its text (or, for tool calls, its JSON) plus a few for the framing.
+    text = message.get("content")
+    if not isinstance(text, str):
+        text = json.dumps({key: value for key, value in message.items() if key != "role"}, ensure_ascii=False)
+    encoding = _encoding(model)
+    tokens = len(encoding.encode(text)) if encoding is not None else (len(text) + 3) // 4
+    return tokens + 4
+
+
+def _as_dict(message):
+    # SDK message objects (response.choices[0].message) are stored as the dict the API accepts back.
+    if hasattr(message, "model_dump"):
+        return message.model_dump(exclude_none=True, exclude_unset=True)
+    return dict(message)
+
+
+@dataclass
+class TurnStats:
+    turn: int
+    messages: int
+    tokens: int
+    bytes_sent: int
+
+
+def model_summarizer(client=None, model="gpt-4o-mini"):
+    # A summarizer that asks the model to fold the old messages into the previous summary.
+    def summarize(messages, previous_summary):
+        transcript = "\n".join(f"{m['role']}: {m.get('content') or json.dumps(m.get('tool_calls'))}" for m in messages)
+        prompt = "Update the summary of this conversation with the new messages. Keep names, facts and open questions."
+        if previous_summary:
+            prompt += f"\n\nCurrent summary:\n{previous_summary}"
+        response = (client or get_client()).chat.completions.create(
+            model=model,
+            messages=[{"role": "system", "content": prompt}, {"role": "user", "content": transcript}],
+        )
+        return response.choices[0].message.content
+
+    return summarize
+
+
+class ConversationStore:
+    def __init__(self, path=None, conversation_id="default", budget=4000, keep_last=6, policy=TRUNCATE,
+                 summarizer=None, model="gpt-4", low_water=0.75):
+        if policy not in (TRUNCATE, SUMMARIZE):
+            raise ValueError(f"policy must be {TRUNCATE!r} or {SUMMARIZE!r}, not {policy!r}")
+        if policy == SUMMARIZE and summarizer is None:
+            raise ValueError("the summarize policy needs a summarizer, e.g. model_summarizer()")
+        self.conversation_id = conversation_id
+        self.budget = budget
+        self.keep_last = keep_last
+        self.low_water = low_water
+        self.policy = policy
+        self.summarizer = summarizer
+        self.model = model
+        self._lock = threading.Lock()
+        self._compacting = threading.Lock()
+        self._db = sqlite3.connect(path or ":memory:", check_same_thread=False)
+        self._db.executescript(
+            "CREATE TABLE IF NOT EXISTS messages ("
+            " conversation_id TEXT, seq INTEGER, message TEXT, tokens INTEGER, PRIMARY KEY (conversation_id, seq));"
+            "CREATE TABLE IF NOT EXISTS summaries (conversation_id TEXT PRIMARY KEY, summary TEXT, tokens INTEGER);"
+            "CREATE TABLE IF NOT EXISTS turns ("
+            " conversation_id TEXT, turn INTEGER, messages INTEGER, tokens INTEGER, bytes_sent INTEGER);"
+        )
+
+    # ---- messages ----
+    def append(self, message):
+        message = _as_dict(message)
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT INTO messages VALUES (?, (SELECT COALESCE(MAX(seq), 0) + 1 FROM messages WHERE conversation_id = ?), ?, ?)",
+                (self.conversation_id, self.conversation_id, json.dumps(message, ensure_ascii=False),
+                 count_tokens(message, self.model)),
+            )
+
+    def pop(self, message=None):
+        # Removes and returns the newest message (None if there is none). Given `message`, removes it only
+        # if it is still the newest, e.g. to take back a user turn whose request failed.
+        with self._lock, self._db:
+            row = self._db.execute(
+                "SELECT seq, message FROM messages WHERE conversation_id = ? ORDER BY seq DESC LIMIT 1",
+                (self.conversation_id,)).fetchone()
+            if row is None or (message is not None and json.loads(row[1]) != _as_dict(message)):
+                return None
+            self._db.execute("DELETE FROM messages WHERE conversation_id = ? AND seq = ?", (self.conversation_id, row[0]))
+            return json.loads(row[1])
+
+    def _rows(self):
+        return self._db.execute(
+            "SELECT seq, message, tokens FROM messages WHERE conversation_id = ? ORDER BY seq", (self.conversation_id,)
+        ).fetchall()
+
+    def summary(self):
+        row = self._db.execute("SELECT summary, tokens FROM summaries WHERE conversation_id = ?", (self.conversation_id,)).fetchone()
+        return (row[0], row[1]) if row else (None, 0)
+
+    @property
+    def tokens(self):
+        # Tokens of the prompt messages() would send right now.
+        (total,) = self._db.execute(
+            "SELECT COALESCE(SUM(tokens), 0) FROM messages WHERE conversation_id = ?", (self.conversation_id,)
+        ).fetchone()
+        return total + self.summary()[1]
+
+    def messages(self):
+        summary, _ = self.summary()
+        messages = [{"role": "system", "content": SUMMARY_PREFIX + summary}] if summary else []
+        return messages + [json.loads(message) for _, message, _ in self._rows()]
+
+    # ---- compaction ----
+    def compact(self):
+        # Moves the oldest messages out of the prompt until it fits the budget, never touching the newest
+        # keep_last. Each compaction goes down to low_water * budget, so the next few turns fit without
+        # another one (and, for "summarize", another model call). A tool result is never separated from
+        # the assistant message that asked for it. Returns the number of messages removed.
+        # The summarizer runs without holding the store's lock, so appends and reads carry on meanwhile;
+        # one compaction runs at a time.
+        removed = 0
+        with self._compacting:
+            while True:
+                with self._lock:
+                    rows = self._rows()
+                    previous, summary_tokens = self.summary()
+                cut = self._cut(rows, sum(tokens for _, _, tokens in rows) + summary_tokens)
+                if not cut:
+                    return removed
+                if self._remove(rows[:cut], previous):
+                    removed += cut
+
+    def _cut(self, rows, total):
+        # How many of the oldest rows to move out: 0 if the prompt fits, or nothing can go.
+        if total <= self.budget or len(rows) <= self.keep_last:
+            return 0
+        limit = len(rows) - self.keep_last
+        cut = 0
+        while cut < limit and total > self.budget * self.low_water:
+            total -= rows[cut][2]
+            cut += 1
+        while cut < limit and json.loads(rows[cut][1]).get("role") == "tool":
+            cut += 1
+        while 0 < cut < len(rows) and json.loads(rows[cut][1]).get("role") == "tool":
+            cut -= 1  # at the keep_last window: keep the tool results' assistant message instead
+        return cut
+
+    def _remove(self, rows, previous):
+        # Returns False, removing nothing, if the history's old end changed while summarizing.
+        if self.policy == SUMMARIZE:
+            summary = self.summarizer([json.loads(message) for _, message, _ in rows], previous)
+            tokens = count_tokens({"role": "system", "content": SUMMARY_PREFIX + summary}, self.model)
+        with self._lock, self._db:
+            (still_there,) = self._db.execute(
+                "SELECT COUNT(*) FROM messages WHERE conversation_id = ? AND seq BETWEEN ? AND ?",
+                (self.conversation_id, rows[0][0], rows[-1][0])).fetchone()
+            if still_there != len(rows) or self.summary()[0] != previous:
+                return False
+            self._db.execute("DELETE FROM messages WHERE conversation_id = ? AND seq <= ?", (self.conversation_id, rows[-1][0]))
+            if self.policy == SUMMARIZE:
+                self._db.execute("INSERT OR REPLACE INTO summaries VALUES (?, ?, ?)", (self.conversation_id, summary, tokens))
+        return True
+
+    # ---- requests ----
+    def send(self, client=None, **kwargs):
+        # Compacts, sends the history to chat.completions and stores the reply.
+        client = client or get_client()
+        self.compact()
+        messages = self.messages()
+        self._record_turn(messages)
+        response = client.chat.completions.create(model=kwargs.pop("model", self.model), messages=messages, **kwargs)
+        self.append(response.choices[0].message)
+        return response
+
+    def ask(self, content, client=None, **kwargs):
+        self.append({"role": "user", "content": content})
+        return self.send(client, **kwargs)
+
+    def _record_turn(self, messages):
+        payload = json.dumps(messages, ensure_ascii=False).encode("utf-8")
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT INTO turns VALUES (?, (SELECT COUNT(*) + 1 FROM turns WHERE conversation_id = ?), ?, ?, ?)",
+                (self.conversation_id, self.conversation_id, len(messages), self.tokens, len(payload)),
+            )
+
+    def turn_stats(self):
+        rows = self._db.execute(
+            "SELECT turn, messages, tokens, bytes_sent FROM turns WHERE conversation_id = ? ORDER BY turn",
+            (self.conversation_id,),
+        ).fetchall()
+        return [TurnStats(*row) for row in rows]
+
+    def clear(self):
+        with self._lock, self._db:
+            for table in ("messages", "summaries", "turns"):
+                self._db.execute(f"DELETE FROM {table} WHERE conversation_id = ?", (self.conversation_id,))
+
+    def close(self):
+        self._db.close()
@@ -0,0 +1,327 @@
+# Generating many images concurrently, decoding them straight to disk.
+# images.generate_image parses the whole response, keeps the image as one base64 string and decodes all
+# of it in memory before writing the file. ImagePipeline runs many prompts at once and reads each HTTP
+# response as raw bytes: Base64Splitter picks the image fields ("result", and "partial_image_b64" when
+# streaming) out of the byte stream and decodes them into their files as they arrive, so neither the
+# base64 text nor the decoded image is ever held whole. Everything else in the response is kept, with
+# the image fields emptied, and parsed once the body ends:
+#
+#   results = run(["a cat", "a dog", ...], out_dir="images", concurrency=16, stream=True, partial_images=2)
+#   for result in results:
+#       print(result.paths, result.partial_paths, result.response["id"])
+#
+# Requests are paced by an AdaptiveLimit: a 429 pauses every new request for the server's retry-after,
+# halves the number allowed in flight (once per pause) and the request is retried; after `limit`
+# successes in a row one more is allowed again, up to max_concurrency. SDK retries are switched off so
+# that every rate-limit error reaches the scheduler.
+import asyncio
+import binascii
+import json
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+from ._client import get_async_client
+
+IMAGE_TOOL = {"type": "image_generation", "size": "1024x1024", "quality": "auto", "background": "auto"}
+_IMAGE_FIELD = re.compile(rb'"(result|partial_image_b64)"\s*:\s*"')
+_HOLD = 32  # bytes held back while scanning, so a field name split across two reads is still found
+_DECODE_CHUNK = 64 * 1024
+
+
+def write_base64(text, file):
+    # Decodes a base64 string into an open binary file a slice at a time; returns the bytes written.
+    written = 0
+    for start in range(0, len(text), _DECODE_CHUNK):
+        written += file.write(binascii.a2b_base64(text[start:start + _DECODE_CHUNK]))
+    return written
+
+
+class Base64Splitter:
+    # Fed the bytes of a JSON document (or of server-sent events) in pieces. Each string value of an image
+    # field is decoded into the binary file open_sink(field, skeleton) returns, which is closed at the
+    # end of the value (None skips the value), and left out of self.skeleton, the rest of the document.
+    def __init__(self, open_sink):
+        self.open_sink = open_sink
+        self.skeleton = bytearray()
+        self.decoded = 0
+        self._pending = b""  # scanned text held back, or base64 characters short of a group of 4
+        self._sink = None
+        self._in_value = False
+
+    def feed(self, data):
+        while data:
+            if self._in_value:
+                end = data.find(b'"')
+                self._decode(data if end < 0 else data[:end])
+                if end < 0:
+                    return
+                self._end_value()
+                data = data[end:]  # the closing quote stays in the skeleton
+                continue
+            text = self._pending + data
+            match = _IMAGE_FIELD.search(text)
+            if match is None:
+                keep = max(0, len(text) - _HOLD)
+                self.skeleton += text[:keep]
+                self._pending = text[keep:]
+                return
+            self.skeleton += text[:match.end()]
+            self._pending = b""
+            self._sink = self.open_sink(match.group(1).decode(), self.skeleton)
+            self._in_value = True
+            data = text[match.end():]
+
+    def finish(self):
+        # The skeleton, once the whole document has been fed.
+        if self._in_value:
+            self.close()
+            raise ValueError("the document ended inside an image field")
+        self.skeleton += self._pending
+        self._pending = b""
+        return bytes(self.skeleton)
+
+    def close(self):
+        if self._sink is not None:
+            self._sink.close()
+            self._sink = None
+
+    def _decode(self, chunk):
+        if self._sink is None:
+            return
+        chunk = self._pending + chunk.replace(b"\\", b"")  # JSON may escape "/" as "\/"
+        whole = len(chunk) // 4 * 4
+        if whole:
+            self.decoded += self._sink.write(binascii.a2b_base64(chunk[:whole]))
+        self._pending = chunk[whole:]
+
+    def _end_value(self):
+        if self._sink is not None and self._pending:
+            self.decoded += self._sink.write(binascii.a2b_base64(self._pending + b"=" * (-len(self._pending) % 4)))
+        self._pending = b""
+        self._in_value = False
+        self.close()
+
+
+def _parse_events(skeleton):
+    # The final response of a server-sent event stream; raises on an error or a failed response.
+    for line in reversed(skeleton.splitlines()):
+        if not line.startswith(b"data:"):
+            continue
+        event = json.loads(line[5:])
+        if event.get("type") == "error":
+            raise RuntimeError(event.get("message", "image generation failed"))
+        if event.get("type") in ("response.completed", "response.failed", "response.incomplete"):
+            if event["type"] != "response.completed":
+                raise RuntimeError(f"image generation {event['response']['status']}: {event['response'].get('error')}")
+            return event["response"]
+    raise RuntimeError("the stream ended before the response was completed")
+
+
+class AdaptiveLimit:
+    # How many requests may be in flight, adapted to rate-limit errors (see the top of this file).
+    def __init__(self, limit, maximum=None):
+        self.limit = limit
+        self.maximum = maximum or limit
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self._successes = 0
+        self._changed = asyncio.Condition()
+
+    async def acquire(self):
+        async with self._changed:
+            while True:
+                pause = self.paused_until - time.monotonic()
+                if pause > 0:
+                    try:
+                        await asyncio.wait_for(self._changed.wait(), pause)
+                    except asyncio.TimeoutError:
+                        pass
+                elif self.in_flight < self.limit:
+                    self.in_flight += 1
+                    return
+                else:
+                    await self._changed.wait()
+
+    async def release(self, retry_after=None):
+        # retry_after is None after a success, or the seconds the server asked to wait after a 429.
+        async with self._changed:
+            self.in_flight -= 1
+            now = time.monotonic()
+            if retry_after is None:
+                self._successes += 1
+                if self._successes >= self.limit and self.limit < self.maximum:
+                    self.limit += 1
+                    self._successes = 0
+            else:
+                if now >= self.paused_until:
+                    self.limit = max(1, self.limit // 2)
+                self._successes = 0
+                self.paused_until = max(self.paused_until, now + retry_after)
+            self._changed.notify_all()
+
+
+def _retry_after(error, attempt):
+    headers = error.response.headers
+    if headers.get("retry-after-ms"):
+        return float(headers["retry-after-ms"]) / 1000
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return min(30.0, 0.5 * 2 ** attempt)
+
+
+@dataclass
+class ImageResult:
+    name: str
+    prompt: str
+    paths: list = field(default_factory=list)
+    partial_paths: list = field(default_factory=list)
+    response: Optional[dict] = None  # the response, with the image fields emptied
+    error: Optional[BaseException] = None
+    attempts: int = 0
+    bytes: int = 0
+    seconds: float = 0.0
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+@dataclass
+class PipelineStats:
+    started_at: float
+    finished_at: float = None
+    images: int = 0
+    failed: int = 0
+    bytes_written: int = 0
+    rate_limited: int = 0
+    limit: int = 0  # requests allowed in flight at the end
+
+    @property
+    def images_per_minute(self):
+        elapsed = (self.finished_at or time.monotonic()) - self.started_at
+        return self.images * 60 / max(elapsed, 1e-9)
+
+    def summary(self):
+        elapsed = (self.finished_at or time.monotonic()) - self.started_at
+        return (f"{self.images} images ({self.failed} failed) in {elapsed:.1f} s, {self.images_per_minute:.0f} images/min, "
+                f"{self.bytes_written / 1e6:.1f} MB written, {self.rate_limited} rate-limited requests, "
+                f"ending at {self.limit} in flight")
+
+
+class ImagePipeline:
+    def __init__(self, client=None, out_dir=".", concurrency=8, max_concurrency=None, model="gpt-4.1", tool=None,
+                 stream=False, partial_images=0, output_format="png", max_attempts=5):
+        self.client = (client or get_async_client()).with_options(max_retries=0)
+        self.out_dir = out_dir
+        self.model = model
+        self.tool = dict(tool or IMAGE_TOOL)
+        if partial_images:
+            self.tool["partial_images"] = partial_images
+        self.stream = stream
+        self.output_format = output_format
+        self.max_attempts = max_attempts
+        self.limit = AdaptiveLimit(concurrency, max_concurrency)
+        self.stats = PipelineStats(started_at=time.monotonic(), limit=concurrency)
+
+    async def generate(self, prompts, on_result=None):
+        # prompts are strings (saved as image_00000.png, ...) or (name, prompt) pairs; returns an
+        # ImageResult per prompt, in order. on_result(result) is called as each one finishes.
+        os.makedirs(self.out_dir, exist_ok=True)
+        self.stats.started_at = time.monotonic()
+        jobs = [(prompt if isinstance(prompt, tuple) else (f"image_{number:05d}", prompt))
+                for number, prompt in enumerate(prompts)]
+
+        async def run_one(name, prompt):
+            result = await self._generate(name, prompt)
+            if on_result is not None:
+                on_result(result)
+            return result
+
+        results = await asyncio.gather(*(run_one(name, prompt) for name, prompt in jobs))
+        self.stats.finished_at = time.monotonic()
+        self.stats.limit = self.limit.limit
+        return results
+
+    async def _generate(self, name, prompt):
+        import openai
+
+        result = ImageResult(name, prompt)
+        start = time.monotonic()
+        while True:
+            result.attempts += 1
+            await self.limit.acquire()
+            try:
+                await self._request(result)
+            except openai.RateLimitError as e:
+                self.stats.rate_limited += 1
+                await self.limit.release(_retry_after(e, result.attempts))
+                if result.attempts < self.max_attempts:
+                    continue
+                result.error = e
+            except Exception as e:
+                await self.limit.release()
+                result.error = e
+            else:
+                await self.limit.release()
+            break
+        result.seconds = time.monotonic() - start
+        if result.ok:
+            self.stats.images += len(result.paths)
+            self.stats.bytes_written += result.bytes
+        else:
+            self.stats.failed += 1
+        return result
+
+    async def _request(self, result):
+        result.paths, result.partial_paths = [], []
+
+        def open_sink(name, skeleton):
+            if name == "partial_image_b64":
+                paths = result.partial_paths
+                path = os.path.join(self.out_dir, f"{result.name}.partial{len(paths)}.{self.output_format}")
+            elif self.stream and b'"response.completed"' in skeleton:
+                return None  # the final event repeats images already written
+            else:
+                paths = result.paths
+                suffix = f"_{len(paths)}" if paths else ""
+                path = os.path.join(self.out_dir, f"{result.name}{suffix}.{self.output_format}")
+            paths.append(path)
+            return open(path, "wb")
+
+        splitter = Base64Splitter(open_sink)
+        try:
+            async with self.client.responses.with_streaming_response.create(
+                    model=self.model, input=result.prompt, tools=[self.tool], stream=self.stream) as response:
+                async for chunk in response.iter_bytes():
+                    splitter.feed(chunk)
+            skeleton = splitter.finish()
+            result.response = _parse_events(skeleton) if self.stream else json.loads(skeleton)
+        except BaseException:
+            splitter.close()
+            for path in result.paths + result.partial_paths:
+                if os.path.exists(path):
+                    os.remove(path)
+            raise
+        result.bytes = splitter.decoded
+
+
+def run(prompts, client=None, on_result=None, **options):
+    # Synchronous entry point: returns (results, stats). As in async_runner.run, without an explicit
+    # client each call gets its own AsyncOpenAI client for its own event loop.
+    async def main():
+        if client is not None:
+            pipeline = ImagePipeline(client, **options)
+            return await pipeline.generate(prompts, on_result), pipeline.stats
+        from openai import AsyncOpenAI
+
+        from .transport import build_async_http_client
+
+        async with AsyncOpenAI(http_client=build_async_http_client()) as own_client:
+            pipeline = ImagePipeline(own_client, **options)
+            return await pipeline.generate(prompts, on_result), pipeline.stats
+
+    return asyncio.run(main())
@@ -0,0 +1,159 @@
+# Editing an image over several turns without sending it back each time.
+# The simple way to edit a generated image is to attach it to the next request as a base64 input_image:
+# every turn then uploads the whole picture again, a third bigger than the PNG. The API already has it,
+# so an ImageEditSession only refers to it, per turn:
+#
+#   reference  the image to edit as {"type": "image_generation_call", "id": ...}; any earlier image can
+#              be edited this way, which branches the session from that turn
+#   chain      previous_response_id, so the model also sees the conversation so far (and edits the
+#              latest image in it); not possible for a branch
+#   inline     the image's pixels as a base64 input_image - the baseline, and the fallback when the
+#              server no longer has the image or response (store=False, or past retention): each turn's
+#              image is saved to disk, so it can always be sent again
+#
+#   session = ImageEditSession(out_dir="cats", name="cat")
+#   session.generate("Draw a gray tabby cat hugging an otter")
+#   session.edit("Now make it look realistic")
+#   session.edit("Give the otter an orange scarf", turn=0)   # branch from the first image
+#   session.stats   # bytes sent, what inline turns would have sent, fallbacks
+#
+# Images are decoded to disk from the response body as it arrives (see image_pipeline.Base64Splitter), and
+# an inline image is encoded into the request body as it is sent (see file_inputs.Base64Data).
+import json
+import os
+from dataclasses import dataclass
+
+from ._client import get_client
+
+REFERENCE = "reference"
+CHAIN = "chain"
+INLINE = "inline"
+
+
+@dataclass
+class ImageTurn:
+    number: int
+    prompt: str
+    path: str
+    response_id: str
+    image_id: str  # of the image_generation_call that made this turn's image
+    edited: int = None  # the turn whose image was edited
+    mode: str = None  # how the edited image was sent
+    bytes_sent: int = 0
+    inline_bytes: int = 0  # what the same request would have sent with the image inline
+
+
+def _gone(error):
+    # Whether an error says the referenced response or image is no longer stored.
+    return getattr(error, "status_code", None) in (400, 404) and "not found" in str(error).lower()
+
+
+class ImageEditSession:
+    def __init__(self, client=None, model="gpt-4.1", mode=REFERENCE, out_dir=".", name="image", tool=None,
+                 store=True, output_format="png"):
+        from .image_pipeline import IMAGE_TOOL
+
+        if mode not in (REFERENCE, CHAIN, INLINE):
+            raise ValueError(f"mode must be {REFERENCE!r}, {CHAIN!r} or {INLINE!r}, not {mode!r}")
+        self.client = client or get_client()
+        self.model = model
+        self.mode = mode
+        self.out_dir = out_dir
+        self.name = name
+        self.tool = dict(tool or IMAGE_TOOL, output_format=output_format)
+        self.store = store
+        self.output_format = output_format
+        self._data_url_prefix = f"data:image/{output_format};base64,"
+        self.turns = []
+        self.stats = {"turns": 0, "bytes_sent": 0, "inline_bytes": 0, "fallbacks": 0}
+
+    def generate(self, prompt):
+        # A new image, not an edit of an earlier one.
+        return self._turn(prompt, None, None, {"input": prompt})
+
+    def edit(self, prompt, turn=None):
+        # Edits the image of `turn` (a turn number or ImageTurn; the latest by default).
+        if not self.turns:
+            raise ValueError("nothing to edit yet; call generate() first")
+        base = self.turns[-1] if turn is None else turn if isinstance(turn, ImageTurn) else self.turns[turn]
+        mode = self.mode
+        if mode == CHAIN and base is not self.turns[-1]:
+            mode = REFERENCE  # previous_response_id can only continue from the latest turn
+        if not self.store:
+            mode = INLINE
+        if mode != INLINE:
+            import openai
+
+            try:
+                return self._turn(prompt, base, mode, self._reference(prompt, base, mode))
+            except (openai.BadRequestError, openai.NotFoundError) as e:
+                if not _gone(e):
+                    raise
+                self.stats["fallbacks"] += 1
+        return self._turn(prompt, base, INLINE, self._inline(prompt, base))
+
+    def _reference(self, prompt, base, mode):
+        if mode == CHAIN:
+            return {"input": prompt, "previous_response_id": base.response_id}
+        return {"input": [{"role": "user", "content": [{"type": "input_text", "text": prompt}]},
+                          {"type": "image_generation_call", "id": base.image_id}]}
+
+    def _inline(self, prompt, base):
+        from .file_inputs import Base64Data
+
+        data_url = Base64Data(base.path, prefix=self._data_url_prefix)
+        return {"input": [{"role": "user", "content": [{"type": "input_text", "text": prompt},
+                                                       {"type": "input_image", "image_url": data_url}]}]}
+
+    def _inline_size(self, prompt, base):
+        # Bytes the request would take with `base` inline; only the file's size is looked at.
+        from .file_inputs import StreamingJSONBody
+
+        return len(StreamingJSONBody(self._body(self._inline(prompt, base))))
+
+    def _body(self, params):
+        return dict(model=self.model, tools=[self.tool], store=self.store, **params)
+
+    def _turn(self, prompt, base, mode, params):
+        from .image_pipeline import Base64Splitter
+
+        number = len(self.turns)
+        os.makedirs(self.out_dir, exist_ok=True)
+        path = os.path.join(self.out_dir, f"{self.name}_{number:02d}.{self.output_format}")
+        written = []
+
+        def open_sink(field, skeleton):
+            if field != "result" or written:
+                return None
+            written.append(path)
+            return open(path, "wb")
+
+        if mode == INLINE:
+            from openai.types.responses import Response
+
+            from .file_inputs import post_streaming
+
+            request = post_streaming("/responses", self._body(params), Response, self.client)
+        else:
+            request = self.client.responses.with_streaming_response.create(**self._body(params))
+        splitter = Base64Splitter(open_sink)
+        try:
+            with request as response:
+                bytes_sent = int(response.http_request.headers["Content-Length"])
+                for chunk in response.iter_bytes():
+                    splitter.feed(chunk)
+            payload = json.loads(splitter.finish())
+        finally:
+            splitter.close()
+        image_id = next((item["id"] for item in payload["output"] if item["type"] == "image_generation_call"), None)
+        if not written or image_id is None:
+            raise RuntimeError(f"no image came back for {prompt!r}")
+
+        turn = ImageTurn(number, prompt, path, payload["id"], image_id, edited=None if base is None else base.number,
+                         mode=mode, bytes_sent=bytes_sent,
+                         inline_bytes=bytes_sent if base is None or mode == INLINE else self._inline_size(prompt, base))
+        self.turns.append(turn)
+        self.stats["turns"] += 1
+        self.stats["bytes_sent"] += turn.bytes_sent
+        self.stats["inline_bytes"] += turn.inline_bytes
+        return turn
@@ -0,0 +1,52 @@
+from ._client import get_client
+
+
+# ========================================================
+# ================== Image Generation ====================
+# ========================================================
+
+# The image generation tool allows you to generate images using GPT Image. 
+# This tool is available in all new models (gpt-4o, gpt-4.1, and reasoning models).
+# To use the image generation tool, you need to provide the image generation tool as part of the input.
+# Here's an example of how to use the image generation tool with the OpenAI API:
+# For many prompts at once, image_pipeline.ImagePipeline runs them concurrently within the rate limit and
+# decodes every image to disk as it is received.
+def generate_image(prompt="Generate an image of a cat", path="cat.png", client=None):
+    # Saves the first generated image to path and returns the response; returns None if no image came back.
+    from .image_pipeline import write_base64
+
+    client = client or get_client()
+    response = client.responses.create(
+        model="gpt-4.1",
+        input=prompt,
+        stream=False, # Set to True to stream the image generation process.
+        tools=[
+            {
+                "type": "image_generation",
+                "size": "1024x1024",
+                "quality": "auto",
+                "background": "auto",
+            }
+        ]
+    )
+    # Save the image to a fle
+    image_data = [
+        output.result for output in response.output
+        if output.type == "image_generation_call"
+    ]
+
+    if not image_data:
+        return None
+    image_base64 = image_data[0]
+    with open(path, "wb") as f:
+        write_base64(image_base64, f)  # decoded a slice at a time, not as one more full copy
+    return response
+
+# Image generation works best when you use terms like "draw" or "edit" in your prompt.
+# For example, if you want to combine images, instead of saying "combine" or "merge", you can say something like 
+# "edit the first image by adding this element from the second image".
+
+# You can iteratively edit images by referencing previous response or image IDs. This allows you to refine images 
+# across multiple turns in a conversation.
+# image_session.ImageEditSession does this, sending the image's ID (or the previous response's) each turn
+# instead of the image itself.
@@ -0,0 +1,176 @@
+# Adding a large corpus to a vector store.
+# file_search adds one file with vector_stores.files.create and then polls. ingest_files uploads the
+# corpus on a thread pool (`concurrency` uploads at a time, through an UploadCache so content that is
+# already uploaded isn't sent again) and, as soon as `batch_size` files are uploaded, adds them to the store
+# with one vector_stores.file_batches.create while the remaining uploads carry on:
+#
+#   progress = ingest_files(vector_store.id, paths, batch_size=500, on_progress=lambda p: print(p.summary()))
+#   failed = {path: progress.errors[path] for path, status in progress.statuses.items() if status == "failed"}
+#
+# Each batch is polled with its own backoff until it is no longer in_progress. Only its failed (and
+# cancelled) files are then listed, and those are added again in a later batch, up to max_retries times per
+# file; a failed upload is retried the same way. progress.statuses has every path's status ("pending",
+# "uploaded", "in_progress", "completed" or "failed"), and on_progress(progress) is called whenever it changes.
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+
+from ._client import get_client
+
+PURPOSE = "assistants"
+
+
+@dataclass
+class IngestProgress:
+    started_at: float
+    files: int = 0
+    bytes: int = 0
+    uploaded: int = 0
+    bytes_uploaded: int = 0  # of files uploaded or found in the upload cache
+    completed: int = 0
+    bytes_completed: int = 0
+    failed: int = 0
+    retries: int = 0
+    batches: int = 0
+    statuses: dict = field(default_factory=dict)  # path -> status
+    file_ids: dict = field(default_factory=dict)  # path -> file id
+    errors: dict = field(default_factory=dict)  # path -> last error, for failed paths
+
+    @property
+    def elapsed(self):
+        return time.monotonic() - self.started_at
+
+    @property
+    def files_per_second(self):
+        return self.completed / max(self.elapsed, 1e-9)
+
+    @property
+    def bytes_per_second(self):
+        return self.bytes_completed / max(self.elapsed, 1e-9)
+
+    @property
+    def done(self):
+        return self.completed + self.failed == self.files
+
+    def summary(self):
+        return (f"{self.completed}/{self.files} files ingested, {self.failed} failed, {self.uploaded} uploaded, "
+                f"{self.batches} batches, {self.retries} retries; {self.files_per_second:.1f} files/s, "
+                f"{self.bytes_per_second / 1e6:.2f} MB/s over {self.elapsed:.1f} s")
+
+
+def ingest_files(vector_store_id, paths, client=None, upload_cache=None, batch_size=500, concurrency=8,
+                 max_retries=2, poll_interval=1.0, max_interval=30.0, on_progress=None):
+    from .poller import Backoff
+    from .upload_cache import UploadCache
+
+    client = client or get_client()
+    upload_cache = upload_cache or UploadCache(client=client)
+    paths = list(dict.fromkeys(paths))
+    sizes = {path: os.path.getsize(path) for path in paths}
+    progress = IngestProgress(started_at=time.monotonic(), files=len(paths), bytes=sum(sizes.values()),
+                              statuses=dict.fromkeys(paths, "pending"))
+    alive = upload_cache.live_check(PURPOSE) if upload_cache.verify else None
+    owners = {}  # file id -> the paths with that content
+    attempts = dict.fromkeys(paths, 0)  # retries so far, per path
+    ready = []  # uploaded file ids not yet in a batch
+    batches = {}  # batch id -> (file ids, backoff, when to poll next)
+
+    def changed():
+        if on_progress is not None:
+            on_progress(progress)
+
+    def settle(path, status, error=None):
+        progress.statuses[path] = status
+        if status == "completed":
+            progress.completed += 1
+            progress.bytes_completed += sizes[path]
+        else:
+            progress.failed += 1
+            progress.errors[path] = error
+
+    def retry(path):
+        # Whether `path` gets another attempt.
+        if attempts[path] >= max_retries:
+            return False
+        attempts[path] += 1
+        progress.retries += 1
+        return True
+
+    def finish(batch, file_ids):
+        failed = {}
+        for status in ("failed", "cancelled"):
+            if batch.file_counts is None or getattr(batch.file_counts, status):
+                for item in client.vector_stores.file_batches.list_files(
+                        batch.id, vector_store_id=vector_store_id, filter=status, limit=100):
+                    failed[item.id] = item.last_error.message if item.last_error else status
+        for file_id in file_ids:
+            paths_again = []
+            for path in owners[file_id]:
+                if file_id not in failed:
+                    settle(path, "completed")
+                elif retry(path):
+                    progress.statuses[path] = "uploaded"
+                    paths_again.append(path)
+                else:
+                    settle(path, "failed", failed[file_id])
+            owners[file_id] = paths_again
+            if paths_again:
+                ready.append(file_id)
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="ingest") as pool:
+        upload = lambda path: upload_cache.upload(path, purpose=PURPOSE, alive=alive)  # noqa: E731
+        uploads = {pool.submit(upload, path): path for path in paths}
+        while uploads or ready or batches:
+            if ready and (len(ready) >= batch_size or not uploads):
+                file_ids, ready[:] = ready[:batch_size], ready[batch_size:]
+                batch = client.vector_stores.file_batches.create(vector_store_id, file_ids=file_ids)
+                backoff = Backoff(poll_interval, max_interval)
+                batches[batch.id] = (file_ids, backoff, time.monotonic() + backoff.next())
+                progress.batches += 1
+                for file_id in file_ids:
+                    for path in owners[file_id]:
+                        progress.statuses[path] = "in_progress"
+                changed()
+                continue
+
+            due = min((when for _, _, when in batches.values()), default=None)
+            timeout = None if due is None else max(0.0, due - time.monotonic())
+            if uploads:
+                done, _ = wait(uploads, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path = uploads.pop(future)
+                    try:
+                        file_id = future.result()
+                    except Exception as e:
+                        if retry(path):
+                            uploads[pool.submit(upload, path)] = path
+                        else:
+                            settle(path, "failed", str(e))
+                        continue
+                    progress.uploaded += 1
+                    progress.bytes_uploaded += sizes[path]
+                    progress.statuses[path] = "uploaded"
+                    progress.file_ids[path] = file_id
+                    if owners.get(file_id):
+                        owners[file_id].append(path)  # same content as a file that is already on its way
+                    else:
+                        owners[file_id] = [path]
+                        ready.append(file_id)
+                if done:
+                    changed()
+            elif timeout:
+                time.sleep(timeout)
+
+            now = time.monotonic()
+            for batch_id, (file_ids, backoff, when) in list(batches.items()):
+                if when > now:
+                    continue
+                batch = client.vector_stores.file_batches.retrieve(batch_id, vector_store_id=vector_store_id)
+                if batch.status == "in_progress":
+                    batches[batch_id] = (file_ids, backoff, time.monotonic() + backoff.next())
+                    continue
+                del batches[batch_id]
+                finish(batch, file_ids)
+                changed()
+    return progress
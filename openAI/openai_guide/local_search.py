@@ -0,0 +1,282 @@
+# File search without the round trip to a hosted vector store.
+# Every file_search tool call is searched on OpenAI's side. For latency-critical paths, LocalIndex keeps
+# the same kind of index on disk: documents (PDFs through pypdf, anything else read as UTF-8 text) are split
+# into overlapping chunks, embedded in batches, and the vectors stored in a .npy file that is memory-mapped
+# when the index is opened, so opening it costs nothing however big it is:
+#
+#   embedder = OpenAIEmbedder()                        # or HashEmbedder() for a deterministic stub
+#   index = LocalIndex.build("kb_index", paths, embedder, attributes={"blog.pdf": {"type": "blog"}})
+#   index = LocalIndex("kb_index")
+#   results = index.search(embedder.embed_query(question), max_num_results=2,
+#                          filters={"type": "eq", "key": "type", "value": "blog"})
+#   response = ask_with_local_context(index, embedder, question)
+#
+# Search is brute force (one matrix-vector product over every chunk) unless the index was built with
+# n_lists > 0: then the chunks are clustered with k-means (IVF) and only the n_probe nearest clusters are
+# scored, trading a little recall for speed on large corpora. Filters take the hosted shape: comparisons
+# ({"type": "eq" | "ne" | "gt" | "gte" | "lt" | "lte", "key": ..., "value": ...}) on the file attributes,
+# combined with {"type": "and" | "or", "filters": [...]}. Results look like file_search_call.results, best
+# first, at most max_num_results of them. numpy, like pypdf, is imported when first needed, so importing
+# this module stays cheap.
+import hashlib
+import json
+import os
+import re
+
+from ._client import get_client
+
+CHUNK_WORDS = 300
+OVERLAP_WORDS = 60
+_WORD = re.compile(r"\w+")
+
+
+def extract_text(path):
+    # The text of a document, one string per page for a PDF.
+    if path.lower().endswith(".pdf"):
+        from pypdf import PdfReader
+
+        return [page.extract_text() or "" for page in PdfReader(path).pages]
+    with open(path, encoding="utf-8", errors="replace") as f:
+        return [f.read()]
+
+
+def chunk_text(text, chunk_words=CHUNK_WORDS, overlap_words=OVERLAP_WORDS):
+    # Chunks of at most chunk_words words, each starting overlap_words before the end of the previous one.
+    words = text.split()
+    step = max(1, chunk_words - overlap_words)
+    return [" ".join(words[start:start + chunk_words])
+            for start in range(0, max(1, len(words) - overlap_words), step) if words[start:start + chunk_words]]
+
+
+class OpenAIEmbedder:
+    def __init__(self, client=None, model="text-embedding-3-small", dimensions=None, batch_size=256):
+        self.client = client or get_client()
+        self.model = model
+        self.dimensions = dimensions
+        self.batch_size = batch_size
+
+    def embed(self, texts):
+        # One embeddings request per batch_size texts; rows come back in input order.
+        import numpy as np
+
+        extra = {} if self.dimensions is None else {"dimensions": self.dimensions}
+        rows = []
+        for start in range(0, len(texts), self.batch_size):
+            response = self.client.embeddings.create(model=self.model, input=texts[start:start + self.batch_size], **extra)
+            rows.extend(item.embedding for item in sorted(response.data, key=lambda item: item.index))
+        return np.asarray(rows, dtype=np.float32)
+
+    def embed_query(self, text):
+        return self.embed([text])[0]
+
+
+class HashEmbedder:
+    # Deterministic stand-in for an embedding model: each lowercased word is hashed into one of `dimensions`
+    # buckets with a sign, so texts sharing words point the same way. No network, same vectors on every run.
+    def __init__(self, dimensions=256, batch_size=1024):
+        self.dimensions = dimensions
+        self.batch_size = batch_size
+        self._buckets = {}  # word -> (bucket, sign)
+
+    def embed(self, texts):
+        import numpy as np
+
+        vectors = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in _WORD.findall(text.lower()):
+                bucket = self._buckets.get(word)
+                if bucket is None:
+                    digest = int.from_bytes(hashlib.blake2b(word.encode(), digest_size=8).digest(), "little")
+                    bucket = self._buckets[word] = (digest % self.dimensions, 1.0 if digest >> 63 else -1.0)
+                vectors[row, bucket[0]] += bucket[1]
+        return vectors
+
+    def embed_query(self, text):
+        return self.embed([text])[0]
+
+
+def _normalize(vectors):
+    import numpy as np
+
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def _kmeans(vectors, n_lists, iterations=10, seed=0):
+    # Spherical k-means on (at most 256 per list of) the vectors; returns the unit-length centroids.
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    sample = vectors[rng.choice(len(vectors), size=min(len(vectors), n_lists * 256), replace=False)]
+    centroids = sample[rng.choice(len(sample), size=n_lists, replace=False)].copy()
+    for _ in range(iterations):
+        nearest = np.argmax(sample @ centroids.T, axis=1)
+        for i in range(n_lists):
+            members = sample[nearest == i]
+            if len(members):
+                centroids[i] = members.sum(axis=0)
+        centroids = _normalize(centroids)
+    return centroids
+
+
+def matches(filters, attributes):
+    # Whether a file's attributes pass a hosted-style filter (None passes everything).
+    if filters is None:
+        return True
+    kind = filters["type"]
+    if kind == "and":
+        return all(matches(f, attributes) for f in filters["filters"])
+    if kind == "or":
+        return any(matches(f, attributes) for f in filters["filters"])
+    if filters["key"] not in attributes:
+        return kind == "ne"
+    value, wanted = attributes[filters["key"]], filters["value"]
+    try:
+        return {"eq": value == wanted, "ne": value != wanted,
+                "gt": value > wanted, "gte": value >= wanted, "lt": value < wanted, "lte": value <= wanted}[kind]
+    except TypeError:
+        return False
+
+
+class LocalIndex:
+    # The files of an index directory: vectors.npy (chunks x dimensions, unit length, float32),
+    # chunk_files.npy (each chunk's file number), chunks.jsonl (each chunk's text), files.json (file id,
+    # filename and attributes per file) and, for IVF, centroids.npy, list_order.npy and list_offsets.npy.
+    def __init__(self, directory):
+        import numpy as np
+
+        self.directory = directory
+        self.vectors = np.load(os.path.join(directory, "vectors.npy"), mmap_mode="r")
+        self.chunk_files = np.load(os.path.join(directory, "chunk_files.npy"), mmap_mode="r")
+        with open(os.path.join(directory, "files.json")) as f:
+            self.files = json.load(f)
+        self._texts = None
+        self._masks = {}
+        self.centroids = self.list_order = self.list_offsets = None
+        if os.path.exists(os.path.join(directory, "centroids.npy")):
+            self.centroids = np.load(os.path.join(directory, "centroids.npy"))
+            self.list_order = np.load(os.path.join(directory, "list_order.npy"), mmap_mode="r")
+            self.list_offsets = np.load(os.path.join(directory, "list_offsets.npy"))
+
+    @classmethod
+    def build(cls, directory, paths, embedder, attributes=None, chunk_words=CHUNK_WORDS, overlap_words=OVERLAP_WORDS,
+              n_lists=0):
+        # Extracts, chunks and embeds `paths` into `directory`; attributes maps a path (or its file
+        # name) to that file's attributes for filtering.
+        import numpy as np
+
+        os.makedirs(directory, exist_ok=True)
+        attributes = attributes or {}
+        files, texts, chunk_files = [], [], []
+        for number, path in enumerate(paths):
+            name = os.path.basename(path)
+            files.append({"file_id": f"local-{number}", "filename": name,
+                          "attributes": attributes.get(path, attributes.get(name, {}))})
+            for page in extract_text(path):
+                for chunk in chunk_text(page, chunk_words, overlap_words):
+                    texts.append(chunk)
+                    chunk_files.append(number)
+
+        if not texts:
+            raise ValueError("no text found in any of the files")
+        # The first batch tells the embedding size; every batch goes straight into the memory-mapped file.
+        batch_size = getattr(embedder, "batch_size", 256)
+        vectors = None
+        for start in range(0, len(texts), batch_size):
+            batch = _normalize(embedder.embed(texts[start:start + batch_size]))
+            if vectors is None:
+                vectors = np.lib.format.open_memmap(os.path.join(directory, "vectors.npy"), mode="w+",
+                                                    dtype=np.float32, shape=(len(texts), batch.shape[1]))
+            vectors[start:start + len(batch)] = batch
+        vectors.flush()
+        np.save(os.path.join(directory, "chunk_files.npy"), np.asarray(chunk_files, dtype=np.int32))
+        with open(os.path.join(directory, "chunks.jsonl"), "w") as f:
+            for text in texts:
+                f.write(json.dumps(text) + "\n")
+        with open(os.path.join(directory, "files.json"), "w") as f:
+            json.dump(files, f)
+        if n_lists:
+            centroids = _kmeans(vectors, min(n_lists, len(texts)))
+            nearest = np.concatenate([np.argmax(vectors[start:start + 65536] @ centroids.T, axis=1)
+                                      for start in range(0, len(texts), 65536)])
+            order = np.argsort(nearest, kind="stable").astype(np.int64)
+            offsets = np.searchsorted(nearest[order], np.arange(len(centroids) + 1))
+            np.save(os.path.join(directory, "centroids.npy"), centroids)
+            np.save(os.path.join(directory, "list_order.npy"), order)
+            np.save(os.path.join(directory, "list_offsets.npy"), offsets)
+        else:
+            for name in ("centroids.npy", "list_order.npy", "list_offsets.npy"):
+                if os.path.exists(os.path.join(directory, name)):
+                    os.remove(os.path.join(directory, name))
+        del vectors
+        return cls(directory)
+
+    def __len__(self):
+        return len(self.vectors)
+
+    def text(self, chunk):
+        if self._texts is None:
+            with open(os.path.join(self.directory, "chunks.jsonl")) as f:
+                self._texts = [json.loads(line) for line in f]
+        return self._texts[chunk]
+
+    def allowed(self, filters):
+        # Mask of the chunks whose file passes `filters`, remembered per filter.
+        import numpy as np
+
+        key = json.dumps(filters, sort_keys=True)
+        mask = self._masks.get(key)
+        if mask is None:
+            files = np.array([matches(filters, file["attributes"]) for file in self.files], dtype=bool)
+            mask = self._masks[key] = files[self.chunk_files]
+            if len(self._masks) > 64:
+                self._masks.pop(next(iter(self._masks)))
+        return mask
+
+    def search(self, query_vector, max_num_results=10, filters=None, n_probe=8, score_threshold=0.0):
+        # The best chunks for a query embedding, as file_search_call.results-shaped dicts.
+        import numpy as np
+
+        query = _normalize(np.asarray(query_vector, dtype=np.float32))
+        allowed = None if filters is None else self.allowed(filters)
+        candidates = None  # chunk numbers to score; None scores them all
+        if self.centroids is not None:
+            lists = np.argsort(self.centroids @ query)[::-1][:n_probe]
+            candidates = np.sort(np.concatenate([self.list_order[self.list_offsets[i]:self.list_offsets[i + 1]]
+                                                 for i in lists]))
+            if allowed is not None:
+                candidates = candidates[allowed[candidates]]
+            if len(candidates) < max_num_results:
+                candidates = None  # too few (matching) chunks in the probed lists: search them all
+        if candidates is None and allowed is not None:
+            candidates = np.flatnonzero(allowed)
+        scores = np.asarray((self.vectors if candidates is None else self.vectors[candidates]) @ query)
+        k = min(max_num_results, len(scores))
+        if k == 0:
+            return []
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best])]
+        results = []
+        for position in best:
+            score = float(scores[position])
+            if score < score_threshold:
+                break
+            chunk = int(position if candidates is None else candidates[position])
+            file = self.files[self.chunk_files[chunk]]
+            results.append({"file_id": file["file_id"], "filename": file["filename"], "score": score,
+                            "attributes": file["attributes"], "text": self.text(chunk)})
+        return results
+
+
+# Answers `question` with the best local chunks given to the model as context, in place of the
+# file_search tool (see file_search.search_files).
+def ask_with_local_context(index, embedder, question="What is the main idea of the document?", max_num_results=2,
+                           filters=None, client=None):
+    client = client or get_client()
+    results = index.search(embedder.embed_query(question), max_num_results=max_num_results, filters=filters)
+    context = "\n\n".join(f"[{result['filename']}]\n{result['text']}" for result in results)
+    return client.responses.create(
+        model="gpt-4.1",
+        instructions="Answer using the excerpts from the user's files below where they are relevant.\n\n" + context,
+        input=question,
+    )
@@ -0,0 +1,140 @@
+from ._client import get_client
+
+
+# ========================================================
+# ================== Remote MCP ==========================
+# ========================================================
+
+# Model Context Protocol (MCP) is an open protocol that standardizes how applications provide tools and context to LLMs. 
+# The MCP tool in the Responses API allows developers to give the model access to tools hosted on Remote MCP servers. 
+# These are MCP servers maintained by developers and organizations across the internet that expose these tools to MCP clients, 
+# like the Responses API.
+
+# The MCP tool works only in the Responses API, and is available across all new models (gpt-4o, gpt-4.1, and reasoning models). 
+# When you're using the MCP tool, you only pay for tokens used when importing tool definitions 
+# or making tool calls—there are no additional fees involved.
+
+MCP_SPEC_QUESTION = "What transport protocols are supported in the 2025-03-26 version of the MCP spec?"
+
+
+# Step 1: Getting the list of tools from the MCP server: 
+# The first thing the Responses API does when you attach a remote MCP server to the tools array, is attempt to get a 
+# list of tools from the server. The Responses API supports remote MCP servers that support 
+# either the Streamable HTTP or the HTTP/SSE transport protocol.
+def ask_deepwiki(question=MCP_SPEC_QUESTION, client=None):
+    client = client or get_client()
+    return client.responses.create(
+        model="gpt-4.1",
+        tools=[
+            {
+                "type": "mcp",
+                "server_label": "deepwiki",
+                "server_url": "https://mcp.deepwiki.com/mcp",
+                # As long as the mcp_list_tools item is present in the context of the model, we will not attempt to pull a 
+                # refreshed list of tools from an MCP server. We recommend you keep this item in the model's context 
+                # as part of every conversation or workflow execu
+                # (mcp_cache.McpSession does that across separate requests.)
+                "allowed_tools": ["ask_question"], # This is a list of tools we want to import from the MCP server.
+                "require_approval": "never",
+            }
+        ],
+        input=question
+    )
+
+
+
+# Step 2: Calling the tools to generate a response
+# Once the model has access to these tool definitions, it may choose to call them depending on what's in the model's context. 
+# When the model decides to call an MCP tool, we make an request to the remote MCP server to call the tool, take it's output 
+# and put that into the model's context. This creates an mcp_call item which looks like this:
+# {
+#  "id": "mcp_682d437d90a88191bf88cd03aae0c3e503937d5f622d7a90",
+#  "type": "mcp_call",
+#  "approval_request_id": null,
+#  "arguments": "{\"repoName\":\"modelcontextprotocol/modelcontextprotocol\",\"question\":\"What transport protocols does the 2025-03-26 version of the MCP spec support?\"}",
+#  "error": null,
+#  "name": "ask_question",
+#  "output": "The 2025-03-26 version of the Model Context Protocol (MCP) specification supports two standard transport mechanisms: `stdio` and `Streamable HTTP` ...",
+#  "server_label": "deepwiki"
+# }
+
+# By default, OpenAI will request your approval before any data is shared with a remote MCP server.
+# The model may also choose to call the tool multiple times, and the tool may also return an error.
+
+# A request for an approval to make an MCP tool call creates a mcp_approval_request item in the Response's output that looks like this:
+# {
+#  "id": "mcpr_682d498e3bd4819196a0ce1664f8e77b04ad1e533afccbfa",
+#  "type": "mcp_approval_request",
+#  "arguments": "{\"repoName\":\"modelcontextprotocol/modelcontextprotocol\",\"question\":\"What transport protocols are supported in the 2025-03-26 version of the MCP spec?\"}",
+#  "name": "ask_question",
+#  "server_label": "deepwiki"
+# }
+
+
+# You can then respond to this by creating a new Response object and appending an mcp_approval_response item to it.
+# (mcp_approval.ApprovalPolicy answers every pending request at once, by rules, until none are left.)
+def ask_deepwiki_with_approval(question=MCP_SPEC_QUESTION, client=None):
+    # Returns the follow-up response, or None when the model did not ask for approval.
+    client = client or get_client()
+    response = client.responses.create(
+        model="gpt-4.1",
+        tools=[{
+            "type": "mcp",
+            "server_label": "deepwiki",
+            "server_url": "https://mcp.deepwiki.com/mcp",
+        }],
+        input=question
+    )
+
+    # Extract the approval request ID from the response
+    approval_request_id = None
+    for item in response.output:
+        if hasattr(item, 'type') and item.type == "mcp_approval_request":
+            approval_request_id = item.id
+            break
+
+    if not approval_request_id:
+        return None
+
+    # Now create the approval response with the correct ID
+    return client.responses.create(
+        model="gpt-4.1",
+        tools=[{
+            "type": "mcp",
+            "server_label": "deepwiki",
+            "server_url": "https://mcp.deepwiki.com/mcp",
+        }],
+        previous_response_id=response.id,
+        input=[{
+            "type": "mcp_approval_response",
+            "approve": True,
+            "approval_request_id": approval_request_id
+        }],
+    )
+
+
+# The MCP tool in the Responses API gives you the ability to flexibly specify headers that should be included 
+# in any request made to a remote MCP server. This is useful for things like authentication, or for passing 
+# information about the request to the MCP server.
+# To do this, you can add a headers property to the MCP tool definition.
+# The headers property is an object with the following properties:
+# - Authorization: The authorization header to include in the request.
+# - Content-Type: The content type of the request.
+# - Other headers: Any other headers you want to include in the request.
+def ask_stripe(question="What is the balance of my account?", api_key="sk_test_1234567890", client=None):
+    client = client or get_client()
+    return client.responses.create(
+        model="gpt-4.1",
+        tools=[
+            {
+                "type": "mcp",
+                "server_label": "stripe",
+                "server_url": "https://mcp.stripe.com",
+                "headers": {
+                    "Authorization": f"Bearer {api_key}",
+                    "Content-Type": "application/json"
+                }
+            }
+        ],
+        input=question
+    )
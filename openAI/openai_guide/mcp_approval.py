@@ -0,0 +1,122 @@
+# Answering MCP approval requests by policy, all of them at once.
+# mcp.ask_deepwiki_with_approval approves the first mcp_approval_request and sends it back on its own;
+# when the model wants several tool calls, that is a round trip per approval. An ApprovalPolicy decides
+# every pending request from its rules and answers them together in one follow-up request, then does the
+# same for whatever that response asks for, until a response asks for nothing:
+#
+#   policy = (ApprovalPolicy()
+#             .allow("deepwiki", "ask_question", repoName="modelcontextprotocol/*")
+#             .allow("deepwiki", "read_wiki_*")
+#             .deny("stripe", "create_*", reason="read-only session"))
+#   response = ask_with_policy(MCP_SPEC_QUESTION, policy, tools=[deepwiki_tool, stripe_tool])
+#   policy.stats   # {"approved": ..., "denied": ..., "follow_ups": ...}
+#
+# Rules match a server_label and tool name with shell-style patterns ("*", "read_*"), and optionally
+# argument values: a pattern string matched against the value as text, a compiled regex (fullmatch),
+# or a callable(value) -> bool. The first matching rule decides; with none, `default` does (deny). Every
+# decision is kept in policy.decisions. McpSession(policy=...) answers approvals the same way.
+import fnmatch
+import json
+from dataclasses import dataclass, field
+
+from ._client import get_client
+
+
+@dataclass
+class ApprovalRule:
+    server_label: str = "*"
+    tool: str = "*"
+    arguments: dict = field(default_factory=dict)  # argument name -> pattern, regex or callable
+    approve: bool = True
+    reason: str = None
+
+    def matches(self, server_label, tool, arguments):
+        if not (fnmatch.fnmatchcase(server_label, self.server_label) and fnmatch.fnmatchcase(tool, self.tool)):
+            return False
+        for name, pattern in self.arguments.items():
+            if arguments is None or name not in arguments:
+                return False
+            value = arguments[name]
+            text = value if isinstance(value, str) else json.dumps(value)
+            if hasattr(pattern, "fullmatch"):
+                ok = pattern.fullmatch(text)
+            elif callable(pattern):
+                ok = pattern(value)
+            else:
+                ok = fnmatch.fnmatchcase(text, pattern)
+            if not ok:
+                return False
+        return True
+
+
+@dataclass
+class ApprovalDecision:
+    approval_request_id: str
+    server_label: str
+    tool: str
+    arguments: str
+    approve: bool
+    reason: str = None
+
+
+class ApprovalPolicy:
+    def __init__(self, rules=(), default=False):
+        self.rules = list(rules)
+        self.default = default
+        self.decisions = []
+        self.stats = {"approved": 0, "denied": 0, "follow_ups": 0}
+
+    def allow(self, server_label="*", tool="*", **arguments):
+        self.rules.append(ApprovalRule(server_label, tool, arguments, approve=True))
+        return self
+
+    def deny(self, server_label="*", tool="*", reason=None, **arguments):
+        self.rules.append(ApprovalRule(server_label, tool, arguments, approve=False, reason=reason))
+        return self
+
+    def decide(self, request):
+        # An ApprovalDecision for an mcp_approval_request item.
+        try:
+            arguments = json.loads(request.arguments)
+        except (TypeError, ValueError):
+            arguments = None  # no argument pattern can match
+        rule = next((rule for rule in self.rules if rule.matches(request.server_label, request.name, arguments)), None)
+        approve = self.default if rule is None else rule.approve
+        reason = None if rule is None else rule.reason
+        decision = ApprovalDecision(request.id, request.server_label, request.name, request.arguments, approve, reason)
+        self.decisions.append(decision)
+        self.stats["approved" if approve else "denied"] += 1
+        return decision
+
+    def answers(self, response):
+        # mcp_approval_response items for every approval request in a response.
+        items = []
+        for request in response.output:
+            if request.type != "mcp_approval_request":
+                continue
+            decision = self.decide(request)
+            item = {"type": "mcp_approval_response", "approval_request_id": request.id, "approve": decision.approve}
+            if decision.reason:
+                item["reason"] = decision.reason
+            items.append(item)
+        return items
+
+    def resolve(self, client, response, max_follow_ups=10, **request):
+        # Answers the response's approval requests in one follow-up request (same model, tools and other
+        # `request` parameters, chained with previous_response_id), and repeats for the follow-up's
+        # response, until one asks for no approvals. Returns that response.
+        for _ in range(max_follow_ups):
+            items = self.answers(response)
+            if not items:
+                return response
+            response = client.responses.create(previous_response_id=response.id, input=items, **request)
+            self.stats["follow_ups"] += 1
+        if any(item.type == "mcp_approval_request" for item in response.output):
+            raise RuntimeError(f"still asking for approvals after {max_follow_ups} follow-up requests")
+        return response
+
+
+def ask_with_policy(question, policy, tools, client=None, model="gpt-4.1", max_follow_ups=10, **params):
+    client = client or get_client()
+    response = client.responses.create(model=model, tools=tools, input=question, **params)
+    return policy.resolve(client, response, max_follow_ups, model=model, tools=tools, **params)
@@ -0,0 +1,131 @@
+# Reusing MCP tool lists across requests.
+# A request with a remote MCP server in its tools first makes the Responses API list that server's tools
+# - an extra round trip to the MCP server before the model can start - unless an mcp_list_tools item for
+# the server is already in the model's context (see mcp.ask_deepwiki). Separate requests have no shared
+# context, so every one of them lists the tools again. McpSession keeps the mcp_list_tools item each server
+# returned and puts it back at the start of the next request's input:
+#
+#   session = McpSession(tools=[{"type": "mcp", "server_label": "deepwiki", "server_url": "https://mcp.deepwiki.com/mcp",
+#                                "allowed_tools": ["ask_question"], "require_approval": "never"}])
+#   for question in questions:
+#       print(session.ask(question).output_text)
+#   session.stats   # {"requests": ..., "list_fetches": ..., "fetches_avoided": ..., "schema_refreshes": ...}
+#
+# What this saves is the list fetch and its latency, not tokens: the tool definitions are billed as input
+# either way, and the replayed mcp_list_tools item makes each request's input somewhat larger (in the
+# mcp_cache benchmark, 136 instead of 108 input tokens per request).
+#
+# Lists are kept in an McpToolListCache, per server_label + server_url + allowed_tools, for `ttl`
+# seconds; several sessions (or threads) can share one. A list can go stale before that: when an MCP
+# call made from a reused list fails with an MCP protocol error saying the tool or its parameters are
+# unknown (JSON-RPC -32601/-32602), the list is dropped and the request sent again, so the server's
+# current tools are listed. With an mcp_approval.ApprovalPolicy as `policy`, the approval requests in a
+# response are answered by it before ask() returns.
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from ._client import get_client
+
+_SCHEMA_ERRORS = (-32601, -32602)  # JSON-RPC "method not found" and "invalid params"
+
+
+def tool_key(tool):
+    # What a tool list depends on: the server, and which of its tools the request allows.
+    allowed = tool.get("allowed_tools")
+    if isinstance(allowed, list):
+        allowed = sorted(allowed)
+    return tool["server_label"], tool.get("server_url"), json.dumps(allowed, sort_keys=True)
+
+
+class McpToolListCache:
+    def __init__(self, ttl=3600.0, max_entries=256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "invalidated": 0}
+        self._entries = OrderedDict()  # tool_key -> (expires_at, mcp_list_tools item)
+        self._lock = threading.Lock()
+
+    def get(self, tool):
+        key = tool_key(tool)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._entries[key]
+                self.stats["expired"] += 1
+                entry = None
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return entry[1]
+
+    def put(self, tool, item):
+        with self._lock:
+            self._entries[tool_key(tool)] = (time.monotonic() + self.ttl, item)
+            self._entries.move_to_end(tool_key(tool))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, tool):
+        with self._lock:
+            if self._entries.pop(tool_key(tool), None) is not None:
+                self.stats["invalidated"] += 1
+
+
+def _schema_error(call):
+    error = call.error
+    return error is not None and getattr(error, "type", None) == "mcp_protocol_error" and error.code in _SCHEMA_ERRORS
+
+
+class McpSession:
+    def __init__(self, client=None, model="gpt-4.1", tools=(), cache=None, policy=None, **params):
+        # params (instructions, store, ...) go into every request.
+        self.client = client or get_client()
+        self.model = model
+        self.tools = list(tools)
+        self.cache = cache if cache is not None else McpToolListCache()
+        self.policy = policy
+        self.params = params
+        self.stats = {"requests": 0, "list_fetches": 0, "fetches_avoided": 0, "schema_refreshes": 0}
+
+    def ask(self, question, **params):
+        # question is a string or a list of input items.
+        items = [{"role": "user", "content": question}] if isinstance(question, str) else list(question)
+        response, reused = self._create(items, params)
+        stale = {call.server_label for call in response.output if call.type == "mcp_call" and _schema_error(call)}
+        stale = [tool for tool in reused if tool["server_label"] in stale]
+        if stale:
+            for tool in stale:
+                self.cache.invalidate(tool)
+            self.stats["schema_refreshes"] += 1
+            response, _ = self._create(items, params)
+        if self.policy is not None:
+            response = self.policy.resolve(self.client, response, model=self.model, tools=self.tools,
+                                           **{**self.params, **params})
+        return response
+
+    def _mcp_tools(self):
+        return [tool for tool in self.tools if tool.get("type") == "mcp"]
+
+    def _create(self, items, params):
+        # (response, the tools whose cached list was sent with it)
+        lists, reused = [], []
+        for tool in self._mcp_tools():
+            item = self.cache.get(tool)
+            if item is not None:
+                lists.append(item)
+                reused.append(tool)
+        response = self.client.responses.create(model=self.model, tools=self.tools, input=lists + items,
+                                                **{**self.params, **params})
+        self.stats["requests"] += 1
+        self.stats["fetches_avoided"] += len(lists)
+        by_label = {tool["server_label"]: tool for tool in self._mcp_tools()}
+        for item in response.output:
+            if item.type == "mcp_list_tools" and item.server_label in by_label:
+                self.stats["list_fetches"] += 1
+                if not item.error:
+                    self.cache.put(by_label[item.server_label], item.to_dict(exclude_none=True))
+        return response, reused
@@ -0,0 +1,1137 @@
+# A tiny local stand-in for the OpenAI HTTP API, used by the benchmarks so they can run offline and
+# without spending money. It speaks just enough of the wire format for the SDK to parse its replies,
+# can inject latency into every request, and records every request it served.
+#
+#   with MockOpenAIServer(latency=0.2) as server:
+#       client = server.client()
+#       print(client.responses.create(model="gpt-4.1", input="hi").output_text)
+#
+# Usage reports simulate automatic prompt caching: a request whose first 1024+ tokens (counted as
+# 4 bytes each, in 128-token steps) match an earlier request reports them as cached_tokens.
+#
+# Besides /responses and /chat/completions it keeps uploaded files in memory (/files) and runs batches
+# (/batches): a batch completes `batch_delay` seconds after creation, answering every request line
+# with the same reply function used for direct calls.
+#
+# Extra endpoints are added with server.route(method, path_regex, handler). A handler receives a
+# MockRequest and returns (status, payload) - or (status, payload, headers) - where payload is a dict/list
+# (sent as JSON), bytes, or a generator of dicts (sent as server-sent events).
+#
+# Background responses (background=True) generate their streaming events on a timeline, token_interval
+# seconds apart - or spread over background_duration seconds (a number or callable(body)) when that is
+# set: retrieving one reports in_progress until the last event is due, and
+# GET /responses/{id}?stream=true&starting_after=N replays the timeline after event N. Set
+# drop_stream_after to cut every streaming connection after that many events.
+#
+# A response request with the image_generation tool gets an image_generation_call whose result is
+# image_data(prompt) base64-encoded (image_size bytes), after image_time seconds; streamed, it also sends
+# the tool's partial_images as partial_image events. A request that edits an image - one referenced as
+# {"type": "image_generation_call", "id": ...}, sent inline as an input_image, or else the latest one in
+# the previous_response_id chain - gets image_data(<hash of that image> + prompt) instead. With image_rate = (images per second, burst) set,
+# image requests beyond that rate are answered 429 with retry-after-ms, as the images-per-minute limit is.
+#
+# With the computer_use_preview tool, each response in a previous_response_id chain is the next action of
+# computer_script (a list of actions in display_width x display_height coordinates of script_display,
+# scaled to the display the tool declares) as a computer_call, and a final message once the script has
+# run out. Every screenshot sent back in a computer_call_output is checked to be a PNG or WebP data URL
+# and recorded in server.screenshots as (format, bytes).
+#
+# Remote MCP servers are faked by server.mcp_servers, {server_url: {tool name: (definition, handler)}}
+# with definitions shaped like an mcp_list_tools entry (description, input_schema) and handler(arguments)
+# returning the call's output text. A request with an mcp tool first lists that server's tools (allowed_tools
+# only), taking mcp_list_time seconds and counted in mcp_list_fetches[server_label] - unless an
+# mcp_list_tools item for the server_label is already in its input or previous_response_id chain. The
+# listed definitions are billed as input tokens. Then the model makes the calls mcp_plan(body, {server_label:
+# tools in context}, round) returns as (server_label, name, arguments) - by default, in round 0 only, the
+# first tool of every server with arguments sampled from its schema - round after round, until a round
+# returns no calls or has calls that need approval. A call made from a stale list (the tool is gone, or its
+# input_schema has changed on the server) fails with an mcp_protocol_error, as an MCP server would.
+# Calls that the tool's require_approval ("always" unless set) holds back become mcp_approval_requests, and
+# the response ends there. The next request in the chain answers them with mcp_approval_response items:
+# approved calls are made, denied ones dropped, and any left unanswered are requested again (with new ids)
+# before the plan moves on to its next round.
+#
+# Vector stores (/vector_stores) hold references to uploaded files; a file added to a store stays
+# in_progress for vector_store_file_delay seconds (a number or callable(file_id)) and is then completed -
+# or failed, if vector_store_file_fails(file_id) returned true when it was added. Files can also be added
+# in batches (/vector_stores/{id}/file_batches). Listing a store's or a batch's files pages through them
+# like the real API (limit, after, order, filter).
+#
+# Plain downloads are served from server.downloads ({path: bytes}, e.g. "/downloads/report.pdf" at
+# server.url(path)) with an ETag and Range support, at most download_rate bytes per second when set; set
+# drop_download_after to cut every download connection after that many body bytes. upload_rate likewise
+# caps how fast request bodies are read.
+import base64
+import email.parser
+import hashlib
+import itertools
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    # The default listen backlog of 5 drops connections when many async clients connect at once.
+    request_queue_size = 256
+
+
+class DropConnection(Exception):
+    # Raised by an event generator to cut the connection mid-stream, without finishing the response.
+    pass
+
+
+class Download:
+    # A handler payload for a raw body with extra headers; `send` bytes of it are sent (at `rate` bytes
+    # per second, if given) before the connection is cut - all of it by default.
+    def __init__(self, data, headers=None, send=None, rate=None):
+        self.data = data
+        self.headers = headers or {}
+        self.send = len(data) if send is None else send
+        self.rate = rate
+
+
+class MockRequest:
+    def __init__(self, method, path, query, headers, raw, match):
+        self.method = method
+        self.path = path
+        self.query = query
+        self.headers = headers
+        self.raw = raw
+        self.match = match
+
+    @property
+    def json(self):
+        return json.loads(self.raw) if self.raw else {}
+
+    def form(self):
+        # Parses a multipart/form-data body into {name: value}; file parts become (filename, bytes).
+        boundary = re.search(r'boundary="?([^";]+)"?', self.headers["Content-Type"]).group(1).encode()
+        fields = {}
+        for part in self.raw.split(b"--" + boundary)[1:-1]:
+            head, _, data = part[2:-2].partition(b"\r\n\r\n")  # strip the CRLFs around each part
+            headers = email.parser.BytesParser().parsebytes(head + b"\r\n\r\n", headersonly=True)
+            name = headers.get_param("name", header="content-disposition")
+            filename = headers.get_filename()
+            fields[name] = (filename, data) if filename is not None else data.decode()
+        return fields
+
+
+def response_payload(id, model, text, **extra):
+    payload = {
+        "id": id,
+        "object": "response",
+        "created_at": int(time.time()),
+        "model": model,
+        "status": "completed",
+        "output": [{
+            "id": f"msg_{id}",
+            "type": "message",
+            "role": "assistant",
+            "status": "completed",
+            "content": [{"type": "output_text", "text": text, "annotations": []}],
+        }],
+        "parallel_tool_calls": True,
+        "tool_choice": "auto",
+        "tools": [],
+        "usage": {
+            "input_tokens": 0,
+            "input_tokens_details": {"cached_tokens": 0},
+            "output_tokens": len(text.split()),
+            "output_tokens_details": {"reasoning_tokens": 0},
+            "total_tokens": len(text.split()),
+        },
+    }
+    payload.update(extra)
+    return payload
+
+
+def chat_completion_payload(id, model, text, tool_calls=None):
+    message = {"role": "assistant", "content": text}
+    if tool_calls:
+        message["content"] = None
+        message["tool_calls"] = tool_calls
+    return {
+        "id": id,
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "message": message,
+            "finish_reason": "tool_calls" if tool_calls else "stop",
+        }],
+        "usage": {"prompt_tokens": 0, "completion_tokens": len((text or "").split()), "total_tokens": 0},
+    }
+
+
+# Prompt caching: minimum cacheable prefix and granularity, in bytes (4 bytes ~ 1 token).
+CACHE_MIN_BYTES = 1024 * 4
+CACHE_STEP_BYTES = 128 * 4
+
+
+def mock_image(prompt, size):
+    # `size` bytes that start like a PNG and depend only on the prompt.
+    seed = hashlib.sha256(prompt.encode()).digest()
+    return (b"\x89PNG\r\n\x1a\n" + seed * (size // len(seed) + 1))[:size]
+
+
+def file_payload(id, filename, size, purpose, created_at):
+    return {
+        "id": id,
+        "object": "file",
+        "bytes": size,
+        "created_at": created_at,
+        "filename": filename,
+        "purpose": purpose,
+        "status": "processed",
+    }
+
+
+def sample_from_schema(schema, defs=None, depth=0):
+    # A minimal instance of a JSON schema, used to answer structured-output requests. Arrays get one
+    # element (none once nested deeper than two levels, which also ends recursive schemas).
+    defs = schema.get("$defs", defs or {})
+    if "$ref" in schema:
+        return sample_from_schema(defs[schema["$ref"].split("/")[-1]], defs, depth)
+    if "anyOf" in schema:
+        options = [option for option in schema["anyOf"] if option.get("type") != "null"]
+        return sample_from_schema(options[0], defs, depth) if options else None
+    if "enum" in schema:
+        return schema["enum"][0]
+    kind = schema.get("type")
+    if kind == "object":
+        return {name: sample_from_schema(prop, defs, depth + 1) for name, prop in schema.get("properties", {}).items()}
+    if kind == "array":
+        return [] if depth > 2 else [sample_from_schema(schema.get("items", {}), defs, depth + 1)]
+    return {"string": "mock", "integer": 0, "number": 0.0, "boolean": False}.get(kind)
+
+
+def _structured_reply(body):
+    # JSON text matching the request's json_schema response_format, or None for free-form requests.
+    response_format = body.get("response_format") or body.get("text", {}).get("format") or {}
+    if response_format.get("type") != "json_schema":
+        return None
+    schema = response_format.get("json_schema", response_format).get("schema", {})
+    return json.dumps(sample_from_schema(schema))
+
+
+def _first_mcp_tool(body, tools, round):
+    # The default mcp_plan: call the first tool of every MCP server, with arguments sampled from its schema.
+    if round:
+        return []
+    return [(label, listed[0]["name"], sample_from_schema(listed[0]["input_schema"]))
+            for label, listed in tools.items() if listed]
+
+
+def _needs_approval(tool, name):
+    setting = tool.get("require_approval") or "always"
+    if isinstance(setting, str):
+        return setting == "always"
+    if "never" in setting:
+        return name not in (setting["never"].get("tool_names") or [])
+    return name in (setting.get("always", {}).get("tool_names") or [])
+
+
+def _last_user_text(body):
+    # Best-effort extraction of the newest user text from a responses/chat request body.
+    items = body.get("input", body.get("messages"))
+    if isinstance(items, str):
+        return items
+    for item in reversed(items or []):
+        if isinstance(item, dict) and item.get("role") == "user":
+            content = item.get("content")
+            if isinstance(content, str):
+                return content
+            for part in content or []:
+                if part.get("type") in ("input_text", "text"):
+                    return part["text"]
+    return ""
+
+
+class MockOpenAIServer:
+    def __init__(self, latency=0.0, host="127.0.0.1", port=0, batch_delay=0.2):
+        # latency is either a number of seconds or a callable(MockRequest) -> seconds.
+        self.latency = latency
+        self.batch_delay = batch_delay
+        self.stream_chunk_size = 8
+        self.token_interval = 0.0  # seconds between streamed events
+        self.drop_stream_after = None
+        self.drop_download_after = None
+        self.download_rate = None
+        self.upload_rate = None
+        self.downloads = {}
+        self.files = {}
+        self.batches = {}
+        self.responses = {}
+        self.background = {}  # background response id -> (started, events, seconds between events)
+        self.background_duration = None
+        self.vector_store_file_delay = 0.0
+        self.vector_store_file_fails = None
+        self.vector_stores = {}  # vector store id -> (vector store, {file id: (vector store file, ready at, fails)})
+        self.file_batches = {}  # batch id -> (batch, [file ids])
+        self.image_size = 256 * 1024
+        self.image_time = 0.0
+        self.image_rate = None
+        self.image_data = lambda prompt: mock_image(prompt, self.image_size)
+        self.image_calls = {}  # image_generation_call id -> image bytes
+        self._image_bucket = None  # (tokens, last refill)
+        self.computer_script = []
+        self.script_display = (1024, 768)
+        self.computer_steps = {}  # response id -> how many scripted actions the chain has taken
+        self.screenshots = []
+        self.mcp_servers = {}
+        self.mcp_list_time = 0.0
+        self.mcp_list_fetches = {}  # server_label -> times its tools were listed
+        self.mcp_lists = {}  # response id -> {server_label: tools} in its context
+        self.mcp_rounds = {}  # response id -> (next plan round, {approval request id: call awaiting approval})
+        self.mcp_plan = _first_mcp_tool
+        self._prefixes = set()
+        self.requests = []
+        self.reply = lambda body: f"mock reply to: {_last_user_text(body).strip()[:80]}"
+        self._routes = []
+        self._ids = itertools.count(1)
+        self._lock = threading.RLock()
+        self._httpd = _HTTPServer((host, port), _make_handler(self))
+        self._httpd.daemon_threads = True
+        self._thread = None
+        self.route("POST", r"/v1/responses", self._create_response)
+        self.route("GET", r"/v1/responses/([^/]+)", self._retrieve_response)
+        self.route("POST", r"/v1/chat/completions", self._create_chat_completion)
+        self.route("POST", r"/v1/files", self._create_file)
+        self.route("GET", r"/v1/files", self._list_files)
+        self.route("GET", r"/v1/files/([^/]+)", self._retrieve_file)
+        self.route("DELETE", r"/v1/files/([^/]+)", self._delete_file)
+        self.route("GET", r"/v1/files/([^/]+)/content", self._file_content)
+        self.route("POST", r"/v1/batches", self._create_batch)
+        self.route("GET", r"/v1/batches", self._list_batches)
+        self.route("GET", r"/v1/batches/([^/]+)", self._retrieve_batch)
+        self.route("GET", r"(/downloads/.+)", self._download)
+        self.route("POST", r"/v1/vector_stores", self._create_vector_store)
+        self.route("GET", r"/v1/vector_stores/([^/]+)", self._retrieve_vector_store)
+        self.route("POST", r"/v1/vector_stores/([^/]+)/files", self._create_vector_store_file)
+        self.route("GET", r"/v1/vector_stores/([^/]+)/files", self._list_vector_store_files)
+        self.route("GET", r"/v1/vector_stores/([^/]+)/files/([^/]+)", self._retrieve_vector_store_file)
+        self.route("POST", r"/v1/vector_stores/([^/]+)/file_batches", self._create_file_batch)
+        self.route("GET", r"/v1/vector_stores/([^/]+)/file_batches/([^/]+)", self._retrieve_file_batch)
+        self.route("GET", r"/v1/vector_stores/([^/]+)/file_batches/([^/]+)/files", self._list_file_batch_files)
+
+    @property
+    def base_url(self):
+        return self.url("/v1")
+
+    def url(self, path):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}{path}"
+
+    def new_id(self, prefix):
+        with self._lock:
+            return f"{prefix}_{next(self._ids):08d}"
+
+    def route(self, method, pattern, handler):
+        # Later registrations win, so callers can override the built-in endpoints.
+        self._routes.insert(0, (method, re.compile(pattern + "$"), handler))
+
+    def client(self, **kwargs):
+        from openai import OpenAI
+
+        kwargs.setdefault("max_retries", 0)
+        return OpenAI(base_url=self.base_url, api_key="mock", **kwargs)
+
+    def async_client(self, **kwargs):
+        from openai import AsyncOpenAI
+
+        kwargs.setdefault("max_retries", 0)
+        return AsyncOpenAI(base_url=self.base_url, api_key="mock", **kwargs)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _dispatch(self, request):
+        with self._lock:
+            self.requests.append(request)
+        delay = self.latency(request) if callable(self.latency) else self.latency
+        if delay:
+            time.sleep(delay)
+        for method, pattern, handler in self._routes:
+            if method != request.method:
+                continue
+            match = pattern.match(request.path)
+            if match:
+                request.match = match
+                return handler(request)
+        return 404, {"error": {"message": f"no mock route for {request.method} {request.path}", "type": "invalid_request_error"}}
+
+    def prompt_usage(self, body):
+        # (input_tokens, cached_tokens) for a request body, remembering its prefixes for later requests.
+        prompt = json.dumps(
+            [body.get("model"), body.get("tools"), body.get("instructions"), body.get("input", body.get("messages"))],
+            ensure_ascii=False,
+        ).encode("utf-8")
+        cached, hit = 0, True
+        running = hashlib.sha1()  # extended step by step, so long prompts (inline images) stay linear
+        with self._lock:
+            for end in range(CACHE_STEP_BYTES, len(prompt) + 1, CACHE_STEP_BYTES):
+                running.update(prompt[end - CACHE_STEP_BYTES:end])
+                digest = running.digest()
+                if hit and digest in self._prefixes:
+                    cached = end
+                else:
+                    hit = False
+                    self._prefixes.add(digest)
+        return len(prompt) // 4, (cached // 4 if cached >= CACHE_MIN_BYTES else 0)
+
+    def _take_image_slot(self):
+        # Seconds until the next image may start under image_rate, or 0 if this one may start now.
+        if self.image_rate is None:
+            return 0.0
+        rate, burst = self.image_rate
+        with self._lock:
+            now = time.monotonic()
+            tokens, last = self._image_bucket or (burst, now)
+            tokens = min(burst, tokens + (now - last) * rate)
+            wait = 0.0 if tokens >= 1 else (1 - tokens) / rate
+            self._image_bucket = (tokens - 1 if tokens >= 1 else tokens, now)
+        return wait
+
+    def _create_response(self, request):
+        body = request.json
+        image_tool = next((tool for tool in body.get("tools") or [] if tool.get("type") == "image_generation"), None)
+        if image_tool is not None:
+            wait = self._take_image_slot()
+            if wait:
+                return 429, {"error": {"message": "Rate limit reached for images per minute.", "type": "requests",
+                                       "code": "rate_limit_exceeded"}}, {"retry-after-ms": str(int(wait * 1000) + 1)}
+        previous = body.get("previous_response_id")
+        context_tokens = 0
+        if previous is not None:
+            with self._lock:
+                stored = self.responses.get(previous)
+            if stored is None:
+                return 400, {"error": {"message": f"Previous response with id '{previous}' not found.",
+                                       "type": "invalid_request_error", "param": "previous_response_id",
+                                       "code": "previous_response_not_found"}}
+            context_tokens = stored["usage"]["total_tokens"]
+        text = _structured_reply(body) or self.reply(body)
+        payload = response_payload(self.new_id("resp"), body.get("model", "mock"), text, previous_response_id=previous)
+        if image_tool is not None:
+            prompt = _last_user_text(body)
+            try:
+                base = self._image_to_edit(body)
+            except KeyError as e:
+                return 400, {"error": {"message": f"Image generation call with id '{e.args[0]}' not found.",
+                                       "type": "invalid_request_error", "param": "input"}}
+            data = self.image_data(prompt if base is None else hashlib.sha256(base).hexdigest() + prompt)
+            payload["output"] = [{
+                "id": self.new_id("ig"),
+                "type": "image_generation_call",
+                "status": "completed",
+                "revised_prompt": prompt,
+                "result": base64.b64encode(data).decode(),
+            }]
+            if body.get("store", True):
+                with self._lock:
+                    self.image_calls[payload["output"][0]["id"]] = data
+        input_tokens, cached_tokens = self.prompt_usage(body)
+        # A chained request is billed for the whole stored conversation plus its own input.
+        payload["usage"]["input_tokens"] = context_tokens + input_tokens
+        payload["usage"]["input_tokens_details"]["cached_tokens"] = cached_tokens
+        payload["usage"]["total_tokens"] = payload["usage"]["input_tokens"] + payload["usage"]["output_tokens"]
+        if body.get("store", True):
+            with self._lock:
+                self.responses[payload["id"]] = payload
+        if body.get("background"):
+            # Generation runs on the server's clock: the events become due token_interval apart, whether
+            # or not anyone is streaming them.
+            started, events = time.monotonic(), self._response_events(payload)
+            interval = self.token_interval
+            if self.background_duration is not None:
+                duration = self.background_duration
+                interval = (duration(body) if callable(duration) else duration) / events[-1]["sequence_number"]
+            with self._lock:
+                self.background[payload["id"]] = (started, events, interval)
+            if body.get("stream"):
+                return 200, self._stream_events(events, started, interval=interval)
+            return 200, dict(events[0]["response"], status="queued")
+        computer_tool = next((tool for tool in body.get("tools") or [] if tool.get("type") == "computer_use_preview"), None)
+        if computer_tool is not None:
+            error = self._computer_turn(body, payload, computer_tool)
+            if error is not None:
+                return 400, {"error": {"message": error, "type": "invalid_request_error", "param": "input"}}
+            events = self._item_events(payload)
+            if body.get("stream"):
+                return 200, self._stream_events(events, time.monotonic())
+            time.sleep(self.token_interval * (len(events) - 1))  # the whole response, once it would have finished
+            return 200, payload
+        mcp_tools = [tool for tool in body.get("tools") or [] if tool.get("type") == "mcp"]
+        if mcp_tools:
+            error = self._mcp_turn(body, payload, mcp_tools)
+            if error is not None:
+                return 400, {"error": {"message": error, "type": "invalid_request_error", "param": "input"}}
+            if body.get("stream"):
+                return 200, self._stream_events(self._item_events(payload), time.monotonic())
+            return 200, payload
+        if image_tool is not None:
+            events = self._image_events(payload, image_tool.get("partial_images", 0))
+            if body.get("stream"):
+                return 200, self._stream_events(events, time.monotonic(), interval=self.image_time / len(events))
+            time.sleep(self.image_time)
+            return 200, payload
+        if body.get("stream"):
+            return 200, self._stream_events(self._response_events(payload), time.monotonic())
+        return 200, payload
+
+    def _retrieve_response(self, request):
+        response_id = request.match.group(1)
+        with self._lock:
+            payload = self.responses.get(response_id)
+            started, events, interval = self.background.get(response_id, (None, None, None))
+        if payload is None:
+            return self._missing("response", response_id)
+        if request.query.get("stream") == ["true"]:
+            if events is None:
+                return 400, {"error": {"message": "Only background responses can be streamed again.",
+                                       "type": "invalid_request_error"}}
+            starting_after = int(request.query.get("starting_after", ["-1"])[0])
+            return 200, self._stream_events(events, started, starting_after, interval)
+        if events is not None and time.monotonic() < started + events[-1]["sequence_number"] * interval:
+            return 200, events[0]["response"]
+        return 200, payload
+
+    def _response_events(self, payload):
+        # The Responses API streaming events for a finished response: created, in_progress, the text in
+        # stream_chunk_size deltas, the done events and response.completed, numbered by sequence_number.
+        item = payload["output"][0]
+        text = item["content"][0]["text"]
+        part = {"type": "output_text", "text": "", "annotations": []}
+        pending = dict(payload, status="in_progress", output=[], usage=None)
+        where = {"item_id": item["id"], "output_index": 0, "content_index": 0}
+        events = [
+            {"type": "response.created", "response": pending},
+            {"type": "response.in_progress", "response": pending},
+            {"type": "response.output_item.added", "output_index": 0, "item": dict(item, status="in_progress", content=[])},
+            {"type": "response.content_part.added", **where, "part": part},
+        ]
+        for start in range(0, len(text), self.stream_chunk_size):
+            events.append({"type": "response.output_text.delta", **where, "delta": text[start:start + self.stream_chunk_size]})
+        events += [
+            {"type": "response.output_text.done", **where, "text": text},
+            {"type": "response.content_part.done", **where, "part": dict(part, text=text)},
+            {"type": "response.output_item.done", "output_index": 0, "item": item},
+            {"type": "response.completed", "response": payload},
+        ]
+        for number, event in enumerate(events):
+            event["sequence_number"] = number
+        return events
+
+    def _computer_turn(self, body, payload, tool):
+        # Replaces the reply with the script's next action; returns an error message for a bad screenshot.
+        items = body.get("input")
+        for item in items if isinstance(items, list) else []:
+            if item.get("type") == "computer_call_output":
+                url = item.get("output", {}).get("image_url", "")
+                prefix, _, data = url.partition(",")
+                data = base64.b64decode(data) if prefix.endswith(";base64") else b""
+                kind = "png" if data.startswith(b"\x89PNG") else "webp" if data[8:12] == b"WEBP" else None
+                if kind is None or f"image/{kind}" not in prefix:
+                    return "computer_call_output needs a PNG or WebP screenshot as a data URL"
+                with self._lock:
+                    self.screenshots.append((kind, len(data)))
+        with self._lock:
+            step = self.computer_steps.get(body.get("previous_response_id"), 0)
+            self.computer_steps[payload["id"]] = step + 1
+        if step >= len(self.computer_script):
+            return None
+        sx, sy = tool["display_width"] / self.script_display[0], tool["display_height"] / self.script_display[1]
+        action = dict(self.computer_script[step])
+        for name, scale in (("x", sx), ("y", sy), ("scroll_x", sx), ("scroll_y", sy)):
+            if name in action:
+                action[name] = round(action[name] * scale)
+        if "path" in action:
+            action["path"] = [{"x": round(point["x"] * sx), "y": round(point["y"] * sy)} for point in action["path"]]
+        payload["output"] = [
+            {"id": self.new_id("rs"), "type": "reasoning", "summary": []},
+            {"id": self.new_id("cu"), "type": "computer_call", "call_id": self.new_id("call"), "action": action,
+             "pending_safety_checks": [], "status": "completed"},
+        ]
+        return None
+
+    def _mcp_turn(self, body, payload, tools):
+        # Puts the tool lists the request had to fetch and the MCP calls the model makes (or asks approval for)
+        # before the reply; returns an error message for an answer to an unknown approval request.
+        with self._lock:
+            known = dict(self.mcp_lists.get(body.get("previous_response_id"), {}))
+        items = body.get("input")
+        for item in items if isinstance(items, list) else []:
+            if item.get("type") == "mcp_list_tools":
+                known[item["server_label"]] = item["tools"]
+        output, imported = [], 0
+        for tool in tools:
+            label = tool["server_label"]
+            if label in known:
+                continue
+            allowed = tool.get("allowed_tools")
+            if isinstance(allowed, dict):
+                allowed = allowed.get("tool_names")
+            time.sleep(self.mcp_list_time)
+            server = self.mcp_servers.get(tool.get("server_url"), {})
+            known[label] = [dict(definition, name=name) for name, (definition, _) in sorted(server.items())
+                            if allowed is None or name in allowed]
+            with self._lock:
+                self.mcp_list_fetches[label] = self.mcp_list_fetches.get(label, 0) + 1
+            output.append({"id": self.new_id("mcpl"), "type": "mcp_list_tools", "server_label": label, "tools": known[label]})
+            imported += len(json.dumps(known[label])) // 4
+        by_label = {tool["server_label"]: tool for tool in tools}
+        with self._lock:
+            round, pending = self.mcp_rounds.get(body.get("previous_response_id"), (0, {}))
+        pending = dict(pending)
+        for item in items if isinstance(items, list) else []:
+            if item.get("type") == "mcp_approval_response":
+                call = pending.pop(item["approval_request_id"], None)
+                if call is None or call[0] not in by_label:
+                    return f"No pending approval request with id '{item['approval_request_id']}'."
+                if item["approve"]:
+                    label, name, arguments = call
+                    output.append(self._mcp_call(by_label[label].get("server_url"), label, name, arguments,
+                                                 known[label], item["approval_request_id"]))
+        requests = list(pending.values())
+        while not requests:
+            calls = self.mcp_plan(body, {label: known[label] for label in by_label}, round)
+            if not calls:
+                break
+            round += 1
+            for label, name, arguments in calls:
+                if _needs_approval(by_label[label], name):
+                    requests.append((label, name, arguments))
+                else:
+                    output.append(self._mcp_call(by_label[label].get("server_url"), label, name, arguments, known[label]))
+        pending = {}
+        for label, name, arguments in requests:
+            pending[self.new_id("mcpr")] = (label, name, arguments)
+            output.append({"id": next(reversed(pending)), "type": "mcp_approval_request", "server_label": label,
+                           "name": name, "arguments": json.dumps(arguments)})
+        if body.get("store", True):
+            with self._lock:
+                self.mcp_lists[payload["id"]] = known
+                self.mcp_rounds[payload["id"]] = (round, pending)
+        payload["output"] = output + ([] if pending else payload["output"])
+        payload["usage"]["input_tokens"] += imported
+        payload["usage"]["total_tokens"] += imported
+        return None
+
+    def _mcp_call(self, url, label, name, arguments, listed, approval_request_id=None):
+        call = {"id": self.new_id("mcp"), "type": "mcp_call", "server_label": label, "name": name,
+                "arguments": json.dumps(arguments), "output": None, "error": None, "status": "completed",
+                "approval_request_id": approval_request_id}
+        definition = next((tool for tool in listed if tool["name"] == name), None)
+        current = self.mcp_servers.get(url, {}).get(name)
+        if current is None:
+            error = (-32601, f"Unknown tool: {name}")
+        elif definition is None or definition["input_schema"] != current[0]["input_schema"]:
+            error = (-32602, f"Invalid params: the arguments do not match the input schema of {name}")
+        else:
+            call["output"] = current[1](arguments)
+            return call
+        call["error"] = {"type": "mcp_protocol_error", "code": error[0], "message": error[1]}
+        call["status"] = "failed"
+        return call
+
+    def _item_events(self, payload):
+        # Streaming events for a response whose output items arrive whole: added, then done, per item.
+        pending = dict(payload, status="in_progress", output=[], usage=None)
+        events = [{"type": "response.created", "response": pending}, {"type": "response.in_progress", "response": pending}]
+        for index, item in enumerate(payload["output"]):
+            events.append({"type": "response.output_item.added", "output_index": index, "item": dict(item, status="in_progress")})
+            events.append({"type": "response.output_item.done", "output_index": index, "item": item})
+        events.append({"type": "response.completed", "response": payload})
+        for number, event in enumerate(events):
+            event["sequence_number"] = number
+        return events
+
+    def _image_to_edit(self, body):
+        # The bytes of the image a request edits, or None for a new image; KeyError(id) for an unknown id.
+        items = body.get("input")
+        for item in reversed(items if isinstance(items, list) else []):
+            if item.get("type") == "image_generation_call":
+                with self._lock:
+                    return self.image_calls[item["id"]]
+            for part in item.get("content") if isinstance(item.get("content"), list) else []:
+                if part.get("type") == "input_image" and part.get("image_url", "").startswith("data:"):
+                    return base64.b64decode(part["image_url"].split(",", 1)[1])
+        previous = body.get("previous_response_id")
+        while previous is not None:
+            with self._lock:
+                stored = self.responses.get(previous)
+            if stored is None:
+                return None
+            for item in stored["output"]:
+                if item["type"] == "image_generation_call":
+                    return base64.b64decode(item["result"])
+            previous = stored.get("previous_response_id")
+        return None
+
+    def _image_events(self, payload, partial_images):
+        # The streaming events of an image_generation_call, with `partial_images` partial_image events
+        # carrying growing prefixes of the final image.
+        item = payload["output"][0]
+        data = base64.b64decode(item["result"])
+        pending = dict(payload, status="in_progress", output=[], usage=None)
+        where = {"item_id": item["id"], "output_index": 0}
+        events = [
+            {"type": "response.created", "response": pending},
+            {"type": "response.in_progress", "response": pending},
+            {"type": "response.output_item.added", "output_index": 0, "item": dict(item, status="in_progress", result=None)},
+            {"type": "response.image_generation_call.in_progress", **where},
+            {"type": "response.image_generation_call.generating", **where},
+        ]
+        for index in range(partial_images):
+            partial = data[:len(data) * (index + 1) // (partial_images + 1)]
+            events.append({"type": "response.image_generation_call.partial_image", **where, "partial_image_index": index,
+                           "partial_image_b64": base64.b64encode(partial).decode()})
+        events += [
+            {"type": "response.image_generation_call.completed", **where},
+            {"type": "response.output_item.done", "output_index": 0, "item": item},
+            {"type": "response.completed", "response": payload},
+        ]
+        for number, event in enumerate(events):
+            event["sequence_number"] = number
+        return events
+
+    def _stream_events(self, events, started, starting_after=-1, interval=None):
+        # Sends the events after `starting_after`, each no earlier than its place on the generation
+        # timeline: `interval` (default token_interval) seconds apart from `started`. With drop_stream_after
+        # set, the connection is cut after that many events, as a flaky network would.
+        sent = 0
+        for event in events:
+            if event["sequence_number"] <= starting_after:
+                continue
+            if self.drop_stream_after is not None and sent == self.drop_stream_after:
+                raise DropConnection()
+            if interval is None:
+                interval = self.token_interval
+            delay = started + event["sequence_number"] * interval - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            yield event
+            sent += 1
+
+    def expire_responses(self):
+        # Forgets every stored response (and image), as the 30-day retention eventually does.
+        with self._lock:
+            self.responses.clear()
+            self.image_calls.clear()
+            self.mcp_lists.clear()
+            self.mcp_rounds.clear()
+
+    def _create_chat_completion(self, request):
+        body = request.json
+        text = _structured_reply(body) or self.reply(body)
+        if body.get("stream"):
+            return 200, self._chat_chunks(self.new_id("chatcmpl"), body.get("model", "mock"), text)
+        payload = chat_completion_payload(self.new_id("chatcmpl"), body.get("model", "mock"), text)
+        input_tokens, cached_tokens = self.prompt_usage(body)
+        payload["usage"].update(prompt_tokens=input_tokens, prompt_tokens_details={"cached_tokens": cached_tokens})
+        return 200, payload
+
+    def _chat_chunks(self, id, model, text):
+        # chat.completion.chunk events carrying the reply in stream_chunk_size pieces, then [DONE].
+        def chunk(delta, finish_reason=None):
+            return {"id": id, "object": "chat.completion.chunk", "created": int(time.time()), "model": model,
+                    "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]}
+
+        yield chunk({"role": "assistant", "content": ""})
+        for start in range(0, len(text), self.stream_chunk_size):
+            yield chunk({"content": text[start:start + self.stream_chunk_size]})
+        yield chunk({}, "stop")
+        yield "[DONE]"
+
+    # ---- files ----
+    def add_file(self, filename, data, purpose):
+        file_id = self.new_id("file")
+        meta = file_payload(file_id, filename, len(data), purpose, int(time.time()))
+        with self._lock:
+            self.files[file_id] = (meta, data)
+        return meta
+
+    def _missing(self, kind, id):
+        return 404, {"error": {"message": f"No such {kind}: {id}", "type": "invalid_request_error"}}
+
+    def _create_file(self, request):
+        form = request.form()
+        filename, data = form["file"]
+        return 200, self.add_file(filename, data, form.get("purpose", "assistants"))
+
+    def _list_files(self, request):
+        with self._lock:
+            data = [meta for meta, _ in self.files.values()]
+        if "purpose" in request.query:
+            data = [meta for meta in data if meta["purpose"] == request.query["purpose"][0]]
+        return 200, {"object": "list", "data": data, "has_more": False}
+
+    def _retrieve_file(self, request):
+        file_id = request.match.group(1)
+        if file_id not in self.files:
+            return self._missing("file", file_id)
+        return 200, self.files[file_id][0]
+
+    def _delete_file(self, request):
+        file_id = request.match.group(1)
+        with self._lock:
+            found = self.files.pop(file_id, None) is not None
+        if not found:
+            return self._missing("file", file_id)
+        return 200, {"id": file_id, "object": "file", "deleted": True}
+
+    def _file_content(self, request):
+        file_id = request.match.group(1)
+        if file_id not in self.files:
+            return self._missing("file", file_id)
+        return 200, self.files[file_id][1]
+
+    # ---- batches ----
+    def _create_batch(self, request):
+        body = request.json
+        if body["input_file_id"] not in self.files:
+            return self._missing("file", body["input_file_id"])
+        batch = {
+            "id": self.new_id("batch"),
+            "object": "batch",
+            "endpoint": body["endpoint"],
+            "input_file_id": body["input_file_id"],
+            "completion_window": body.get("completion_window", "24h"),
+            "status": "validating",
+            "created_at": int(time.time()),
+            "output_file_id": None,
+            "error_file_id": None,
+            "metadata": body.get("metadata"),
+            "request_counts": {"total": 0, "completed": 0, "failed": 0},
+        }
+        with self._lock:
+            self.batches[batch["id"]] = (batch, time.monotonic())
+        return 200, batch
+
+    def _batch_state(self, batch_id):
+        batch, started = self.batches[batch_id]
+        if batch["status"] in ("validating", "in_progress"):
+            if time.monotonic() - started >= self.batch_delay:
+                self._finish_batch(batch)
+            else:
+                batch["status"] = "in_progress"
+        return batch
+
+    def _finish_batch(self, batch):
+        lines = self.files[batch["input_file_id"]][1].decode().splitlines()
+        output = []
+        for line in lines:
+            item = json.loads(line)
+            body = item["body"]
+            if item["url"] == "/v1/chat/completions":
+                result = chat_completion_payload(self.new_id("chatcmpl"), body.get("model", "mock"), self.reply(body))
+            else:
+                result = response_payload(self.new_id("resp"), body.get("model", "mock"), self.reply(body))
+            output.append(json.dumps({
+                "id": self.new_id("batch_req"),
+                "custom_id": item["custom_id"],
+                "response": {"status_code": 200, "request_id": self.new_id("req"), "body": result},
+                "error": None,
+            }))
+        batch["output_file_id"] = self.add_file(f"{batch['id']}_output.jsonl", ("\n".join(output) + "\n").encode(), "batch_output")["id"]
+        batch["request_counts"] = {"total": len(lines), "completed": len(lines), "failed": 0}
+        batch["status"] = "completed"
+        batch["completed_at"] = int(time.time())
+
+    def _list_batches(self, request):
+        with self._lock:
+            data = [self._batch_state(batch_id) for batch_id in self.batches]
+        return 200, {"object": "list", "data": data[::-1], "has_more": False}
+
+    def _retrieve_batch(self, request):
+        batch_id = request.match.group(1)
+        with self._lock:
+            if batch_id not in self.batches:
+                return self._missing("batch", batch_id)
+            return 200, self._batch_state(batch_id)
+
+    # ---- downloads ----
+    def _download(self, request):
+        path = request.match.group(1)
+        if path not in self.downloads:
+            return self._missing("download", path)
+        data = self.downloads[path]
+        etag = '"%s"' % hashlib.sha1(data).hexdigest()
+        headers = {"ETag": etag, "Accept-Ranges": "bytes"}
+        status, start = 200, 0
+        byte_range = re.fullmatch(r"bytes=(\d+)-", request.headers.get("Range", ""))
+        if byte_range and request.headers.get("If-Range", etag) == etag:
+            status, start = 206, int(byte_range.group(1))
+            headers["Content-Range"] = f"bytes {start}-{len(data) - 1}/{len(data)}"
+        return status, Download(data[start:], headers, self.drop_download_after, self.download_rate)
+
+    # ---- vector stores ----
+    def add_vector_store(self, name="", metadata=None, file_ids=()):
+        store = {
+            "id": self.new_id("vs"),
+            "object": "vector_store",
+            "created_at": int(time.time()),
+            "name": name,
+            "usage_bytes": 0,
+            "file_counts": {"in_progress": 0, "completed": 0, "failed": 0, "cancelled": 0, "total": 0},
+            "status": "completed",
+            "last_active_at": int(time.time()),
+            "metadata": metadata,
+        }
+        with self._lock:
+            self.vector_stores[store["id"]] = (store, {})
+        for file_id in file_ids:
+            self.add_vector_store_file(store["id"], file_id)
+        return self._vector_store_state(store["id"])
+
+    def _create_vector_store(self, request):
+        body = request.json
+        return 200, self.add_vector_store(body.get("name", ""), body.get("metadata"), body.get("file_ids", []))
+
+    def add_vector_store_file(self, vector_store_id, file_id):
+        delay = self.vector_store_file_delay
+        delay = delay(file_id) if callable(delay) else delay
+        item = {
+            "id": file_id,
+            "object": "vector_store.file",
+            "created_at": int(time.time()),
+            "vector_store_id": vector_store_id,
+            "status": "in_progress",
+            "usage_bytes": 0,
+            "last_error": None,
+        }
+        fails = self.vector_store_file_fails is not None and self.vector_store_file_fails(file_id)
+        with self._lock:
+            self.vector_stores[vector_store_id][1][file_id] = (item, time.monotonic() + delay, fails)
+        return item
+
+    def _vector_store_files(self, vector_store_id):
+        # The store's files in the order they were added, each with its status as of now.
+        now = time.monotonic()
+        files = []
+        for item, ready_at, fails in self.vector_stores[vector_store_id][1].values():
+            if item["status"] == "in_progress" and now >= ready_at:
+                if fails:
+                    item.update(status="failed", last_error={"code": "server_error", "message": "mock processing failure"})
+                else:
+                    item.update(status="completed", usage_bytes=len(self.files.get(item["id"], (None, b""))[1]))
+            files.append(item)
+        return files
+
+    @staticmethod
+    def _file_counts(files):
+        counts = {status: 0 for status in ("in_progress", "completed", "failed", "cancelled")}
+        for item in files:
+            counts[item["status"]] += 1
+        return dict(counts, total=len(files))
+
+    def _vector_store_state(self, vector_store_id):
+        with self._lock:
+            store = self.vector_stores[vector_store_id][0]
+            files = self._vector_store_files(vector_store_id)
+        counts = self._file_counts(files)
+        store.update(file_counts=counts, usage_bytes=sum(item["usage_bytes"] for item in files),
+                     status="in_progress" if counts["in_progress"] else "completed")
+        return store
+
+    def _retrieve_vector_store(self, request):
+        vector_store_id = request.match.group(1)
+        if vector_store_id not in self.vector_stores:
+            return self._missing("vector store", vector_store_id)
+        return 200, self._vector_store_state(vector_store_id)
+
+    def _create_vector_store_file(self, request):
+        vector_store_id = request.match.group(1)
+        body = request.json
+        if vector_store_id not in self.vector_stores:
+            return self._missing("vector store", vector_store_id)
+        if body["file_id"] not in self.files:
+            return self._missing("file", body["file_id"])
+        return 200, self.add_vector_store_file(vector_store_id, body["file_id"])
+
+    def _list_vector_store_files(self, request):
+        vector_store_id = request.match.group(1)
+        if vector_store_id not in self.vector_stores:
+            return self._missing("vector store", vector_store_id)
+        with self._lock:
+            files = self._vector_store_files(vector_store_id)
+        return 200, self._page(files, request.query)
+
+    @staticmethod
+    def _page(files, query):
+        # One page of a cursor-paginated list, honouring order, filter, after and limit.
+        query = {name: values[0] for name, values in query.items()}
+        if query.get("order", "desc") == "desc":
+            files = files[::-1]
+        if "filter" in query:
+            files = [item for item in files if item["status"] == query["filter"]]
+        if "after" in query:
+            ids = [item["id"] for item in files]
+            files = files[ids.index(query["after"]) + 1:] if query["after"] in ids else []
+        limit = int(query.get("limit", 20))
+        page = files[:limit]
+        return {"object": "list", "data": page, "has_more": len(files) > limit,
+                "first_id": page[0]["id"] if page else None, "last_id": page[-1]["id"] if page else None}
+
+    def _retrieve_vector_store_file(self, request):
+        vector_store_id, file_id = request.match.groups()
+        with self._lock:
+            if file_id not in self.vector_stores.get(vector_store_id, (None, {}))[1]:
+                return self._missing("vector store file", file_id)
+            files = self._vector_store_files(vector_store_id)
+        return 200, next(item for item in files if item["id"] == file_id)
+
+    def _create_file_batch(self, request):
+        vector_store_id = request.match.group(1)
+        body = request.json
+        file_ids = body.get("file_ids") or [item["file_id"] for item in body.get("files", [])]
+        if vector_store_id not in self.vector_stores:
+            return self._missing("vector store", vector_store_id)
+        missing = [file_id for file_id in file_ids if file_id not in self.files]
+        if missing:
+            return self._missing("file", missing[0])
+        batch = {
+            "id": self.new_id("vsfb"),
+            "object": "vector_store.files_batch",
+            "created_at": int(time.time()),
+            "vector_store_id": vector_store_id,
+            "status": "in_progress",
+            "file_counts": self._file_counts([]),
+        }
+        with self._lock:
+            self.file_batches[batch["id"]] = (batch, list(file_ids))
+        for file_id in file_ids:
+            self.add_vector_store_file(vector_store_id, file_id)
+        return 200, self._file_batch_state(batch["id"])
+
+    def _batch_files(self, batch_id):
+        batch, file_ids = self.file_batches[batch_id]
+        wanted = set(file_ids)
+        return [item for item in self._vector_store_files(batch["vector_store_id"]) if item["id"] in wanted]
+
+    def _file_batch_state(self, batch_id):
+        with self._lock:
+            batch = self.file_batches[batch_id][0]
+            counts = self._file_counts(self._batch_files(batch_id))
+        batch.update(file_counts=counts, status="in_progress" if counts["in_progress"] else "completed")
+        return batch
+
+    def _retrieve_file_batch(self, request):
+        vector_store_id, batch_id = request.match.groups()
+        if batch_id not in self.file_batches or self.file_batches[batch_id][0]["vector_store_id"] != vector_store_id:
+            return self._missing("file batch", batch_id)
+        return 200, self._file_batch_state(batch_id)
+
+    def _list_file_batch_files(self, request):
+        vector_store_id, batch_id = request.match.groups()
+        if batch_id not in self.file_batches or self.file_batches[batch_id][0]["vector_store_id"] != vector_store_id:
+            return self._missing("file batch", batch_id)
+        with self._lock:
+            files = self._batch_files(batch_id)
+        return 200, self._page(files, request.query)
+
+
+def _make_handler(server):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True  # headers and body are separate writes; don't let Nagle delay the body
+
+        def log_message(self, *args):
+            pass
+
+        def _read_body(self):
+            if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+                chunks = []
+                while True:
+                    size = int(self.rfile.readline().split(b";")[0], 16)
+                    if size == 0:
+                        self.rfile.readline()
+                        return b"".join(chunks)
+                    chunks.append(self._read(size))
+                    self.rfile.readline()
+            length = int(self.headers.get("Content-Length") or 0)
+            return self._read(length) if length else b""
+
+        def _read(self, size):
+            # At most server.upload_rate bytes per second, when set.
+            if server.upload_rate is None:
+                return self.rfile.read(size)
+            pieces = []
+            for start in range(0, size, 64 * 1024):
+                pieces.append(self.rfile.read(min(64 * 1024, size - start)))
+                time.sleep(len(pieces[-1]) / server.upload_rate)
+            return b"".join(pieces)
+
+        def _handle(self):
+            url = urlsplit(self.path)
+            request = MockRequest(self.command, url.path, parse_qs(url.query), self.headers, self._read_body(), None)
+            status, payload, *headers = server._dispatch(request)
+            if isinstance(payload, (dict, list)):
+                self._send(status, json.dumps(payload).encode(), "application/json", *headers)
+            elif isinstance(payload, bytes):
+                self._send(status, payload, "application/octet-stream")
+            elif isinstance(payload, Download):
+                self._send(status, payload.data, "application/octet-stream", payload.headers, payload.send, payload.rate)
+            else:
+                self._send_events(status, payload)
+
+        def _send(self, status, data, content_type, headers=None, send=None, rate=None):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            body = memoryview(data)[:send]
+            step = len(body) if rate is None else 64 * 1024
+            try:
+                for start in range(0, len(body), max(step, 1)):
+                    self.wfile.write(body[start:start + step])
+                    if rate is not None:
+                        time.sleep(step / rate)
+            except (BrokenPipeError, ConnectionResetError):
+                self.close_connection = True
+            if send is not None and send < len(data):
+                self.close_connection = True  # the client sees a body that ends early
+
+        def _send_events(self, status, events):
+            self.send_response(status)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            try:
+                for event in events:
+                    if isinstance(event, str):
+                        data = f"data: {event}\n\n".encode()  # e.g. the [DONE] that ends a chat stream
+                    elif "type" in event:
+                        data = f"event: {event['type']}\ndata: {json.dumps(event)}\n\n".encode()
+                    else:
+                        data = f"data: {json.dumps(event)}\n\n".encode()
+                    self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+                    self.wfile.flush()
+                self.wfile.write(b"0\r\n\r\n")
+            except DropConnection:
+                self.wfile.flush()
+                self.close_connection = True
+            except (BrokenPipeError, ConnectionResetError):
+                self.close_connection = True
+
+        do_GET = do_POST = do_DELETE = _handle
+
+    return Handler
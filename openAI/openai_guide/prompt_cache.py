@@ -0,0 +1,126 @@
+# Prompt layouts that keep the static part of a request byte-identical from call to call.
+# OpenAI caches prompt prefixes automatically (for prompts of 1024 tokens and more, in 128-token steps),
+# but only if the start of the request is exactly the same as before: tools, instructions and few-shot
+# examples first, the part that changes last. A PromptLayout freezes the static part once, in a canonical
+# form (tools sorted by name, dict keys sorted), so every request built from it starts with the same bytes,
+# and attaches a prompt_cache_key so requests sharing the prefix get routed to the same cache.
+#
+#   layout = PromptLayout(SENTIMENT_INSTRUCTIONS, model="gpt-4")
+#   stats = PromptCacheStats()
+#   response = create(layout, "Battery died after a week.", stats=stats)
+#   print(stats.hit_rate)
+import copy
+import hashlib
+import json
+import time
+
+from ._client import get_client
+
+# prompt_cache_key policies:
+# PREFIX   one key per layout (spread over `shards` keys by user if given, since a single key only
+#          absorbs a limited request rate before overflowing to other cache machines)
+# PER_USER one key per layout and user, for prefixes that continue with per-user context
+PREFIX = "prefix"
+PER_USER = "per_user"
+
+
+def _canonical(value):
+    # Round-trips through sorted-key JSON so dict ordering can never differ between two requests.
+    return json.loads(json.dumps(value, sort_keys=True, ensure_ascii=False))
+
+
+def _tool_name(tool):
+    return tool.get("name") or tool.get("function", {}).get("name") or tool.get("server_label") or tool.get("type", "")
+
+
+class PromptLayout:
+    def __init__(self, instructions, model, examples=(), tools=None, cache_key_policy=PREFIX, shards=1):
+        # examples are input messages ({"role": ..., "content": ...}) placed before the variable input.
+        self.model = model
+        self.instructions = instructions
+        self.examples = _canonical(list(examples))
+        self.tools = sorted(_canonical(tools), key=_tool_name) if tools else None
+        self.cache_key_policy = cache_key_policy
+        self.shards = shards
+        static = json.dumps(
+            {"model": model, "tools": self.tools, "instructions": instructions, "examples": self.examples},
+            sort_keys=True, ensure_ascii=False,
+        )
+        self.prefix_hash = hashlib.sha256(static.encode("utf-8")).hexdigest()[:16]
+
+    def cache_key(self, user=None):
+        if self.cache_key_policy is None:
+            return None
+        if self.cache_key_policy == PER_USER and user is not None:
+            return f"{self.prefix_hash}-{hashlib.sha256(str(user).encode()).hexdigest()[:8]}"
+        if self.shards > 1 and user is not None:
+            shard = int(hashlib.sha256(str(user).encode()).hexdigest(), 16) % self.shards
+            return f"{self.prefix_hash}-{shard}"
+        return self.prefix_hash
+
+    def request(self, input, user=None, **kwargs):
+        # Keyword arguments for client.responses.create(). `input` is a string or a list of input items
+        # and always goes after the static prefix. Extra keyword arguments are passed through unchanged.
+        params = {"model": self.model, "instructions": self.instructions}
+        if self.tools:
+            params["tools"] = copy.deepcopy(self.tools)
+        if self.examples:
+            if isinstance(input, str):
+                input = [{"role": "user", "content": input}]
+            input = copy.deepcopy(self.examples) + list(input)
+        params["input"] = input
+        key = self.cache_key(user)
+        if key is not None:
+            # Sent through extra_body so it also works with SDK versions that predate the parameter.
+            params["extra_body"] = {**kwargs.pop("extra_body", {}), "prompt_cache_key": key}
+        params.update(kwargs)
+        return params
+
+
+def usage_of(response):
+    # (input_tokens, cached_tokens) from a Responses or Chat Completions result.
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return 0, 0
+    if hasattr(usage, "input_tokens"):
+        details = usage.input_tokens_details
+        return usage.input_tokens, (details.cached_tokens or 0) if details else 0
+    details = usage.prompt_tokens_details
+    return usage.prompt_tokens, (details.cached_tokens or 0) if details else 0
+
+
+class PromptCacheStats:
+    def __init__(self):
+        self.calls = []  # (input_tokens, cached_tokens, seconds) per call
+
+    def record(self, response, seconds=None):
+        input_tokens, cached_tokens = usage_of(response)
+        self.calls.append((input_tokens, cached_tokens, seconds))
+        return cached_tokens
+
+    @property
+    def input_tokens(self):
+        return sum(call[0] for call in self.calls)
+
+    @property
+    def cached_tokens(self):
+        return sum(call[1] for call in self.calls)
+
+    @property
+    def hit_rate(self):
+        # Share of all input tokens that were served from the prompt cache.
+        return self.cached_tokens / self.input_tokens if self.input_tokens else 0.0
+
+    def summary(self):
+        hits = sum(1 for call in self.calls if call[1])
+        return (f"{len(self.calls)} calls, {hits} with cache hits, "
+                f"{self.cached_tokens}/{self.input_tokens} input tokens cached ({self.hit_rate:.0%})")
+
+
+def create(layout, input, client=None, stats=None, user=None, **kwargs):
+    client = client or get_client()
+    start = time.perf_counter()
+    response = client.responses.create(**layout.request(input, user=user, **kwargs))
+    if stats is not None:
+        stats.record(response, time.perf_counter() - start)
+    return response
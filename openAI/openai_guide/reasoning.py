@@ -0,0 +1,118 @@
+from ._client import get_client
+
+
+# ===============================================================
+# ============== Reasoning Examples =============================
+# ===============================================================
+MATRIX_PROMPT = """
+                    Write a bash script that takes a matrix represented as a string with 
+                    format '[1,2],[3,4],[5,6]' and prints the transpose in the same format.
+                """
+
+
+def transpose_script(prompt=MATRIX_PROMPT, client=None):
+    client = client or get_client()
+    response = client.responses.create(
+        model="o4-mini",
+        reasoning={
+            "effort": "medium",  # low, medium, high
+            # "summary": "auto" # may need to verify your organization for this. 
+        },
+        input=[
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ],
+        max_output_tokens=3000,
+    )
+    return response
+
+
+def ran_out_of_tokens(response):
+    # True when the response stopped because it hit max_output_tokens. If response.output_text is empty
+    # the model ran out of tokens during reasoning, otherwise it holds the partial output.
+    return response.status == 'incomplete' and response.incomplete_details.reason == 'max_output_tokens'
+# A reasoning model is like a senior co-worker—you can give them a goal to achieve and trust them to work out the details.
+# A GPT model is like a junior coworker—they'll perform best with explicit instructions to create a specific output.
+
+
+# ----------------------------------------------------------------
+# ------------- Coding / Refactoring Example ---------------------
+# ----------------------------------------------------------------
+REFACTOR_PROMPT = """
+Instructions:
+- Given the React component below, change it so that nonfiction books have red
+  text. 
+- Return only the code in your reply
+- Do not include any additional formatting, such as markdown code blocks
+- For formatting, use four space tabs, and do not allow any lines of code to 
+  exceed 80 columns
+
+const books = [
+  { title: 'Dune', category: 'fiction', id: 1 },
+  { title: 'Frankenstein', category: 'fiction', id: 2 },
+  { title: 'Moneyball', category: 'nonfiction', id: 3 },
+];
+
+export default function BookList() {
+  const listItems = books.map(book =>
+    <li>
+      {book.title}
+    </li>
+  );
+
+  return (
+    <ul>{listItems}</ul>
+  );
+}
+"""
+
+
+# ----------------------------------------------------------------
+# ------------- Coding / Planning Example ------------------------
+# ----------------------------------------------------------------
+PLANNING_PROMPT = """
+I want to build a Python app that takes user questions and looks 
+them up in a database where they are mapped to answers. If there 
+is close match, it retrieves the matched answer. If there isn't, 
+it asks the user to provide an answer and stores the 
+question/answer pair in the database. Make a plan for the directory 
+structure you'll need, then return each file in full. Only supply 
+your reasoning at the beginning and end, not throughout the code.
+"""
+
+
+# ------------------------------------------------------------------------
+# ------------------ STEM Research Example -------------------------------
+# ------------------------------------------------------------------------
+STEM_PROMPT = """
+What are three compounds we should consider investigating to 
+advance research into new antibiotics? Why should we consider 
+them?
+"""
+
+
+def ask_reasoning_model(prompt, client=None):
+    client = client or get_client()
+    return client.responses.create(
+        model="o4-mini",
+        input=[
+            {
+                "role": "user",
+                "content": prompt,
+            }
+        ]
+    )
+
+
+def refactor_component(client=None):
+    return ask_reasoning_model(REFACTOR_PROMPT, client=client)
+
+
+def plan_app(client=None):
+    return ask_reasoning_model(PLANNING_PROMPT, client=client)
+
+
+def stem_research(client=None):
+    return ask_reasoning_model(STEM_PROMPT, client=client)
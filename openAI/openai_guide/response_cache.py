@@ -0,0 +1,204 @@
+# Opt-in client-side cache for calls that are repeated verbatim (the "capital of France" chat, the
+# CalendarEvent parse, the reasoning prompts, ...).
+# Wrap a client in CachedClient and pass it to any example; responses.create, chat.completions.create
+# and the .parse() helpers are answered from the cache when the same request was made before, and
+# everything else goes straight to the wrapped client:
+#
+#   cache = ResponseCache(ttl=24 * 3600, max_entries=500, path="responses.sqlite3")
+#   client = CachedClient(cache=cache)
+#   text.capital_population(client=client)    # API call
+#   text.capital_population(client=client)    # served from memory
+#   print(cache.stats)
+#
+# The key is a SHA-256 over a canonical JSON form of everything that affects the answer: endpoint,
+# model, messages/input, instructions, tools, response_format (a pydantic class counts by its JSON
+# schema) and sampling parameters. Streaming calls are never cached. Entries live in an in-memory LRU
+# and, if a path is given, in a SQLite file so they survive across runs; both tiers share the TTL and
+# are capped at max_entries. A hit returns a fresh SDK object of the same type as the original,
+# so .output_text, .choices[0].message and .parsed all work as usual.
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from ._client import get_client
+
+# Request options that don't change the answer and are left out of the key.
+_IGNORED_PARAMS = {"timeout", "extra_headers", "extra_query", "stream_options"}
+
+
+def _canonical(value):
+    from pydantic import BaseModel
+
+    if isinstance(value, type) and issubclass(value, BaseModel):
+        return {"pydantic_model": value.__name__, "schema": value.model_json_schema()}
+    if isinstance(value, BaseModel):
+        return _canonical(value.model_dump(mode="json", exclude_none=True))
+    if isinstance(value, dict):
+        return {str(key): _canonical(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return repr(value)
+
+
+def cache_key(endpoint, params):
+    params = {key: value for key, value in params.items() if key not in _IGNORED_PARAMS}
+    canonical = json.dumps({"endpoint": endpoint, "params": _canonical(params)}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    def __init__(self, ttl=3600.0, max_entries=1024, path=None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stats = {"hits": 0, "misses": 0, "memory_hits": 0, "disk_hits": 0, "expired": 0, "evictions": 0}
+        self._memory = OrderedDict()  # key -> (expires_at, response)
+        self._lock = threading.Lock()
+        self._db = None
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, endpoint TEXT, payload TEXT, expires_at REAL, last_used REAL)"
+            )
+            self._db.commit()
+
+    @property
+    def hit_rate(self):
+        total = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / total if total else 0.0
+
+    def get(self, key, endpoint, response_format=None):
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._memory.move_to_end(key)
+                    self.stats["hits"] += 1
+                    self.stats["memory_hits"] += 1
+                    return entry[1].model_copy(deep=True)
+                del self._memory[key]
+                self.stats["expired"] += 1
+            if self._db is not None:
+                row = self._db.execute("SELECT payload, expires_at FROM responses WHERE key = ?", (key,)).fetchone()
+                if row is not None and row[1] > now:
+                    self._db.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+                    self._db.commit()
+                    response = _load(endpoint, row[0], response_format)
+                    self._remember(key, row[1], response)
+                    self.stats["hits"] += 1
+                    self.stats["disk_hits"] += 1
+                    return response.model_copy(deep=True)
+                if row is not None:
+                    self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._db.commit()
+                    self.stats["expired"] += 1
+            self.stats["misses"] += 1
+            return None
+
+    def put(self, key, endpoint, response):
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            self._remember(key, expires_at, response.model_copy(deep=True))
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                    (key, endpoint, response.model_dump_json(serialize_as_any=True), expires_at, time.time()),
+                )
+                # Drop expired rows, then the least recently used ones over the cap.
+                self._db.execute("DELETE FROM responses WHERE expires_at <= ?", (time.time(),))
+                self._db.execute(
+                    "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+                self._db.commit()
+
+    def _remember(self, key, expires_at, response):
+        self._memory[key] = (expires_at, response)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+def _load(endpoint, payload, response_format):
+    # Rebuilds the SDK object a cached call originally returned. Like the SDK itself, responses are built
+    # without strict validation: a dump contains fields (None usage details, ...) that validation rejects.
+    from openai._models import construct_type
+
+    if endpoint == "responses.create":
+        from openai.types.responses import Response
+        return construct_type(type_=Response, value=json.loads(payload))
+    if endpoint == "chat.completions.parse":
+        from openai.types.chat import ParsedChatCompletion
+        return ParsedChatCompletion[response_format].model_validate_json(payload)
+    from openai.types.chat import ChatCompletion
+    return construct_type(type_=ChatCompletion, value=json.loads(payload))
+
+
+class _CachedMethod:
+    def __init__(self, cache, endpoint, method):
+        self._cache = cache
+        self._endpoint = endpoint
+        self._method = method
+
+    def __call__(self, **params):
+        if params.get("stream"):
+            return self._method(**params)
+        key = cache_key(self._endpoint, params)
+        response = self._cache.get(key, self._endpoint, params.get("response_format"))
+        if response is None:
+            response = self._method(**params)
+            self._cache.put(key, self._endpoint, response)
+        return response
+
+
+class _Namespace:
+    # Stands in for one level of the client (client.chat, client.beta.chat.completions, ...): the listed
+    # attributes are cached wrappers or deeper namespaces, anything else comes from the wrapped object.
+    def __init__(self, wrapped, attributes):
+        self._wrapped = wrapped
+        self.__dict__.update(attributes)
+
+    def __getattr__(self, name):
+        return getattr(self._wrapped, name)
+
+
+class CachedClient(_Namespace):
+    def __init__(self, client=None, cache=None):
+        client = client or get_client()
+        cache = cache or ResponseCache()
+        parse = _CachedMethod(cache, "chat.completions.parse", client.beta.chat.completions.parse)
+        completions = _Namespace(client.chat.completions, {
+            "create": _CachedMethod(cache, "chat.completions.create", client.chat.completions.create),
+            "parse": parse,
+        })
+        super().__init__(client, {
+            "cache": cache,
+            "responses": _Namespace(client.responses, {
+                "create": _CachedMethod(cache, "responses.create", client.responses.create),
+            }),
+            "chat": _Namespace(client.chat, {"completions": completions}),
+            "beta": _Namespace(client.beta, {
+                "chat": _Namespace(client.beta.chat, {
+                    "completions": _Namespace(client.beta.chat.completions, {"parse": parse}),
+                }),
+            }),
+        })
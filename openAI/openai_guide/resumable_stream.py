@@ -0,0 +1,83 @@
+# Streams of background responses that survive dropped connections.
+# A background response keeps generating on the server when the connection streaming it drops, and every
+# streamed event carries a sequence_number. ResumableStream iterates a stream like the SDK's own, and
+# when the connection breaks (or ends before a terminal event) it reconnects with
+# client.responses.retrieve(id, stream=True, starting_after=cursor), skips any event it has already
+# yielded, and carries on - the caller sees one uninterrupted stream:
+#
+#   stream = client.responses.create(model="o3", input=prompt, background=True, stream=True)
+#   for event in ResumableStream(client, stream):
+#       ...
+#
+# Reconnects back off exponentially with full jitter (a random wait between 0 and
+# min(max_delay, base_delay * 2**attempt)), so many clients that lost the same network don't retry in
+# lockstep; the attempt counter resets whenever an event gets through. To pick up a stream in a new
+# process, pass stream=None with the response_id and the last cursor.
+import random
+import time
+
+from ._client import get_client
+
+TERMINAL_EVENTS = {"response.completed", "response.failed", "response.incomplete", "response.cancelled", "error"}
+
+
+class ResumableStream:
+    def __init__(self, client=None, stream=None, response_id=None, cursor=None, max_reconnects=8,
+                 base_delay=0.5, max_delay=15.0, on_reconnect=None):
+        if stream is None and response_id is None:
+            raise ValueError("pass the stream to wrap, or the response_id to resume")
+        self.client = client or get_client()
+        self.response_id = response_id
+        self.cursor = cursor  # sequence_number of the last event yielded
+        self.max_reconnects = max_reconnects
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.on_reconnect = on_reconnect
+        self.stats = {"events": 0, "reconnects": 0, "duplicates": 0, "waited": 0.0}
+        self._stream = stream
+
+    def __iter__(self):
+        import httpx
+        import openai
+
+        attempt = 0
+        while True:
+            stream = None
+            try:
+                stream = self._stream if self._stream is not None else self._reconnect()
+                self._stream = None
+                for event in stream:
+                    if self.response_id is None and getattr(event, "response", None) is not None:
+                        self.response_id = event.response.id
+                    number = getattr(event, "sequence_number", None)
+                    if number is not None and self.cursor is not None and number <= self.cursor:
+                        self.stats["duplicates"] += 1
+                        continue
+                    if number is not None:
+                        self.cursor = number
+                    attempt = 0
+                    self.stats["events"] += 1
+                    yield event
+                    if getattr(event, "type", None) in TERMINAL_EVENTS:
+                        return
+                error = ConnectionError("the stream ended before the response finished")
+            except (httpx.TransportError, openai.APIConnectionError, openai.InternalServerError) as e:
+                error = e
+            finally:
+                if stream is not None and hasattr(stream, "close"):
+                    stream.close()
+            if self.response_id is None:
+                raise ConnectionError("the stream dropped before the response id was known; it can't be resumed") from error
+            attempt += 1
+            if attempt > self.max_reconnects:
+                raise error
+            delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+            self.stats["reconnects"] += 1
+            self.stats["waited"] += delay
+            if self.on_reconnect is not None:
+                self.on_reconnect(attempt, self.cursor, error)
+            time.sleep(delay)
+
+    def _reconnect(self):
+        kwargs = {} if self.cursor is None else {"starting_after": self.cursor}
+        return self.client.responses.retrieve(self.response_id, stream=True, **kwargs)
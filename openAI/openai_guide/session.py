@@ -0,0 +1,99 @@
+# A Responses API conversation that picks how to carry its state from turn to turn.
+# chain_responses sends only the new input and points at the stored previous response
+# (previous_response_id); tell_jokes resends the whole history. Chaining keeps requests small, but it
+# needs the previous response to still be stored: not with store=False, and not after the 30-day
+# retention. Session keeps a local copy of the conversation (a ConversationStore) either way and, per turn:
+#
+#   server  chains with previous_response_id while the last response is stored and fresh
+#   local   replays the local history; used for store=False, when the last response is older than the
+#           retention period, when the server no longer knows it (the turn is retried from the local
+#           copy), and - in "auto" mode - when the server-side context has grown past the history's
+#           token budget, since a compacted replay is then cheaper than chaining on the full context.
+#           The next turn chains from the replayed response again.
+#
+#   session = Session(model="gpt-4o-mini")
+#   session.ask("tell me a joke")
+#   session.ask("explain why is this funny")
+#   session.stats   # turns by mode, fallbacks, request bytes sent and input tokens billed
+import time
+
+from ._client import get_client
+
+AUTO = "auto"
+SERVER = "server"
+LOCAL = "local"
+
+RETENTION_SECONDS = 30 * 24 * 3600
+
+
+def _previous_response_missing(error):
+    return getattr(error, "code", None) == "previous_response_not_found" or (
+        getattr(error, "status_code", None) == 404 and "previous_response_id" in str(error)
+    )
+
+
+class Session:
+    def __init__(self, client=None, model="gpt-4o-mini", mode=AUTO, store=True, history=None,
+                 instructions=None, retention=RETENTION_SECONDS):
+        from .history import ConversationStore
+
+        if mode not in (AUTO, SERVER, LOCAL):
+            raise ValueError(f"mode must be {AUTO!r}, {SERVER!r} or {LOCAL!r}, not {mode!r}")
+        self.client = client or get_client()
+        self.model = model
+        self.mode = mode
+        self.store = store
+        self.history = history if history is not None else ConversationStore(budget=100_000)
+        self.instructions = instructions
+        self.retention = retention
+        self.last_response = None
+        self.stats = {"turns": 0, "server_turns": 0, "local_turns": 0, "fallbacks": 0, "bytes_sent": 0,
+                      "input_tokens": 0}
+
+    def _can_chain(self):
+        if self.mode == LOCAL or not self.store or self.last_response is None:
+            return False
+        if time.time() - self.last_response.created_at > self.retention:
+            return False
+        if self.mode == AUTO and self.last_response.usage is not None:
+            # Chaining bills the whole stored context; past the budget a compacted replay costs less.
+            return self.last_response.usage.total_tokens <= self.history.budget
+        return True
+
+    def ask(self, text, **kwargs):
+        import openai
+
+        message = {"role": "user", "content": text}
+        self.history.append(message)
+        try:
+            response = None
+            if self._can_chain():
+                try:
+                    response = self._create(input=[message], previous_response_id=self.last_response.id, **kwargs)
+                    self.stats["server_turns"] += 1
+                except (openai.BadRequestError, openai.NotFoundError) as e:
+                    if not _previous_response_missing(e):
+                        raise
+                    self.stats["fallbacks"] += 1
+            if response is None:
+                self.history.compact()
+                response = self._create(input=self.history.messages(), **kwargs)
+                self.stats["local_turns"] += 1
+        except BaseException:
+            # No reply to store, so take the question back: the next ask() mustn't replay two user turns.
+            self.history.pop(message)
+            raise
+        self.stats["turns"] += 1
+        if response.usage is not None:
+            self.stats["input_tokens"] += response.usage.input_tokens
+        self.history.append({"role": "assistant", "content": response.output_text})
+        self.last_response = response
+        return response
+
+    def _create(self, **params):
+        if self.instructions is not None:
+            # Instructions aren't carried over by previous_response_id, so they go with every request.
+            params.setdefault("instructions", self.instructions)
+        raw = self.client.responses.with_raw_response.create(model=self.model, store=self.store, **params)
+        self.stats["bytes_sent"] += len(raw.http_request.content)
+        return raw.parse()
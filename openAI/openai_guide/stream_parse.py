@@ -0,0 +1,196 @@
+# Incremental parsing of streamed structured outputs.
+# The SDK's stream helper re-parses the whole accumulated JSON on every content.delta to give a partial
+# `parsed` snapshot, so the work over a stream grows with the square of its length, and nothing is
+# validated until get_final_completion(). IncrementalJSONParser looks at each character once and reports
+# every value as soon as its closing token arrives; StreamingModelParser turns those into validated
+# pieces of a pydantic model, e.g. each entry of EntitiesModel.colors the moment its closing quote
+# streams in:
+#
+#   parser = StreamingModelParser(EntitiesModel)
+#   for chunk in client.chat.completions.create(..., stream=True):
+#       for item in parser.feed(chunk.choices[0].delta.content or ""):
+#           print(item.field, item.index, item.value)    # "colors", 0, "blue"
+#   entities = parser.result()
+#
+# Only the JSON text is needed, so the parsers work with any stream: Chat Completions deltas, Responses
+# API response.output_text.delta events, or a file read in pieces.
+import json
+import re
+import typing
+from dataclasses import dataclass
+
+_STRING_SPECIAL = re.compile(r'["\\]')
+_WHITESPACE = " \t\r\n"
+_LITERAL_END = ",]} \t\r\n"
+
+
+class IncrementalJSONParser:
+    # feed() returns a list of (path, value) for the values completed by that chunk, where path is the
+    # tuple of keys/indices leading to the value ((): the document itself). Values nested deeper than
+    # max_depth are still built but not reported.
+    def __init__(self, max_depth=None):
+        self.max_depth = max_depth
+        self.done = False
+        self.value = None
+        self._stack = []  # frames: [container, path, key, expecting_key]
+        self._string = None  # raw pieces of the string being read
+        self._escape = False
+        self._literal = None  # characters of the number/true/false/null being read
+        self._events = []
+
+    def feed(self, chunk):
+        self._events = []
+        i, n = 0, len(chunk)
+        while i < n:
+            if self._string is not None:
+                i = self._read_string(chunk, i)
+                continue
+            if self._literal is not None:
+                end = i
+                while end < n and chunk[end] not in _LITERAL_END:
+                    end += 1
+                self._literal.append(chunk[i:end])
+                if end == n:
+                    break
+                self._end_literal()
+                i = end
+                continue
+            char = chunk[i]
+            i += 1
+            if char in _WHITESPACE:
+                continue
+            if char == '"':
+                self._string = []
+            elif char in "{[":
+                path = self._child_path()
+                container = {} if char == "{" else []
+                self._stack.append([container, path, None, char == "{"])
+            elif char in "}]":
+                container, path, _, _ = self._stack.pop()
+                self._complete(container, path)
+            elif char == ",":
+                frame = self._stack[-1]
+                frame[3] = isinstance(frame[0], dict)
+            elif char == ":":
+                pass
+            elif self.done:
+                raise ValueError(f"unexpected {char!r} after the end of the JSON document")
+            else:
+                self._literal = [char]
+        return self._events
+
+    def close(self):
+        # Ends the stream: flushes a trailing top-level number and checks the document was complete.
+        self._events = []
+        if self._literal is not None:
+            self._end_literal()
+        if not self.done:
+            raise ValueError("the stream ended in the middle of a JSON document")
+        return self._events
+
+    def _read_string(self, chunk, i):
+        if self._escape:
+            # A backslash at the end of the previous chunk: this character is escaped.
+            self._string.append(chunk[i])
+            self._escape = False
+            i += 1
+        while True:
+            match = _STRING_SPECIAL.search(chunk, i)
+            if match is None:
+                self._string.append(chunk[i:])
+                return len(chunk)
+            end = match.start()
+            if chunk[end] == "\\":
+                if end + 1 == len(chunk):
+                    self._string.append(chunk[i:])
+                    self._escape = True
+                    return len(chunk)
+                self._string.append(chunk[i:end + 2])
+                i = end + 2
+                continue
+            self._string.append(chunk[i:end])
+            raw, self._string = "".join(self._string), None
+            self._end_string(json.loads('"' + raw + '"') if "\\" in raw else raw)
+            return end + 1
+
+    def _end_string(self, value):
+        frame = self._stack[-1] if self._stack else None
+        if frame is not None and frame[3]:
+            frame[2], frame[3] = value, False
+        else:
+            self._complete(value, self._child_path())
+
+    def _end_literal(self):
+        text, self._literal = "".join(self._literal), None
+        self._complete(json.loads(text), self._child_path())
+
+    def _child_path(self):
+        if not self._stack:
+            return ()
+        container, path, key, _ = self._stack[-1]
+        return path + ((key if isinstance(container, dict) else len(container)),)
+
+    def _complete(self, value, path):
+        if self._stack:
+            container, _, key, _ = self._stack[-1]
+            if isinstance(container, dict):
+                container[key] = value
+            else:
+                container.append(value)
+        else:
+            self.done, self.value = True, value
+        if self.max_depth is None or len(path) <= self.max_depth:
+            self._events.append((path, value))
+
+
+@dataclass
+class StreamItem:
+    field: str
+    index: typing.Optional[int]  # position in a list field, None for a whole field
+    value: typing.Any
+
+
+class StreamingModelParser:
+    # Reports each top-level field of `model` once it is complete and, for list fields, each entry as
+    # soon as it closes, validated against the field's (item) type.
+    def __init__(self, model):
+        from pydantic import TypeAdapter
+
+        self.model = model
+        self._parser = IncrementalJSONParser(max_depth=2)
+        self._fields = {}
+        self._items = {}
+        for name, field in model.model_fields.items():
+            key = field.alias or name
+            self._fields[key] = (name, TypeAdapter(field.annotation))
+            if typing.get_origin(field.annotation) in (list, typing.List):
+                (item_type,) = typing.get_args(field.annotation) or (typing.Any,)
+                self._items[key] = (name, TypeAdapter(item_type))
+        self.values = {}  # field name -> validated value of each completed field
+        self.items = {name: [] for name, _ in self._items.values()}  # list field -> validated entries so far
+
+    def feed(self, delta):
+        items = []
+        for path, value in self._parser.feed(delta):
+            if len(path) == 2 and path[0] in self._items:
+                name, adapter = self._items[path[0]]
+                item = adapter.validate_python(value)
+                self.items[name].append(item)
+                items.append(StreamItem(name, path[1], item))
+            elif len(path) == 1 and path[0] in self._fields:
+                name, adapter = self._fields[path[0]]
+                if name in self.items:
+                    # The entries were validated one by one already.
+                    self.values[name] = list(self.items[name])
+                    continue
+                self.values[name] = adapter.validate_python(value)
+                items.append(StreamItem(name, None, self.values[name]))
+        return items
+
+    def partial(self):
+        # The model as far as it has streamed, without validating missing fields.
+        return self.model.model_construct(**{**self.items, **self.values})
+
+    def result(self):
+        self._parser.close()
+        return self.model.model_validate(self._parser.value)
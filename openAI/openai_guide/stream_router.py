@@ -0,0 +1,187 @@
+# Routes the events of a streamed response to handlers registered per event type.
+# stream_tongue_twister just prints every event. A StreamRouter calls the handlers registered for each
+# event's type ("*" matches any type), and hands the text to text sinks in chunks of at least
+# `flush_size` characters instead of one call per token:
+#
+#   router = StreamRouter(flush_size=64)
+#   router.on_text(websocket.send)                     # coalesced text, on a writer thread
+#   router.on("response.completed", lambda event: save(event.response))
+#   router.on("error", lambda event: log.error(event.message))
+#   metrics = router.consume(client.responses.create(model="gpt-4.1", input=prompt, stream=True))
+#   print(metrics.summary())                           # time to first token, inter-token latency, ...
+#
+# Text sinks run on a writer thread behind a queue of at most `max_pending` chunks, so a slow sink
+# doesn't hold up reading the stream. While the queue is full, new text is merged into the chunk being
+# built instead of queued; only when that chunk reaches `max_buffer` characters does the reader block
+# until the sink catches up (which, by no longer reading the socket, slows the server down too).
+# Event handlers run inline on the reading thread and should be quick. They may run before earlier text has
+# reached the sinks; consume() returns only once the sinks have had all of it.
+import queue
+import statistics
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+TEXT_DELTA = "response.output_text.delta"
+# Events after which any buffered text is flushed: the end of a text part or of the response.
+_FLUSH_ON = {"response.output_text.done", "response.completed", "response.incomplete", "response.failed", "error"}
+
+
+@dataclass
+class StreamMetrics:
+    started_at: float
+    first_token_at: float = None
+    finished_at: float = None
+    events: int = 0
+    deltas: int = 0
+    characters: int = 0
+    flushes: int = 0
+    merged_while_busy: int = 0  # flushes folded into the next chunk because the sink queue was full
+    blocked_seconds: float = 0.0  # time the reader waited for the sink (backpressure)
+    gaps: list = field(default_factory=list)  # seconds between consecutive text deltas
+
+    @property
+    def time_to_first_token(self):
+        return None if self.first_token_at is None else self.first_token_at - self.started_at
+
+    def inter_token_latency(self):
+        # (mean, p50, p95, max) of the gaps between text deltas, in seconds.
+        if not self.gaps:
+            return None
+        gaps = sorted(self.gaps)
+        return statistics.fmean(gaps), gaps[len(gaps) // 2], gaps[int(len(gaps) * 0.95)], gaps[-1]
+
+    def summary(self):
+        ttft = self.time_to_first_token
+        parts = [f"{self.events} events, {self.deltas} deltas -> {self.flushes} flushes"]
+        if ttft is not None:
+            parts.append(f"TTFT {ttft * 1000:.0f} ms")
+        latency = self.inter_token_latency()
+        if latency is not None:
+            parts.append("inter-token mean/p50/p95/max {:.1f}/{:.1f}/{:.1f}/{:.1f} ms".format(*(x * 1000 for x in latency)))
+        if self.merged_while_busy or self.blocked_seconds:
+            parts.append(f"{self.merged_while_busy} merged while the sink was busy, blocked {self.blocked_seconds:.2f} s")
+        return ", ".join(parts)
+
+
+class StreamRouter:
+    def __init__(self, flush_size=64, max_pending=8, max_buffer=16384):
+        self.flush_size = flush_size
+        self.max_pending = max_pending
+        self.max_buffer = max_buffer
+        self._handlers = defaultdict(list)
+        self._text_sinks = []
+
+    def on(self, event_type, handler=None):
+        # router.on("response.completed", handler), or as a decorator: @router.on("error")
+        if handler is None:
+            return lambda handler: self.on(event_type, handler) or handler
+        self._handlers[event_type].append(handler)
+
+    def on_text(self, sink):
+        self._text_sinks.append(sink)
+        return sink
+
+    def consume(self, stream, started_at=None):
+        # Reads the whole stream and returns its StreamMetrics. started_at (a time.perf_counter() value)
+        # lets the time to first token include the request itself; by default it's measured from here.
+        metrics = StreamMetrics(started_at=started_at if started_at is not None else time.perf_counter())
+        writer = _SinkWriter(self._text_sinks, self.max_pending) if self._text_sinks else None
+        buffer, buffered = [], 0
+        last_delta_at = None
+        try:
+            for event in stream:
+                now = time.perf_counter()
+                metrics.events += 1
+                event_type = getattr(event, "type", None)
+                if event_type == TEXT_DELTA:
+                    if last_delta_at is None:
+                        metrics.first_token_at = now
+                    else:
+                        metrics.gaps.append(now - last_delta_at)
+                    last_delta_at = now
+                    metrics.deltas += 1
+                    metrics.characters += len(event.delta)
+                    if writer is not None:
+                        buffer.append(event.delta)
+                        buffered += len(event.delta)
+                        if buffered >= self.flush_size and self._flush(writer, buffer, buffered, metrics):
+                            buffer, buffered = [], 0
+                elif event_type in _FLUSH_ON and writer is not None and buffer:
+                    self._flush(writer, buffer, buffered, metrics, force=True)
+                    buffer, buffered = [], 0
+                for handler in self._handlers.get(event_type, ()):
+                    handler(event)
+                for handler in self._handlers.get("*", ()):
+                    handler(event)
+            if writer is not None and buffer:
+                self._flush(writer, buffer, buffered, metrics, force=True)
+        except BaseException:
+            if writer is not None:
+                try:
+                    writer.close()
+                except Exception:
+                    pass  # a failing sink must not hide the error that stopped the stream
+            raise
+        if writer is not None:
+            writer.close()
+        metrics.finished_at = time.perf_counter()
+        return metrics
+
+    def _flush(self, writer, buffer, buffered, metrics, force=False):
+        # Queues the buffered text; returns False if it was kept to be merged with the next deltas.
+        chunk = "".join(buffer)
+        if writer.offer(chunk):
+            metrics.flushes += 1
+            return True
+        if not force and buffered < self.max_buffer:
+            buffer[:] = [chunk]
+            metrics.merged_while_busy += 1
+            return False
+        start = time.perf_counter()
+        writer.put(chunk)
+        metrics.blocked_seconds += time.perf_counter() - start
+        metrics.flushes += 1
+        return True
+
+
+class _SinkWriter:
+    # Feeds text chunks to the sinks on a background thread.
+    _DONE = object()
+
+    def __init__(self, sinks, max_pending):
+        self._sinks = sinks
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._error = None
+        self._thread = threading.Thread(target=self._run, name="stream-sink", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            chunk = self._queue.get()
+            if chunk is self._DONE:
+                return
+            if self._error is not None:
+                continue
+            try:
+                for sink in self._sinks:
+                    sink(chunk)
+            except BaseException as e:  # reported to the reader in close()
+                self._error = e
+
+    def offer(self, chunk):
+        try:
+            self._queue.put_nowait(chunk)
+        except queue.Full:
+            return False
+        return True
+
+    def put(self, chunk):
+        self._queue.put(chunk)
+
+    def close(self):
+        self._queue.put(self._DONE)
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
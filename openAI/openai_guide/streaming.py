@@ -0,0 +1,60 @@
+from ._client import get_client
+
+
+# ==================================================================
+# ======== Streaming API Response ==================================
+# ==================================================================
+def stream_tongue_twister(client=None, on_event=None):
+    # Returns the list of events received; on_event is called with each one as it arrives.
+    client = client or get_client()
+    stream = client.responses.create(
+        model="gpt-4.1",
+        input=[
+            {
+                "role": "user",
+                "content": "Say 'double bubble bath' ten times fast."
+            }
+        ],
+        stream=True
+    )
+    events = []
+    for event in stream:
+        if on_event is not None:
+            on_event(event)
+        events.append(event)
+    return events
+# Common events to listen for when streaming text are:
+# - `response.created`
+# - `response.output_text.delta`
+# - `response.completed`
+# - `error`
+
+
+# Instead of handling every event in one loop, a StreamRouter dispatches them by type, hands the text to
+# sinks in coalesced chunks, and measures time to first token and inter-token latency.
+def route_tongue_twister(router=None, client=None):
+    # Returns the StreamMetrics of the stream; by default the text is printed as it arrives.
+    import time
+
+    from .stream_router import StreamRouter
+
+    client = client or get_client()
+    printing = router is None
+    if printing:
+        router = StreamRouter(flush_size=32)
+        router.on_text(lambda text: print(text, end="", flush=True))
+    started_at = time.perf_counter()
+    stream = client.responses.create(
+        model="gpt-4.1",
+        input=[
+            {
+                "role": "user",
+                "content": "Say 'double bubble bath' ten times fast."
+            }
+        ],
+        stream=True
+    )
+    metrics = router.consume(stream, started_at=started_at)
+    if printing:
+        print()  # consume() has waited for the writer thread, so this comes after the last of the text
+    return metrics
@@ -0,0 +1,141 @@
+# Uploading a remote file without holding it in memory.
+# create_file used to download the whole URL into a BytesIO before the upload could start. RangeDownload
+# is a read-only file object over a download that runs on its own thread: it fills a bounded queue of
+# chunks (buffer_size bytes at most) while the multipart upload reads from the other end, so download and
+# upload overlap and memory stays at about one buffer however large the file is.
+#
+#   file_id = upload_from_url("https://example.com/big.pdf", purpose="assistants")
+#
+# When the download connection drops, it is resumed where it stopped with a Range request (guarded by
+# If-Range on the ETag, so a file that changed in the meantime is not stitched together from two
+# versions), backing off with jitter between attempts. The upload itself can't be replayed from a
+# stream, so it is sent without SDK retries; a failed upload raises and is started over by the caller.
+import hashlib
+import os
+import queue
+import random
+import threading
+import time
+from io import RawIOBase
+from urllib.parse import urlsplit
+
+from ._client import get_client
+
+CHUNK_SIZE = 256 * 1024
+BUFFER_SIZE = 4 * 1024 * 1024
+
+
+class RangeDownload(RawIOBase):
+    def __init__(self, url, chunk_size=CHUNK_SIZE, buffer_size=BUFFER_SIZE, max_resumes=5, base_delay=0.5,
+                 max_delay=10.0, http_client=None):
+        from .transport import get_http_client
+
+        self.url = url
+        self.name = os.path.basename(urlsplit(url).path) or "download"
+        self.chunk_size = chunk_size
+        self.max_resumes = max_resumes
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.sha256 = hashlib.sha256()  # of every byte read so far
+        self.stats = {"bytes": 0, "resumes": 0, "max_buffered": 0}
+        self._http = http_client or get_http_client()
+        self._chunks = queue.Queue(maxsize=max(1, buffer_size // chunk_size))
+        self._pending = memoryview(b"")
+        self._done = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._download, name="range-download", daemon=True)
+        self._thread.start()
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while not self._pending:
+            if self._done:
+                return 0
+            item = self._chunks.get()
+            if item is None:
+                self._done = True
+                return 0
+            if isinstance(item, BaseException):
+                self._done = True
+                raise item
+            self._pending = memoryview(item)
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self.sha256.update(self._pending[:size])
+        self._pending = self._pending[size:]
+        return size
+
+    def close(self):
+        self._stop.set()
+        super().close()
+
+    def _put(self, item):
+        # Blocks while the buffer is full; gives up once the reader is closed.
+        while not self._stop.is_set():
+            try:
+                self._chunks.put(item, timeout=0.1)
+                self.stats["max_buffered"] = max(self.stats["max_buffered"], self._chunks.qsize())
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _download(self):
+        import httpx
+
+        offset, etag, attempt = 0, None, 0
+        while True:
+            # identity encoding, so Range offsets count the same bytes we count
+            headers = {"Accept-Encoding": "identity"}
+            if offset:
+                headers["Range"] = f"bytes={offset}-"
+                if etag:
+                    headers["If-Range"] = etag
+            try:
+                with self._http.stream("GET", self.url, headers=headers) as response:
+                    response.raise_for_status()
+                    if offset and response.status_code != 206:
+                        raise OSError(f"{self.url} changed or can't be resumed (HTTP {response.status_code} to a Range request)")
+                    etag = etag or response.headers.get("ETag")
+                    for chunk in response.iter_raw(self.chunk_size):
+                        if not self._put(chunk):
+                            return
+                        offset += len(chunk)
+                        self.stats["bytes"] = offset
+                        attempt = 0
+                self._put(None)
+                return
+            except httpx.TransportError as e:
+                attempt += 1
+                if attempt > self.max_resumes:
+                    self._put(e)
+                    return
+                self.stats["resumes"] += 1
+                time.sleep(random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1))))
+            except Exception as e:
+                self._put(e)
+                return
+
+
+def upload_from_url(url, client=None, purpose="assistants", filename=None, **download_options):
+    # Streams `url` into client.files.create and returns the new file's id.
+    client = client or get_client()
+    download = RangeDownload(url, **download_options)
+    try:
+        file = client.with_options(max_retries=0).files.create(file=(filename or download.name, download), purpose=purpose)
+    finally:
+        download.close()
+    return file.id
+
+
+def download_to(url, file, **download_options):
+    # Streams `url` into an open binary file; returns the hex SHA-256 of what was written.
+    download = RangeDownload(url, **download_options)
+    try:
+        for chunk in iter(lambda: download.read(download.chunk_size), b""):
+            file.write(chunk)
+    finally:
+        download.close()
+    return download.sha256.hexdigest()
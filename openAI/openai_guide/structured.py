@@ -0,0 +1,420 @@
+from enum import Enum
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from ._client import get_client
+
+
+# =================================================================================
+# ============== Structured Output ================================================
+# =================================================================================
+# Structured output is a feature that allows you to get responses in a specific format, like JSON or XML.
+# This is useful for tasks where you need the model to return data in a structured way.
+# To use structured output, you need to specify the format you want the response in.
+# Some benefits of Structured Outputs include:
+#   - Reliable type-safety: No need to validate or retry incorrectly formatted responses
+#   - Explicit refusals: Safety-based model refusals are now programmatically detectable
+#   - Simpler prompting: No need for strongly worded prompts to achieve consistent formatting
+# Note: The structured output feature is currently in beta, so it may not be available in all models or versions.
+
+
+class CalendarEvent(BaseModel):
+    name: str
+    date: str
+    participants: list[str]
+
+
+def extract_calendar_event(
+    text="I have a meeting with Alice and Bob on Friday 2025-06-06 around 10:00 AM.",
+    client=None,
+):
+    client = client or get_client()
+    return client.beta.chat.completions.parse(
+        model="gpt-4o",
+        messages=[
+            {
+                "role": "system",
+                "content": "Extract the calendar event details from the user's message and return it in JSON format."
+            },
+            {
+                "role": "user",
+                "content": text
+            }
+        ],
+        response_format=CalendarEvent  # Specify the format you want the response in
+    )
+# -------------------------------------------------------------------------------------------------------------
+#                          Structured Outputs                         |               JSON Mode               
+# -------------------------------------------------------------------------------------------------------------
+# Outputs valid JSON  |                 Yes                           |                 Yes
+# Adheres to schema   |                 Yes                           |                 No
+# Compatible models   |   gpt-4o-mini gpt-4o-2024-08-06, and later	  |     gpt-3.5-turbo, gpt-4-* and gpt-4o-* models
+# Enabling            |   response_format: { type: "json_schema",     |     response_format: { type: "json_object" }
+#                     |         json_schema: {"strict": true          |
+#                     |         , "schema": ...} }                    |       
+# --------------------------------------------------------------------------------------------------------------
+
+
+
+
+
+# -------------------------------------------------------
+# ----------- Chain of thought --------------------------
+# -------------------------------------------------------
+# You can ask the model to output an answer in a structured, step-by-step way, to guide the user through the solution.
+class Step(BaseModel):
+    explanation: str
+    output: str
+
+class MathReasoning(BaseModel):
+    steps: list[Step]
+    final_answer: str
+
+
+def solve_math(problem="how can I solve 8x + 7 = -23?", client=None):
+    client = client or get_client()
+    return client.beta.chat.completions.parse(
+        model="gpt-4o",
+        messages=[
+            {
+                "role": "system",
+                "content": "You are a helpful math tutor. Solve the math problem step by step and return the reasoning in a structured format."
+            },
+            {
+                "role": "user",
+                "content": problem
+            }
+        ],
+        response_format=MathReasoning  # Specify the format you want the response in
+    )
+
+# Output will be a structured response with steps and final answer
+# Example output:
+# {
+#     "steps": [
+#         {
+#             "explanation": "We start with the equation 8x + 7 = -23. Our goal is to solve for x. First, we need to isolate the term with x (8x) on one side of the equation. To do this, we will eliminate the constant term (+7) from the left side by subtracting 7 from both sides.",
+#             "output": "8x + 7 - 7 = -23 - 7"
+#         },
+#         {
+#             "explanation": "When we subtract 7 from both sides, the equation simplifies. The left side becomes just 8x, as 7 - 7 is 0. On the right side, -23 - 7 equals -30.",
+#             "output": "8x = -30"
+#         },
+#         {
+#             "explanation": "Now, we need to solve for x by isolating it. Since 8x means 8 times x, we divide both sides of the equation by 8 to get x by itself.",
+#             "output": "8x / 8 = -30 / 8"
+#         },
+#         {
+#             "explanation": "Dividing both sides by 8 gives us x on the left side. On the right side, -30 divided by 8 simplifies to -3.75.",
+#             "output": "x = -3.75"
+#         }
+#     ],
+#     "final_answer": "x = -3.75"
+# }
+
+
+
+
+
+
+# --------------------------------------------------------------
+# ------------- Structred Data Extraction Example --------------
+# --------------------------------------------------------------
+class ResearchPaperExtraction(BaseModel):
+    title: str
+    authors: list[str]
+    abstract: str
+    keywords: list[str]
+
+
+SAMPLE_PAPER = """
+                            Title: Understanding AI in Healthcare. 
+                            Authors: John Doe, Jane Smith
+                            Abstract: This paper explores the impact of AI on healthcare systems.
+                            Keywords: AI, Healthcare, Systems
+                        """
+
+
+def extract_research_paper(text=SAMPLE_PAPER, client=None):
+    client = client or get_client()
+    return client.beta.chat.completions.parse(
+        model="gpt-4o",
+        messages=[
+            {
+                "role": "system",
+                "content": "You are an expert at structured data extraction. You will be given unstructured text from a research paper and should convert it into the given structure."
+            },
+            {
+                "role": "user",
+                "content": text
+            },
+        ],
+        response_format=ResearchPaperExtraction  # Specify the format you want the response in.
+    )
+
+# This example shows how to use structured output to extract information from unstructured text.
+# The model is instructed to extract the title, authors, abstract, and keywords from a research paper.
+# {
+#     "title": "Understanding AI in Healthcare",
+#     "authors": [
+#         "John Doe",
+#         "Jane Smith"
+#     ],
+#     "abstract": "This paper explores the impact of AI on healthcare systems.",
+#     "keywords": [
+#         "AI",
+#         "Healthcare",
+#         "Systems"
+#     ]
+# }
+
+
+
+
+# --------------------------------------------------
+# ----------- UI Generation ------------------------
+# --------------------------------------------------
+# This example shows how to use the OpenAI API to generate a simple UI layout.
+
+
+class UIType(str, Enum):
+    div="div"
+    button="button"
+    header="header"
+    section="section"
+    field="field"
+    form="form"
+
+class Attribute(BaseModel):
+    name: str
+    value: str
+
+class UI(BaseModel):
+    type: UIType
+    label: str
+    children: List['UI']
+    attribute: List[Attribute]
+UI.model_rebuild() # Rebuild the model to handle recursive types
+
+class UIResponse(BaseModel):
+    ui: UI
+
+
+def generate_ui(request="Make a User Profile Form", client=None):
+    client = client or get_client()
+    return client.beta.chat.completions.parse(
+        model="gpt-4o",
+        messages=[
+            {
+                "role": "system",
+                "content": "You are a UI generator AI. Convert the user input into a UI."
+            },
+            {
+                "role": "user",
+                "content": request
+            }
+        ],
+        response_format=UIResponse  # Specify the format you want the response in
+    )
+# This example shows how to use the OpenAI API to generate a simple UI layout.
+# The model is instructed to generate a UI for a user profile form.
+# The response will be a structured output with the UI components and their attributes.
+# Example output:
+# {"ui":{"type":"form","label":"User Profile Form","children":[{"type":"field","label":"First Name","children":[],"attribute":[{"name":"type","value":"text"},{"name":"name","value":"firstName"},{"name":"placeholder","value":"Enter your first name"}]},{"type":"field","label":"Last Name","children":[],"attribute":[{"name":"type","value":"text"},{"name":"name","value":"lastName"},{"name":"placeholder","value":"Enter your last name"}]},{"type":"field","label":"Email","children":[],"attribute":[{"name":"type","value":"email"},{"name":"name","value":"email"},{"name":"placeholder","value":"Enter your email"}]},{"type":"field","label":"Phone Number","children":[],"attribute":[{"name":"type","value":"tel"},{"name":"name","value":"phoneNumber"},{"name":"placeholder","value":"Enter your phone number"}]},{"type":"field","label":"Address","children":[],"attribute":[{"name":"type","value":"text"},{"name":"name","value":"address"},{"name":"placeholder","value":"Enter your address"}]},{"type":"button","label":"Submit","children":[],"attribute":[{"name":"type","value":"submit"}]}],"attribute":[{"name":"method","value":"post"},{"name":"action","value":"/submit-profile"}]}}
+
+
+
+
+
+
+
+# --------------------------------------------------------------------------------
+# ----------------------- Moderation ---------------------------------------------
+# --------------------------------------------------------------------------------
+class Category(str, Enum):
+    violence = "violence"
+    sexual = "sexual"
+    self_harm = "self_harm"
+
+class ContentCompliance(BaseModel):
+    is_voilation: bool
+    category: Optional[Category]
+    explanation_if_violating: Optional[str]
+
+
+SAMPLE_MODERATION_INPUT = "How do I prepare myself for a job interview? I want to be ready to answer any question, even if it involves violence or sexual content. I also want to know how to handle self-harm situations."
+
+
+def check_compliance(text=SAMPLE_MODERATION_INPUT, client=None):
+    client = client or get_client()
+    return client.beta.chat.completions.parse(
+        model="gpt-4o-2024-08-06",
+        messages=[
+            {
+                "role": "system",
+                "content": "Determine if the user input violates specific guidelines and explain if they do."
+            },
+            {
+                "role": "user",
+                "content": text
+            }
+        ],
+        response_format=ContentCompliance,  # Specify the format you want the response in
+    )
+# This example shows how to use the OpenAI API to check if a user input violates specific guidelines.
+# The model is instructed to determine if the user input violates guidelines related to violence, sexual content, or self-harm.
+# The response will be a structured output indicating whether the input violates guidelines and providing an explanation if it does.
+# Example output:
+# {
+#     "is_voilation": true,
+#     "category": "violence",
+#     "explanation_if_violating": "The statement expresses an intention to harm oneself and others, which is violent in nature. It also includes a desire to engage in illegal sexual activities with minors, which is harmful and unlawful."
+# }
+
+
+
+
+
+
+
+# ---------------------------------------------------------------
+# ------------------ Refusal with Structured Output -------------
+# ---------------------------------------------------------------
+class MathReasoningWithRefusal(BaseModel):
+    steps: List[Step]
+    final_answer: str
+    refusal: Optional[bool] = False
+    refusal_reason: Optional[str] = None
+
+
+def solve_with_refusal(text="How do I prepare for a job interview?", client=None):
+    client = client or get_client()
+    response = client.beta.chat.completions.parse(
+        model="gpt-4o",
+        messages=[
+            {
+                "role": "system",
+                "content": "Determine if the user input violates specific guidelines and explain if they do."
+            },
+            {
+                "role": "user",
+                "content": text
+            }
+        ],
+        response_format=MathReasoningWithRefusal  # Specify the format you want the response in
+    )
+    return response.choices[0].message.parsed # response.choices[0].message.content gives un-parsed version as string. 
+
+# IMPORTANT: 
+# The model will always try to adhere to the provided schema, which can result in hallucinations 
+# if the input is completely unrelated to the schema.
+
+
+
+
+# ----------------------------------------------------------------
+# ----------------------- Streaming Output Example ---------------
+# ----------------------------------------------------------------
+# This example shows how to use the OpenAI API to generate a streaming output.
+class EntitiesModel(BaseModel):
+    attributes: List[str]
+    colors: List[str]
+    animals: List[str]
+
+
+SAMPLE_ENTITIES_TEXT = "The quick brown fox jumps over the lazy dog with piercing blue eyes. The sky is blue and the grass is green."
+
+
+def stream_entities(text=SAMPLE_ENTITIES_TEXT, client=None, on_event=None):
+    # on_event is called with every stream event (content.delta, content.done, error, ...) as it arrives.
+    client = client or get_client()
+    with client.beta.chat.completions.stream(
+        model="gpt-4.1",
+        messages=[
+            {
+                "role": "system",
+                "content": "Extract the entities from the user's message and return them in a structured format."
+            },
+            {
+                "role": "user",
+                "content": text
+            }
+        ],
+        response_format=EntitiesModel  # Specify the format you want the response in
+    ) as stream:
+        for event in stream:
+            if on_event is not None:
+                on_event(event)
+    return stream.get_final_completion()
+
+
+# The stream helper above re-parses everything received so far on every delta, and the entities are only
+# usable once the stream ends. Streaming the raw chunks through a StreamingModelParser instead hands each
+# attribute/color/animal to on_item as soon as it is complete, doing constant work per character.
+def stream_entities_incrementally(text=SAMPLE_ENTITIES_TEXT, client=None, on_item=None):
+    import openai
+
+    from .stream_parse import StreamingModelParser
+
+    client = client or get_client()
+    parser = StreamingModelParser(EntitiesModel)
+    # pydantic_function_tool produces the same strict schema the .stream()/.parse() helpers send.
+    schema = openai.pydantic_function_tool(EntitiesModel)["function"]["parameters"]
+    stream = client.chat.completions.create(
+        model="gpt-4.1",
+        messages=[
+            {
+                "role": "system",
+                "content": "Extract the entities from the user's message and return them in a structured format."
+            },
+            {
+                "role": "user",
+                "content": text
+            }
+        ],
+        response_format={"type": "json_schema", "json_schema": {"name": "EntitiesModel", "schema": schema, "strict": True}},
+        stream=True,
+    )
+    for chunk in stream:
+        if not chunk.choices:
+            continue
+        for item in parser.feed(chunk.choices[0].delta.content or ""):
+            if on_item is not None:
+                on_item(item)
+    return parser.result()
+
+
+
+# -----------------------------------------------------------------
+# ---------------- Stream with function call Example --------------
+# -----------------------------------------------------------------
+class GetWeather(BaseModel):
+    city: str
+    country: str
+
+
+def stream_function_call(question="What's the weather like in SF and London?", client=None, on_event=None):
+    import openai
+
+    client = client or get_client()
+    with client.beta.chat.completions.stream(
+        model="gpt-4.1",
+        messages=[
+            {
+                "role": "system",
+                "content": "You are a helpful assistant that provides weather information."
+            },
+            {
+                "role": "user",
+                "content": question
+            }
+        ],
+        tools=[
+            openai.pydantic_function_tool(GetWeather, name="get_weather", description="Get the current weather for a city and country.")
+        ]
+    ) as stream:
+        for event in stream:
+            if on_event is not None:
+                on_event(event)
+    return stream.get_final_completion()
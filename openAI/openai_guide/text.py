@@ -0,0 +1,340 @@
+from ._client import get_client
+from .prompt_cache import PromptLayout
+
+
+#################################
+### """ Text and Prompting""" ###
+#################################
+
+
+# This style is older, simpler completion-style API. Input is plain text. It's not chat-based. 
+# There's no role (like "user", "assistant", or "system").
+# You're just sending a prompt and getting a single output. Think of it as talking at the model with one message.
+def unicorn_story(client=None):
+    client = client or get_client()
+    return client.responses.create(
+        model="gpt-4",
+        input="""Write a One-sentence bedtime story about a unicorn"""
+    )
+
+
+# This is the chat-based API, used in GPT-4 and ChatGPT today. You send a list of messages.
+# Each message has a role (system, user, assistant). The system message sets the tone or behavior.
+# It supports multi-turn conversations. This is like having a dialogue with the model.
+# IMPORTANT: 
+# In the chat API, every request needs the full conversation history passed in the messages array. 
+# Each time you call the API, the model doesn't remember anything. You have to remind it of the full conversation. 
+# This gives the model memory (within the request). So you build up a list like this:
+def unicorn_story_chat(client=None):
+    client = client or get_client()
+    return client.chat.completions.create(
+        model="gpt-4",
+        messages=[
+            {"role": "system", "content": "You are a helpful assistant."},
+            {"role": "user", "content": "Write a One-sentence bedtime story about a unicorn"},
+        ]
+    )
+
+
+def capital_population(client=None):
+    client = client or get_client()
+    return client.chat.completions.create(
+        model="gpt-4",
+        messages=[
+            {"role": "system", "content": "You are a helpful assistant."},
+            {"role": "user", "content": "What's the capital of France?"},
+            {"role": "assistant", "content": "Paris."},
+            {"role": "user", "content": "What's the population?"}
+        ]
+    )
+
+
+def pirate_semicolons(client=None):
+    client = client or get_client()
+    return client.chat.completions.create(
+        model="gpt-4",
+        messages=[
+            {"role": "developer", "content": "Talk like a pirate."},
+            {"role": "user", "content": "Are semicolons optional in Javascript?"},
+        ]
+    )
+
+# The system message is like a set of instructions for the model. It tells the model how to behave.
+# OpenAI has introduced a new role called "developer" in its Chat API. This role is intended to replace the "system" role in some contexts, providing clearer instructions and better control over the model's behavior. However, it's important to note that not all models currently support the "developer" role.
+# The user message is what you (the human) say to the model.
+# The assistant message is what the model says back to you.
+
+# Here's a quick summary of the roles in the chat API:
+# ------------------------------------------------------------------------------------------
+#   Role      |                     Purpose                         |       Who speaks?     |
+# ------------|-----------------------------------------------------|-----------------------|
+#   system    |   Set rules, behavior, or identity                  |   You (the developer) |
+#   developer |   Provides instructions to guide the assistant's 
+#                  behavior, similar to the "system" role.          |   You (the developer) |
+#   assistant |   Responds to user input, provides info             |     The model (AI)    |
+#   user      |   Asks questions, gives instructions                |     The human (you)   |
+# -------------------------------------------------------------------------------------------
+
+
+
+
+###################################################################################################
+############################### """ Text and Prompting with Markdown""" ###########################
+###################################################################################################
+SNAKE_CASE_INSTRUCTIONS = """
+
+# Identity
+
+You are coding assistant that helps enforce the use of snake case 
+variables in JavaScript code, and writing code that will run in 
+Internet Explorer version 6.
+
+
+# Instructions
+
+* When defining variables, use snake case names (e.g. my_variable) 
+  instead of camel case names (e.g. myVariable).
+* To support old browsers, declare variables using the older 
+  "var" keyword.
+* Do not give responses with Markdown formatting, just return 
+  the code as requested.
+
+
+# Examples
+
+<user_query>
+How do I declare a string variable for a first name?
+</user_query>
+
+<assistant_response>
+var first_name = "Anna";
+</assistant_response>
+
+"""
+
+
+# The instructions are the same on every call and only the input changes, so the request is built from a
+# PromptLayout (see prompt_cache.py): static instructions first, the question last, plus a prompt_cache_key,
+# so repeated calls can be served from the prompt cache. It is equivalent to
+#   client.responses.create(model="gpt-4", instructions=SNAKE_CASE_INSTRUCTIONS, input=question)
+SNAKE_CASE_LAYOUT = PromptLayout(SNAKE_CASE_INSTRUCTIONS, model="gpt-4")
+
+
+def snake_case_assistant(question="How would I declare a variable for a last name?", client=None, user=None):
+    client = client or get_client()
+    # The input is the user query, which is the question you want to ask the model.
+    return client.responses.create(**SNAKE_CASE_LAYOUT.request(question, user=user))
+
+# Markdown is a simple way to add formatting to text — like bold, italics, lists, or code — using plain characters.
+# For example:
+# Without Markdown:
+
+# Here are the steps:
+# Step 1 Write code
+# Step 2 Test it
+# Step 3 Deploy
+#
+# With markdown
+#
+# **Bold Text**  
+# *Italic Text*  
+# `inline code`  
+# - Bullet list item
+
+# Key Benefits Of Markdown Over Plain Text:
+# ---------------------------------------------------------------------------
+# Feature                   |       Plain String        |       Markdown
+# Emphasis (bold/italics)	|           ❌	             |        ✅
+# Code blocks               |           ❌              |          ✅
+# Lists / Tables            |           ❌              |          ✅
+# Easier reading            |           ❌              |          ✅
+# Better UI rendering       |           ❌              |          ✅
+# ---------------------------------------------------------------------------
+
+
+
+
+
+
+#########################################################################################
+######################### """ Text and Prompting with Few-Shot Learning""" ##############
+#########################################################################################
+
+# Few-shot learning is a technique where you provide the model with a few examples of what you want it to do.
+# This helps the model understand the task better and generate more accurate responses.
+# Few-shot learning lets you steer a large language model toward a new task by including a handful of input/output 
+# examples in the prompt, rather than fine-tuning the model. The model implicitly "picks up" the pattern from 
+# those examples and applies it to a prompt. When providing examples, try to show a diverse range of possible inputs 
+# with the desired outputs.
+# Typically, you will provide examples as part of a developer message in your API request. 
+# Here's an example developer message containing examples that show a model how to classify 
+# positive or negative customer service reviews.
+
+SENTIMENT_INSTRUCTIONS = """
+
+# Identity
+
+You are a helpful assistant that labels short product reviews as 
+Positive, Negative, or Neutral.
+
+# Instructions
+
+* Only output a single word in your response with no additional formatting
+  or commentary.
+* Your response should only be one of the words "Positive", "Negative", or
+  "Neutral" depending on the sentiment of the product review you are given.
+
+# Examples
+
+<product_review id="example-1">
+I absolutely love this headphones — sound quality is amazing!
+</product_review>
+
+<assistant_response id="example-1">
+Positive
+</assistant_response>
+
+<product_review id="example-2">
+Battery life is okay, but the ear pads feel cheap.
+</product_review>
+
+<assistant_response id="example-2">
+Neutral
+</assistant_response>
+
+<product_review id="example-3">
+Terrible customer service, I'll never buy from them again.
+</product_review>
+
+<assistant_response id="example-3">
+Negative
+</assistant_response>
+"""
+
+
+SENTIMENT_LAYOUT = PromptLayout(SENTIMENT_INSTRUCTIONS, model="gpt-4")
+
+
+def classify_review(review="The sound quality is great, but the battery life is short.", client=None, user=None):
+    client = client or get_client()
+    return client.responses.create(**SENTIMENT_LAYOUT.request(review, user=user))
+
+
+
+
+######################################################################
+############## Text Promting Best Practices ##########################
+######################################################################
+
+# 1. Be Clear and Specific:
+#    - Use clear, concise language.
+#    - Avoid ambiguity.
+#    - Specify the format you want the response in (e.g., "Provide a list of 3 items").
+# 2. Use Clear Formatting:
+#    - Use bullet points, numbered lists, or headings to organize information.
+#    - This makes it easier for the model to parse and understand.
+# 3. Use Examples:
+#    - Provide examples of the desired output.
+#    - Show the model what you expect.
+# 4. Use Role-Based Prompts:
+#    - Use roles like "system", "user", and "assistant" to structure the conversation.
+#    - This helps the model understand the context better.
+# 5. Be Mindful of Length:
+#    - Keep prompts concise but informative.
+#    - Avoid unnecessary verbosity.
+# 6. Set Context:
+#    - Provide background information if necessary.
+#    - Use system messages to set the model's behavior.
+# 7. Use Few-Shot Learning:
+#    - Include a few examples in the prompt to guide the model.
+#    - This helps the model understand the task better.
+# 8. Avoid Overloading:
+#    - Don't cram too much information into a single prompt.
+#    - Break complex tasks into smaller, manageable parts.
+# 9. Avoid Bias:
+#    - Be aware of potential biases in your prompts.
+#    - Use neutral language to avoid leading the model in a specific direction.
+# 10. Use Temperature and Max Tokens:
+#    - Adjust the temperature to control randomness (0.0 for deterministic, 1.0 for creative).
+#    - Set max tokens to limit the length of the response.
+# 11. Test and Iterate:
+#    - Test your prompts and see how the model responds.
+#    - Iterate on your prompts based on the model's output.
+
+
+
+
+
+
+
+# =================================================================================
+# ============== Image Prompt =====================================================
+# =================================================================================
+
+# Image prompting is a feature that allows you to send images to the model and get responses based on those images.
+# This is useful for tasks like image classification, object detection, or generating captions for images.
+# To use image prompting, you need to provide the image as part of the input.
+# Here's an example of how to use image prompting with the OpenAI API:
+SAMPLE_IMAGE_URL = "https://i.pinimg.com/736x/62/7b/bf/627bbf3aa91f0d98d97474ff32d55e7d.jpg"
+
+
+def describe_image(url=SAMPLE_IMAGE_URL, client=None):
+    client = client or get_client()
+    return client.chat.completions.create(
+        model="gpt-4.1-mini",
+        messages=[
+            {
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": "What is in this image?"},
+                    {
+                        "type": "image_url", 
+                        # "detail": "high", # high | low | auto 
+                        "image_url": {"url": url}
+                    }
+                ]
+            },
+        ]
+    )
+
+
+
+
+
+# =================================================================================
+# ============== Audio Prompt =====================================================
+# =================================================================================
+
+# Audio prompting is a feature that allows you to send audio files to the model and get responses based on those audio files.
+# This is useful for tasks like speech recognition, transcription, or generating responses based on audio input.
+# To use audio prompting, you need to provide the audio file as part of the input.
+SAMPLE_AUDIO_URL = "https://cdn.openai.com/API/docs/audio/alloy.wav"
+
+
+# The WAV is downloaded to a temporary file and base64-encoded from there while the request is sent
+# (see file_inputs.py), instead of being held in memory as bytes, then as a base64 str.
+def describe_audio(url=SAMPLE_AUDIO_URL, client=None):
+    import tempfile
+
+    from .file_inputs import create_chat_completion, input_audio
+    from .transport import http_download
+
+    with tempfile.TemporaryFile() as wav_file:
+        http_download(url, wav_file)  # Ensure the request was successful
+        wav_file.seek(0)
+        return create_chat_completion(
+            {
+                "model": "gpt-4o-audio-preview",
+                # model="gpt-4o-mini-preview", # This model does not support audio input
+                "messages": [
+                    {
+                        "role": "user",
+                        "content": [
+                            {"type": "text", "text": "What is in this recording?"},
+                            input_audio(wav_file, format="wav"),
+                        ]
+                    }
+                ]
+            },
+            client=client,
+        )
@@ -0,0 +1,160 @@
+# Result cache for tool functions, with request coalescing.
+# Many conversations ask about the same few cities; without a cache every get_weather tool call is its
+# own open-meteo request. Decorating a tool with a ToolResultCache keeps its results for `ttl` seconds,
+# and while a lookup is in flight, identical calls wait for it instead of starting their own:
+#
+#   @registry.tool(description="Get current temperature for a given location.")
+#   @ToolResultCache(ttl=300, precision=2)
+#   def get_weather(latitude: float, longitude: float) -> float:
+#       ...
+#
+#   get_weather.cache.stats   # {"hits": ..., "misses": ..., "coalesced": ..., ...}
+#
+# The key is the call's bound arguments (defaults applied), with floats rounded to `precision` decimals
+# so 48.8566/2.3522 and 48.85661/2.35219 share an entry; pass key=callable(*args, **kwargs) to build it
+# yourself. Sync tools coalesce across threads (the ToolDispatcher pool), async tools across tasks.
+# Exceptions are passed to every waiting caller but never cached. The wrapper keeps the function's
+# signature, so it can be registered like any other tool. Decorating imports nothing heavier than this
+# module: the signature is read on the first call.
+import functools
+import threading
+import time
+import types
+from collections import OrderedDict
+
+_HIT, _WAIT, _RUN = "hit", "wait", "run"
+
+
+class ToolResultCache:
+    def __init__(self, ttl=300.0, max_entries=1024, precision=None, key=None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.precision = precision
+        self.key = key
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0, "expired": 0, "evictions": 0, "errors": 0}
+        self._entries = OrderedDict()  # key -> (expires_at, result)
+        self._in_flight = {}  # key -> Future shared by the callers waiting on the same lookup
+        self._lock = threading.Lock()
+
+    def __call__(self, function):
+        name = f"{function.__module__}.{function.__qualname__}"
+        signature = None
+
+        def make_key(args, kwargs):
+            nonlocal signature
+            if self.key is not None:
+                return name, self.key(*args, **kwargs)
+            if signature is None:
+                import inspect
+
+                signature = inspect.signature(function)
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return name, tuple((arg, self._normalize(value)) for arg, value in bound.arguments.items())
+
+        if _is_coroutine_function(function):
+            @functools.wraps(function)
+            async def wrapper(*args, **kwargs):
+                key = make_key(args, kwargs)
+                state, value = self._begin(key)
+                if state == _HIT:
+                    return value
+                if state == _WAIT:
+                    import asyncio
+
+                    # shield: a caller that times out must not cancel the lookup the others wait on.
+                    return await asyncio.shield(asyncio.wrap_future(value))
+                try:
+                    result = await function(*args, **kwargs)
+                except BaseException as e:
+                    self._fail(key, value, e)
+                    raise
+                self._finish(key, value, result)
+                return result
+        else:
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                key = make_key(args, kwargs)
+                state, value = self._begin(key)
+                if state == _HIT:
+                    return value
+                if state == _WAIT:
+                    return value.result()
+                try:
+                    result = function(*args, **kwargs)
+                except BaseException as e:
+                    self._fail(key, value, e)
+                    raise
+                self._finish(key, value, result)
+                return result
+
+        wrapper.cache = self
+        return wrapper
+
+    def _normalize(self, value):
+        if self.precision is not None and isinstance(value, float):
+            return round(value, self.precision)
+        if isinstance(value, (list, tuple)):
+            return tuple(self._normalize(item) for item in value)
+        if isinstance(value, dict):
+            return tuple(sorted((key, self._normalize(item)) for key, item in value.items()))
+        return value
+
+    def _begin(self, key):
+        # Returns (_HIT, result), (_WAIT, future of the lookup already in flight) or (_RUN, future) when
+        # this caller has to run the lookup and resolve the future.
+        from concurrent.futures import Future  # imported on first use, like asyncio below
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self.stats["hits"] += 1
+                    return _HIT, entry[1]
+                del self._entries[key]
+                self.stats["expired"] += 1
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.stats["coalesced"] += 1
+                return _WAIT, future
+            self.stats["misses"] += 1
+            future = self._in_flight[key] = Future()
+            return _RUN, future
+
+    def _finish(self, key, future, result):
+        with self._lock:
+            self._in_flight.pop(key, None)
+            self._entries[key] = (time.monotonic() + self.ttl, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+        future.set_result(result)
+
+    def _fail(self, key, future, error):
+        with self._lock:
+            self._in_flight.pop(key, None)
+            self.stats["errors"] += 1
+        import asyncio  # here rather than at the top: asyncio alone costs more than the rest of the import
+
+        if isinstance(error, asyncio.CancelledError):
+            # The caller that ran the lookup was cancelled; the others get an ordinary error.
+            error = RuntimeError("the shared lookup was cancelled")
+        future.set_exception(error)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def _is_coroutine_function(function):
+    # inspect.iscoroutinefunction, answered from the code flags for a plain function or method so that
+    # decorating a tool at import time doesn't import inspect (about 10 ms).
+    plain = getattr(function, "__func__", function)
+    if isinstance(plain, types.FunctionType) and not hasattr(plain, "_is_coroutine_marker"):
+        return bool(plain.__code__.co_flags & 0x80)  # CO_COROUTINE
+    import inspect
+
+    return inspect.iscoroutinefunction(function)
@@ -0,0 +1,87 @@
+# Runs the tool calls of one model turn concurrently.
+# When the model asks for the weather in five cities it returns five independent tool calls; running
+# them one after another (Step 3 of the function-calling example) costs five sequential round trips.
+# ToolDispatcher runs sync functions on a thread pool and async functions on the event loop, gives every
+# call its own timeout, and returns the tool results in the order the model asked for them:
+#
+#   dispatcher = ToolDispatcher({"get_weather": get_weather}, timeouts={"get_weather": 5.0})
+#   messages.append(response.choices[0].message)
+#   messages.extend(dispatcher.execute(response.choices[0].message.tool_calls))
+#
+# functions can also be a ToolRegistry, whose tools validate their arguments before they run.
+#
+# A call that raises or times out doesn't fail the turn: its result is an "Error: ..." string, so the
+# model can see what went wrong. Timed-out sync functions can't be interrupted and finish in the
+# background on their pool thread.
+import asyncio
+import functools
+import inspect
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ToolDispatcher:
+    def __init__(self, functions, max_workers=8, timeout=30.0, timeouts=None):
+        if hasattr(functions, "resolve"):
+            self.functions = functions
+            self._resolve = functions.resolve
+        else:
+            self.functions = dict(functions)
+        self.timeout = timeout
+        self.timeouts = dict(timeouts or {})
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tool")
+
+    def execute(self, tool_calls):
+        # Sync entry point; use aexecute() from inside a running event loop.
+        return asyncio.run(self.aexecute(tool_calls))
+
+    async def aexecute(self, tool_calls):
+        tool_calls = list(tool_calls or [])
+        results = await asyncio.gather(*(self._run(tool_call) for tool_call in tool_calls))
+        return [_result_message(tool_call, result) for tool_call, result in zip(tool_calls, results)]
+
+    async def _run(self, tool_call):
+        name, arguments = _name_and_arguments(tool_call)
+        timeout = self.timeouts.get(name, self.timeout)
+        try:
+            function, kwargs = self._resolve(name, arguments)
+        except KeyError:
+            return f"Error: unknown function {name}"
+        except ValueError as e:
+            return f"Error: invalid arguments for {name}: {e}"
+        try:
+            if inspect.iscoroutinefunction(function):
+                result = await asyncio.wait_for(function(**kwargs), timeout)
+            else:
+                loop = asyncio.get_running_loop()
+                call = functools.partial(function, **kwargs)
+                result = await asyncio.wait_for(loop.run_in_executor(self._pool, call), timeout)
+        except asyncio.TimeoutError:
+            return f"Error: {name} timed out after {timeout:g}s"
+        except Exception as e:
+            return f"Error: {name} failed: {e}"
+        return result
+
+    def _resolve(self, name, arguments):
+        return self.functions[name], json.loads(arguments or "{}")
+
+    def close(self):
+        self._pool.shutdown(wait=False)
+
+
+def _name_and_arguments(tool_call):
+    # Chat Completions tool calls nest name/arguments under .function; Responses API function_call
+    # items carry them directly. Plain dicts of either shape work too.
+    if isinstance(tool_call, dict):
+        function = tool_call.get("function", tool_call)
+        return function["name"], function.get("arguments")
+    function = getattr(tool_call, "function", tool_call)
+    return function.name, function.arguments
+
+
+def _result_message(tool_call, result):
+    get = tool_call.get if isinstance(tool_call, dict) else functools.partial(getattr, tool_call)
+    if get("call_id", None) is not None:
+        # Responses API: answer with a function_call_output item.
+        return {"type": "function_call_output", "call_id": get("call_id", None), "output": str(result)}
+    return {"role": "tool", "tool_call_id": get("id", None), "content": str(result)}
@@ -0,0 +1,198 @@
+# Decorator-based tool registry: the JSON schema of every tool is derived from its Python signature once,
+# the first time it is needed (tools(), or a call), and calls are dispatched by name with a dict lookup.
+# Registering a tool imports neither pydantic nor openai (nor inspect), so modules that register tools at
+# import time stay cheap to import.
+#
+#   registry = ToolRegistry()
+#
+#   @registry.tool(description="Get current temperature for a given location.")
+#   def get_weather(latitude: float, longitude: float) -> str:
+#       ...
+#
+#   client.chat.completions.create(model="gpt-4.1", messages=messages, tools=registry.tools())
+#   client.responses.create(model="gpt-4.1", input=input_messages, tools=registry.tools(api="responses"))
+#   registry.call("get_weather", '{"latitude": 48.8566, "longitude": 2.3522}')
+#
+# Each registered function gets a pydantic model built from its parameters (Annotated[..., Field(...)]
+# descriptions and constraints are picked up); a function whose only parameter is a pydantic model uses
+# that model directly and receives the validated instance. The schema is produced in strict mode by
+# openai.pydantic_function_tool, so every parameter is required: parameters with a default become
+# nullable, and a null from the model means "use the default". Arguments are validated with the
+# model's compiled validator straight from the JSON string the model returned.
+#
+# A registry can be handed to ToolDispatcher in place of a plain {name: function} dict; arguments are
+# then validated before the function runs.
+import threading
+import typing
+
+
+class Tool:
+    def __init__(self, function, name=None, description=None):
+        self.function = function
+        self.name = name or function.__name__
+        self._description = description
+        self._built = False
+        self._lock = threading.Lock()
+
+    @property
+    def description(self):
+        # The docstring of the function unless a description was given.
+        if self._description is None:
+            import inspect
+
+            self._description = inspect.getdoc(self.function)
+        return self._description
+
+    @property
+    def is_async(self):
+        import inspect
+
+        return inspect.iscoroutinefunction(self.function)
+
+    @property
+    def model(self):
+        self._build()
+        return self._model
+
+    @property
+    def chat_schema(self):
+        self._build()
+        return self._chat_schema
+
+    @property
+    def responses_schema(self):
+        self._build()
+        return self._responses_schema
+
+    def _build(self):
+        # The pydantic model and schemas, made on first use rather than at registration.
+        if self._built:
+            return
+        import inspect
+
+        from pydantic import BaseModel
+
+        with self._lock:
+            if self._built:
+                return
+            function = self.function
+            hints = typing.get_type_hints(function, include_extras=True)
+            parameters = list(inspect.signature(function).parameters.values())
+            annotation = hints.get(parameters[0].name) if len(parameters) == 1 else None
+            if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+                # def book_flight(request: FlightRequest): the model's fields are the tool's arguments.
+                self._model = annotation
+                self._model_argument = parameters[0].name
+                self._defaults = frozenset()
+            else:
+                self._model = _signature_model(self.name, parameters, hints)
+                self._model_argument = None
+                self._defaults = frozenset(p.name for p in parameters if p.default is not inspect.Parameter.empty)
+            self._fields = tuple(self._model.model_fields)
+
+            import openai
+
+            self._chat_schema = openai.pydantic_function_tool(self._model, name=self.name, description=self.description)
+            function_schema = self._chat_schema["function"]
+            self._responses_schema = {"type": "function", "name": self.name, **{
+                key: value for key, value in function_schema.items() if key != "name"
+            }}
+            self._built = True
+
+    def parse(self, arguments):
+        # arguments: the JSON string from the model, or an already decoded dict.
+        self._build()
+        if isinstance(arguments, (str, bytes)):
+            validated = self._model.model_validate_json(arguments or "{}")
+        else:
+            validated = self._model.model_validate(arguments or {})
+        if self._model_argument is not None:
+            return {self._model_argument: validated}
+        kwargs = {}
+        for field in self._fields:
+            value = getattr(validated, field)
+            if value is None and field in self._defaults:
+                continue
+            kwargs[field] = value
+        return kwargs
+
+    def __call__(self, arguments):
+        return self.function(**self.parse(arguments))
+
+
+def _signature_model(name, parameters, hints):
+    import inspect
+    from typing import Any, Optional
+
+    from pydantic import create_model
+
+    fields = {}
+    for parameter in parameters:
+        if parameter.kind in (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD):
+            raise TypeError(f"tool {name}: *args/**kwargs can't be described by a JSON schema")
+        annotation = hints.get(parameter.name, Any)
+        if parameter.default is inspect.Parameter.empty:
+            fields[parameter.name] = (annotation, ...)
+        else:
+            fields[parameter.name] = (Optional[annotation], None)
+    return create_model(name, **fields)
+
+
+class ToolRegistry:
+    def __init__(self):
+        self._tools = {}
+        self._schemas = {}
+
+    def tool(self, function=None, *, name=None, description=None):
+        # Usable as @registry.tool or @registry.tool(name=..., description=...). Returns the function
+        # unchanged, so it can still be called directly.
+        def register(function):
+            self.register(function, name=name, description=description)
+            return function
+
+        return register(function) if function is not None else register
+
+    def register(self, function, name=None, description=None):
+        tool = Tool(function, name=name, description=description)
+        if tool.name in self._tools:
+            raise ValueError(f"a tool named {tool.name!r} is already registered")
+        self._tools[tool.name] = tool
+        self._schemas.clear()
+        return tool
+
+    def tools(self, api="chat", names=None):
+        # The list passed as tools=...; built once per (api, names) and reused by every request.
+        key = (api, tuple(names) if names is not None else None)
+        schemas = self._schemas.get(key)
+        if schemas is None:
+            if api not in ("chat", "responses"):
+                raise ValueError(f"api must be 'chat' or 'responses', not {api!r}")
+            attribute = "chat_schema" if api == "chat" else "responses_schema"
+            selected = names if names is not None else self._tools
+            schemas = self._schemas[key] = [getattr(self._tools[name], attribute) for name in selected]
+        return schemas
+
+    def resolve(self, name, arguments):
+        # Looks the tool up and validates its arguments: returns (function, kwargs). Raises KeyError for
+        # an unknown tool and pydantic's ValidationError (a ValueError) for bad arguments.
+        tool = self._tools[name]
+        return tool.function, tool.parse(arguments)
+
+    def call(self, name, arguments):
+        try:
+            tool = self._tools[name]
+        except KeyError:
+            raise ValueError(f"Unknown function: {name}") from None
+        return tool(arguments)
+
+    def __getitem__(self, name):
+        return self._tools[name]
+
+    def __contains__(self, name):
+        return name in self._tools
+
+    def __iter__(self):
+        return iter(self._tools)
+
+    def __len__(self):
+        return len(self._tools)
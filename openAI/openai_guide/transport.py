@@ -0,0 +1,169 @@
+# One shared HTTP connection pool for everything the examples talk to.
+# The OpenAI client (see _client.get_client) and the helper downloads (get_weather, create_file,
+# describe_audio) all go through the same httpx client, so they reuse keep-alive connections instead of
+# opening a fresh TCP+TLS connection per call. HTTP/2 is used when the optional `h2` package is installed.
+#
+# Every request is traced, and `stats` counts how many requests were sent and how many of them had to
+# open a new connection, so reuse can be checked under load:
+#
+#   transport.configure(max_connections=50)
+#   ...
+#   print(transport.stats.snapshot())   # {'requests': 200, 'opened': 8, 'reused': 192}
+import threading
+
+DEFAULT_SETTINGS = {
+    "max_connections": 100,
+    "max_keepalive_connections": 20,
+    "keepalive_expiry": 30.0,
+    "http2": None,  # None = use HTTP/2 if h2 is installed
+    "timeout": 60.0,
+}
+
+_lock = threading.Lock()
+_settings = dict(DEFAULT_SETTINGS)
+_http_client = None
+_async_http_client = None
+
+
+class ConnectionStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.opened = 0
+
+    @property
+    def reused(self):
+        return self.requests - self.opened
+
+    def count_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def count_connection(self):
+        with self._lock:
+            self.opened += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {"requests": self.requests, "opened": self.opened, "reused": self.requests - self.opened}
+
+    def reset(self):
+        with self._lock:
+            self.requests = 0
+            self.opened = 0
+
+
+stats = ConnectionStats()
+
+
+def configure(**settings):
+    # Change pool settings (any key of DEFAULT_SETTINGS). The pools built before the change are replaced,
+    # and so are the SDK clients get_client()/get_async_client() built on them; clients passed to
+    # set_client() are left alone. The old sync pool is closed once nothing cached refers to it.
+    global _http_client, _async_http_client
+    unknown = set(settings) - set(DEFAULT_SETTINGS)
+    if unknown:
+        raise ValueError(f"Unknown transport settings: {', '.join(sorted(unknown))}")
+    with _lock:
+        _settings.update(settings)
+        old, _http_client = _http_client, None
+        old_async, _async_http_client = _async_http_client, None
+    from . import _client
+
+    _client.drop_clients_using(old, old_async)  # takes _client's lock, never while holding ours
+    if old is not None:
+        old.close()
+
+
+def _http2_enabled():
+    if _settings["http2"] is not None:
+        return _settings["http2"]
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _client_kwargs():
+    import httpx
+
+    return {
+        "limits": httpx.Limits(
+            max_connections=_settings["max_connections"],
+            max_keepalive_connections=_settings["max_keepalive_connections"],
+            keepalive_expiry=_settings["keepalive_expiry"],
+        ),
+        "http2": _http2_enabled(),
+        "timeout": _settings["timeout"],
+        "follow_redirects": True,
+    }
+
+
+def _trace(event, info):
+    if event == "connection.connect_tcp.complete":
+        stats.count_connection()
+
+
+def _trace_request(request):
+    stats.count_request()
+    request.extensions["trace"] = _trace
+
+
+async def _atrace(event, info):
+    _trace(event, info)
+
+
+async def _atrace_request(request):
+    stats.count_request()
+    request.extensions["trace"] = _atrace
+
+
+def build_http_client():
+    import httpx
+
+    return httpx.Client(event_hooks={"request": [_trace_request]}, **_client_kwargs())
+
+
+def build_async_http_client():
+    # An httpx.AsyncClient is tied to the event loop it first runs on; use this for every new loop.
+    import httpx
+
+    return httpx.AsyncClient(event_hooks={"request": [_atrace_request]}, **_client_kwargs())
+
+
+def get_http_client():
+    global _http_client
+    if _http_client is None:
+        with _lock:
+            if _http_client is None:
+                _http_client = build_http_client()
+    return _http_client
+
+
+def get_async_http_client():
+    global _async_http_client
+    if _async_http_client is None:
+        with _lock:
+            if _async_http_client is None:
+                _async_http_client = build_async_http_client()
+    return _async_http_client
+
+
+def http_get(url, **kwargs):
+    # Drop-in for requests.get() on the shared pool; raises for 4xx/5xx.
+    response = get_http_client().get(url, **kwargs)
+    response.raise_for_status()
+    return response
+
+
+def http_download(url, file, chunk_size=1024 * 1024, **kwargs):
+    # Streams the body of a GET into an open binary file without holding it in memory; returns the
+    # number of bytes written. Raises for 4xx/5xx.
+    size = 0
+    with get_http_client().stream("GET", url, **kwargs) as response:
+        response.raise_for_status()
+        for chunk in response.iter_bytes(chunk_size):
+            file.write(chunk)
+            size += len(chunk)
+    return size
@@ -0,0 +1,186 @@
+# Uploads that are skipped when the same content was uploaded before.
+# The file examples upload the same PDF on every run. UploadCache hashes what is about to be uploaded
+# (SHA-256, streamed in chunks) and keeps an index of (hash, purpose) -> file_id in memory and, if a path
+# is given, in a SQLite file so it survives across runs; unchanged content is then answered from the index
+# instead of being sent again:
+#
+#   cache = UploadCache(path=".upload_cache.sqlite3")
+#   file_id = cache.upload("file-sample_150kB.pdf", purpose="user_data")         # uploads
+#   file_id = cache.upload("file-sample_150kB.pdf", purpose="user_data")         # index hit
+#   file_ids = cache.upload_many(paths, purpose="assistants", concurrency=8)
+#
+# An indexed file can disappear (deleted, or past its expires_at), so entries are checked before they
+# are trusted: one files.retrieve for a single upload, one paginated files.list for upload_many. Entries
+# older than max_age are dropped without asking; live_check gives any caller of upload the same one-listing
+# check. upload_many hashes and uploads on a thread pool, at most
+# `concurrency` at a time, and uploads content that appears more than once in the list only once.
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from ._client import get_client
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def sha256_of(source, chunk_size=CHUNK_SIZE):
+    # Hex SHA-256 of a path or a seekable binary file object, read chunk by chunk into one buffer. A file
+    # object is left at the position it had.
+    digest = hashlib.sha256()
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            for read in iter(lambda: f.readinto(buffer), 0):
+                digest.update(view[:read])
+        return digest.hexdigest()
+    start = source.tell()
+    for read in iter(lambda: source.readinto(buffer), 0):
+        digest.update(view[:read])
+    source.seek(start)
+    return digest.hexdigest()
+
+
+class UploadCache:
+    def __init__(self, path=None, client=None, max_age=None, verify=True):
+        self.client = client or get_client()
+        self.max_age = max_age
+        self.verify = verify
+        self.stats = {"uploads": 0, "hits": 0, "stale": 0, "bytes_uploaded": 0}
+        self._memory = {}  # (sha256, purpose) -> (file_id, uploaded_at)
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self._db = None
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS uploads ("
+                "sha256 TEXT, purpose TEXT, file_id TEXT, filename TEXT, bytes INTEGER, uploaded_at REAL, "
+                "PRIMARY KEY (sha256, purpose))"
+            )
+            self._db.commit()
+            for sha256, purpose, file_id, uploaded_at in self._db.execute(
+                    "SELECT sha256, purpose, file_id, uploaded_at FROM uploads"):
+                self._memory[sha256, purpose] = (file_id, uploaded_at)
+
+    def lookup(self, sha256, purpose):
+        # The indexed file_id for this content, or None; does not check it with the API.
+        with self._lock:
+            entry = self._memory.get((sha256, purpose))
+        if entry is None:
+            return None
+        if self.max_age is not None and time.time() - entry[1] > self.max_age:
+            self.forget(sha256, purpose)
+            self.stats["stale"] += 1
+            return None
+        return entry[0]
+
+    def forget(self, sha256, purpose):
+        with self._lock:
+            self._memory.pop((sha256, purpose), None)
+            if self._db is not None:
+                self._db.execute("DELETE FROM uploads WHERE sha256 = ? AND purpose = ?", (sha256, purpose))
+                self._db.commit()
+
+    def upload(self, source, purpose="assistants", filename=None, sha256=None, alive=None):
+        # The file_id of `source` (a path or a seekable binary file object), uploading it only if this
+        # content isn't indexed for `purpose` or the indexed file is gone. `alive` (file_id -> bool, e.g.
+        # from live_check) replaces the files.retrieve that checks an index hit.
+        sha256 = sha256 or sha256_of(source)
+        return self._upload(source, purpose, filename, sha256, (alive or self._alive) if self.verify else None)
+
+    def live_check(self, purpose):
+        # file_id -> bool, answered from one paginated files.list made the first time it is asked.
+        live_ids = None
+        lock = threading.Lock()
+
+        def alive(file_id):
+            nonlocal live_ids
+            with lock:
+                if live_ids is None:
+                    live_ids = self._live_ids(purpose)
+            return file_id in live_ids
+
+        return alive
+
+    def upload_many(self, sources, purpose="assistants", concurrency=8):
+        # file_ids for every source, in order.
+        sources = list(sources)
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="upload") as pool:
+            hashes = list(pool.map(sha256_of, sources))
+            first = {}
+            for source, sha256 in zip(sources, hashes):
+                first.setdefault(sha256, source)
+            alive = self.live_check(purpose) if self.verify else None
+            file_ids = dict(zip(first, pool.map(
+                lambda item: self._upload(item[1], purpose, None, item[0], alive), first.items())))
+        return [file_ids[sha256] for sha256 in hashes]
+
+    def _upload(self, source, purpose, filename, sha256, alive):
+        # One upload per content at a time: a second thread with the same content waits for the first.
+        with self._lock:
+            key_lock = self._key_locks.setdefault((sha256, purpose), threading.Lock())
+        with key_lock:
+            file_id = self.lookup(sha256, purpose)
+            if file_id is not None and (alive is None or alive(file_id)):
+                with self._lock:
+                    self.stats["hits"] += 1
+                return file_id
+            if file_id is not None:
+                self.forget(sha256, purpose)
+                self.stats["stale"] += 1
+            file_id, size = self._send(source, purpose, filename)
+            self._remember(sha256, purpose, file_id, filename or _name_of(source), size)
+            return file_id
+
+    def _send(self, source, purpose, filename):
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, "rb") as f:
+                file = self.client.files.create(file=(filename or os.path.basename(source), f), purpose=purpose)
+        else:
+            file = self.client.files.create(file=(filename or _name_of(source), source), purpose=purpose)
+        with self._lock:
+            self.stats["uploads"] += 1
+            self.stats["bytes_uploaded"] += file.bytes or 0
+        return file.id, file.bytes
+
+    def _remember(self, sha256, purpose, file_id, filename, size):
+        now = time.time()
+        with self._lock:
+            self._memory[sha256, purpose] = (file_id, now)
+            if self._db is not None:
+                self._db.execute("INSERT OR REPLACE INTO uploads VALUES (?, ?, ?, ?, ?, ?)",
+                                 (sha256, purpose, file_id, filename, size, now))
+                self._db.commit()
+
+    def _alive(self, file_id):
+        import openai
+
+        try:
+            file = self.client.files.retrieve(file_id)
+        except openai.NotFoundError:
+            return False
+        return _unexpired(file)
+
+    def _live_ids(self, purpose):
+        return {file.id for file in self.client.files.list(purpose=purpose) if _unexpired(file)}
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+def _unexpired(file):
+    expires_at = getattr(file, "expires_at", None)
+    return expires_at is None or expires_at > time.time()
+
+
+def _name_of(source):
+    if isinstance(source, (str, os.PathLike)):
+        return os.path.basename(source)
+    name = getattr(source, "name", None)  # an int for files opened from a descriptor
+    return os.path.basename(name) if isinstance(name, str) else "file"
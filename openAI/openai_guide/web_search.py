@@ -0,0 +1,114 @@
+from ._client import get_client
+
+
+# ===============================================
+# ============== Tools and Functions ============
+# ===============================================
+# Tools and functions are a way to extend the capabilities of the model by providing it with external tools and functions.
+# This is useful for tasks like calling external APIs, accessing databases, or performing calculations.
+# To use tools and functions, you need to provide the tool or function as part of the input.
+# Here's an example of how to use tools and functions with the OpenAI API:
+def weather_in_tokyo(client=None):
+    client = client or get_client()
+    return client.responses.create(
+        model="gpt-4.1",
+        input="What's the weather in Tokyo today?",
+        tools=[
+            {
+                "type": "web_search_preview",
+            }
+        ]
+    )
+
+# Available Tools:
+# Function calling: Call custom code to give the model access to additional data and capabilities.
+# Web search: Include data from the Internet in model response generation.
+# Remote MCP servers: Give the model access to new capabilities via Model Context Protocol (MCP) servers.
+# File search: Search the contents of uploaded files for context when generating a response.
+# Image Generation: Generate or edit images using GPT Image. 
+# Code interpreter: Allow the model to execute code in a secure container.
+# Computer use: Create agentic workflows that enable a model to control a computer interface.
+
+
+
+
+# -------------- Web Search --------------
+# Using the Responses API, you can enable web search by configuring it in the tools array in an API request to generate content. 
+# Like any other tool, the model can choose to search the web or not based on the content of the input prompt.
+# When you're using the web search tool, you only pay for tokens used when making web search requests—there are no additional fees involved.
+# The web search tool is available in all new models (gpt-4o, gpt-4.1, and reasoning models).
+TRENDING_NEWS = "What's the top trending news from today?"
+
+
+# To enable web search, you need to add a web_search_preview tool to the tools array in an API request to generate content.
+# The web_search_preview tool is available in all new models (gpt-4o, gpt-4.1, and reasoning models).
+def search(query=TRENDING_NEWS, client=None):
+    client = client or get_client()
+    return client.responses.create(
+        model="gpt-4.1",
+        tools=[
+            {
+                "type": "web_search_preview",
+            }
+        ],
+        input=query
+    )
+# Once the model has access to the web search tool, it may choose to search the web or not based on the content of the input prompt.
+# The model may also choose to call the tool multiple times, and the tool may also return an error.
+
+
+# You can also force the use of the web_search_preview tool by using the tool_choice parameter, 
+# and setting it to {type: "web_search_preview"} - this can help ensure lower latency and more consistent results.
+def forced_search(query=TRENDING_NEWS, client=None):
+    client = client or get_client()
+    return client.responses.create(
+        model="gpt-4.1",
+        tools=[
+            {
+                "type": "web_search_preview",
+            }
+        ],
+        tool_choice={
+            "type": "web_search_preview",
+        },
+        input=query
+    )
+
+
+# User location
+# To refine search results based on geography, you can specify an approximate user location using country, city, region, and/or timezone.
+def search_near(query=TRENDING_NEWS, client=None):
+    client = client or get_client()
+    return client.responses.create(
+        model="gpt-4.1",
+        tools=[
+            {
+                "type": "web_search_preview",
+                "user_location": {
+                    "type": "approximate",
+                    "country": "US",
+                    "city": "New York",
+                    "region": "New York",
+                    "timezone": "America/New_York"
+                }
+            }
+        ],
+        input=query
+    )
+
+
+# Search Context Size
+# When using this tool, the search_context_size parameter controls how much context is retrieved from the web 
+# to help the tool formulate a response. 
+def search_low_context(query=TRENDING_NEWS, client=None):
+    client = client or get_client()
+    return client.responses.create(
+        model="gpt-4.1",
+        tools=[
+            {
+                "type": "web_search_preview",
+                "search_context_size": "low"
+            }
+        ],
+        input=query
+    )